@@ -0,0 +1,83 @@
+"""Add keyset pagination indexes
+
+Revision ID: 2a48e240cf12
+Revises: 94b77ed6286b
+Create Date: 2026-10-18 03:12:27.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2a48e240cf12"
+down_revision: Union[str, None] = "94b77ed6286b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns), matching the sort keys of the paginated lists
+INDEXES = [
+    (
+        "ix_conversations_user_id_updated_at_id",
+        "conversations",
+        ["user_id", "updated_at", "id"],
+    ),
+    (
+        "ix_messages_conversation_id_position_created_at_id",
+        "messages",
+        ["conversation_id", "position", "created_at", "id"],
+    ),
+    (
+        "ix_files_conversation_id_user_id_created_at_id",
+        "files",
+        ["conversation_id", "user_id", "created_at", "id"],
+    ),
+]
+
+# Indexes that are a prefix of the new ones
+REPLACED_INDEXES = [
+    ("ix_conversations_user_id", "conversations", ["user_id"]),
+    ("ix_files_conversation_id_user_id", "files", ["conversation_id", "user_id"]),
+]
+
+
+def upgrade() -> None:
+    # See 94b77ed6286b, the new indexes are built before the ones they replace are dropped
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, _ in REPLACED_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,57 @@
+"""Add foreign key and lookup indexes
+
+Revision ID: 94b77ed6286b
+Revises: d5957d1e7363
+Create Date: 2026-10-18 02:04:02.660070
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "94b77ed6286b"
+down_revision: Union[str, None] = "d5957d1e7363"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns), matching the filters in backend/crud and the relationship loads
+INDEXES = [
+    ("ix_conversations_user_id", "conversations", ["user_id"]),
+    ("ix_messages_user_id", "messages", ["user_id"]),
+    ("ix_files_user_id", "files", ["user_id"]),
+    ("ix_files_conversation_id_user_id", "files", ["conversation_id", "user_id"]),
+    ("ix_files_message_id", "files", ["message_id"]),
+    ("ix_documents_message_id", "documents", ["message_id"]),
+    ("ix_documents_conversation_id", "documents", ["conversation_id"]),
+    ("ix_citations_message_id", "citations", ["message_id"]),
+    ("ix_citation_documents_left_id", "citation_documents", ["left_id"]),
+    ("ix_citation_documents_right_id", "citation_documents", ["right_id"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY doesn't lock out writes on live tables, but can't run inside a transaction.
+    # A failed concurrent build leaves an INVALID index, drop it before running this again.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
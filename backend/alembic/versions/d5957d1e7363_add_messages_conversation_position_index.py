@@ -0,0 +1,40 @@
+"""Add messages conversation position index
+
+Revision ID: d5957d1e7363
+Revises: 6bc65982b077
+Create Date: 2026-10-18 02:02:41.861425
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5957d1e7363"
+down_revision: Union[str, None] = "6bc65982b077"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # See 94b77ed6286b, messages is the largest table so the index is built without locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_conversation_id_is_active_position",
+            "messages",
+            ["conversation_id", "is_active", "position"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_messages_conversation_id_is_active_position",
+            table_name="messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
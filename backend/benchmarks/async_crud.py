@@ -0,0 +1,183 @@
+"""
+Compares the CRUD reads of the async file routes when run as sync calls on
+the event loop, through ThreadpoolSession, and through the asyncpg engine.
+
+Every simulated request opens its own session and runs the queries of
+GET /conversations/{id}/files. A ticker task measures how late the event
+loop wakes it up, which is what every other connection of the worker waits.
+
+Seeds one user's data with the test factories in the database at
+DATABASE_URL and deletes it at the end.
+
+Usage:
+    python -m backend.benchmarks.async_crud --concurrency 32 --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.crud import conversation as conversation_crud
+from backend.crud import file as file_crud
+from backend.crud.aio import conversation as async_conversation_crud
+from backend.crud.aio import file as async_file_crud
+from backend.models import Conversation, ThreadpoolSession
+from backend.models.database import get_async_database_url
+from backend.tests.factories import get_factory
+
+TICK = 0.001
+
+
+def seed(session_factory, user_id: str, conversations: int, files: int) -> list[str]:
+    with session_factory() as session:
+        ids = []
+        for _ in range(conversations):
+            conversation = get_factory("Conversation", session).create(user_id=user_id)
+            for _ in range(files):
+                get_factory("File", session).create(
+                    conversation_id=conversation.id, user_id=user_id
+                )
+            ids.append(conversation.id)
+        session.commit()
+    return ids
+
+
+def sync_request(session_factory, conversation_id: str, user_id: str) -> None:
+    with session_factory() as session:
+        conversation_crud.get_conversation(session, conversation_id, user_id)
+        file_crud.get_files_by_conversation_id(session, conversation_id, user_id)
+
+
+async def sync_on_loop_request(
+    session_factory, conversation_id: str, user_id: str
+) -> None:
+    # What the async routes did before, the queries block the event loop
+    sync_request(session_factory, conversation_id, user_id)
+
+
+async def async_request(session_factory, conversation_id: str, user_id: str) -> None:
+    async with session_factory() as session:
+        await async_conversation_crud.get_conversation(
+            session, conversation_id, user_id
+        )
+        await async_file_crud.get_files_by_conversation_id(
+            session, conversation_id, user_id
+        )
+
+
+async def threadpool_request(
+    session_factory, conversation_id: str, user_id: str
+) -> None:
+    session = ThreadpoolSession(session_factory())
+    try:
+        await async_conversation_crud.get_conversation(
+            session, conversation_id, user_id
+        )
+        await async_file_crud.get_files_by_conversation_id(
+            session, conversation_id, user_id
+        )
+    finally:
+        await session.close()
+
+
+async def measure(request, args: argparse.Namespace, ids: list[str], user_id: str):
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append((time.perf_counter() - start - TICK) * 1000)
+
+    async def worker(worker_id: int):
+        for i in range(worker_id, args.requests, args.concurrency):
+            await request(ids[i % len(ids)], user_id)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+
+    lags.sort()
+    return (
+        args.requests / elapsed,
+        statistics.median(lags),
+        lags[int(len(lags) * 0.99)],
+        lags[-1],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--files", type=int, default=10)
+    args = parser.parse_args()
+
+    url = os.environ["DATABASE_URL"]
+    engine = create_engine(url, pool_size=5, max_overflow=10, pool_timeout=30)
+    session_factory = sessionmaker(engine)
+    user_id = f"benchmark-{uuid4()}"
+    ids = seed(session_factory, user_id, args.conversations, args.files)
+
+    scenarios = {
+        "sync on event loop": lambda *a: sync_on_loop_request(session_factory, *a),
+        "threadpool session": lambda *a: threadpool_request(session_factory, *a),
+    }
+
+    try:
+        import asyncpg  # noqa: F401
+
+        async_engine = create_async_engine(
+            get_async_database_url(url), pool_size=5, max_overflow=10, pool_timeout=30
+        )
+        async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+        scenarios["asyncpg session"] = lambda *a: async_request(
+            async_session_factory, *a
+        )
+    except ImportError:
+        async_engine = None
+        print("asyncpg is not installed, skipping the async engine")
+
+    async def run_all():
+        # Warm up the pools before measuring
+        for request in scenarios.values():
+            await asyncio.gather(*(request(ids[0], user_id) for _ in range(15)))
+
+        results = {}
+        for name, request in scenarios.items():
+            results[name] = await measure(request, args, ids, user_id)
+
+        if async_engine is not None:
+            await async_engine.dispose()
+        return results
+
+    try:
+        results = asyncio.run(run_all())
+        print(
+            f"{'scenario':<20} {'req/s':>8} {'lag p50 ms':>11} "
+            f"{'lag p99 ms':>11} {'lag max ms':>11}"
+        )
+        for name, (throughput, p50, p99, lag_max) in results.items():
+            print(
+                f"{name:<20} {throughput:>8.0f} {p50:>11.2f} {p99:>11.2f} {lag_max:>11.2f}"
+            )
+    finally:
+        with session_factory() as session:
+            session.execute(delete(Conversation).where(Conversation.user_id == user_id))
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
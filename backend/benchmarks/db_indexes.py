@@ -0,0 +1,188 @@
+"""
+Compares query plans and latencies of the CRUD lookups with and without the
+secondary indexes declared on the models.
+
+Seeds a throwaway schema in the database at DATABASE_URL, runs the queries
+without indexes, creates the indexes and runs them again. Everything happens
+in one transaction that is rolled back at the end.
+
+Usage:
+    python -m backend.benchmarks.db_indexes --users 200 --conversations 20 --messages 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+from backend.models.base import Base
+
+SCHEMA = "index_benchmark"
+
+# Same filters as backend/crud and the relationship loads
+QUERIES = {
+    "get_conversations": (
+        "SELECT * FROM conversations WHERE user_id = :user_id LIMIT 100"
+    ),
+    "get_messages_by_conversation_id": (
+        "SELECT * FROM messages "
+        "WHERE conversation_id = :conversation_id AND user_id = :user_id"
+    ),
+    "get_max_active_position": (
+        "SELECT max(position) FROM messages "
+        "WHERE conversation_id = :conversation_id AND is_active"
+    ),
+    "get_files_by_conversation_id": (
+        "SELECT * FROM files "
+        "WHERE conversation_id = :conversation_id AND user_id = :user_id"
+    ),
+    "get_citations_by_message_id": (
+        "SELECT * FROM citations WHERE message_id = :message_id"
+    ),
+    "message.documents": "SELECT * FROM documents WHERE message_id = :message_id",
+    "citation.documents": (
+        "SELECT documents.* FROM documents JOIN citation_documents "
+        "ON documents.id = citation_documents.left_id "
+        "WHERE citation_documents.right_id = :citation_id"
+    ),
+}
+
+SEED = [
+    """
+    INSERT INTO conversations (id, user_id, title, created_at, updated_at)
+    SELECT 'c' || c, 'u' || (c % :users), 'Conversation', now(), now()
+    FROM generate_series(0, :users * :conversations - 1) AS c
+    """,
+    """
+    INSERT INTO messages
+        (id, conversation_id, user_id, text, position, is_active, type, agent,
+         created_at, updated_at)
+    SELECT 'c' || c || 'm' || m, 'c' || c, 'u' || (c % :users), 'Hello', m / 2, true,
+        'TEXT', CASE WHEN m % 2 = 0 THEN 'USER' ELSE 'CHATBOT' END, now(), now()
+    FROM generate_series(0, :users * :conversations - 1) AS c,
+        generate_series(0, :messages - 1) AS m
+    """,
+    """
+    INSERT INTO documents
+        (id, document_id, conversation_id, message_id, user_id, text,
+         created_at, updated_at)
+    SELECT messages.id || 'd' || d, 'doc_' || d, conversation_id, messages.id,
+        user_id, 'Document', now(), now()
+    FROM messages, generate_series(0, 1) AS d
+    WHERE agent = 'CHATBOT'
+    """,
+    """
+    INSERT INTO citations
+        (id, message_id, user_id, text, start, "end", document_ids,
+         created_at, updated_at)
+    SELECT id || 'c', id, user_id, 'Citation', 0, 1, ARRAY['doc_0'], now(), now()
+    FROM messages WHERE agent = 'CHATBOT'
+    """,
+    """
+    INSERT INTO citation_documents (left_id, right_id)
+    SELECT message_id || 'd0', id FROM citations
+    """,
+    """
+    INSERT INTO files
+        (id, conversation_id, message_id, user_id, file_name, file_path,
+         file_size, created_at, updated_at)
+    SELECT 'f' || c, 'c' || c, 'c' || c || 'm0', 'u' || (c % :users), 'file.pdf',
+        '/tmp/file.pdf', 0, now(), now()
+    FROM generate_series(0, :users * :conversations - 1) AS c
+    """,
+]
+
+
+def random_params(args: argparse.Namespace) -> dict[str, str]:
+    conversation = random.randrange(args.users * args.conversations)
+    message = random.randrange(args.messages // 2) * 2 + 1
+    return {
+        "user_id": f"u{conversation % args.users}",
+        "conversation_id": f"c{conversation}",
+        "message_id": f"c{conversation}m{message}",
+        "citation_id": f"c{conversation}m{message}c",
+    }
+
+
+def analyze(connection) -> None:
+    for table in Base.metadata.sorted_tables:
+        connection.execute(text(f"ANALYZE {table.name}"))
+
+
+def run_queries(connection, args: argparse.Namespace) -> dict[str, tuple[float, str]]:
+    results = {}
+    for name, query in QUERIES.items():
+        plan = connection.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"), random_params(args)
+        ).scalars()
+        # Scan nodes of the plan, without costs
+        scans = [line.strip("-> ").split("  ")[0] for line in plan if "Scan" in line]
+
+        latencies = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            connection.execute(text(query), random_params(args)).all()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        results[name] = (statistics.median(latencies), ", ".join(scans))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    indexes = [
+        index for table in Base.metadata.sorted_tables for index in table.indexes
+    ]
+
+    with engine.connect() as connection:
+        connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        connection.execute(text(f"SET search_path TO {SCHEMA}"))
+        try:
+            Base.metadata.create_all(connection)
+            for index in indexes:
+                index.drop(connection)
+
+            start = time.perf_counter()
+            for statement in SEED:
+                connection.execute(
+                    text(statement),
+                    {
+                        "users": args.users,
+                        "conversations": args.conversations,
+                        "messages": args.messages,
+                    },
+                )
+            analyze(connection)
+            messages = connection.execute(
+                text("SELECT count(*) FROM messages")
+            ).scalar()
+            print(f"Seeded {messages} messages in {time.perf_counter() - start:.1f}s")
+
+            before = run_queries(connection, args)
+            for index in indexes:
+                index.create(connection)
+            analyze(connection)
+            after = run_queries(connection, args)
+        finally:
+            connection.rollback()
+
+    print(f"{'query':<32} {'before ms':>10} {'after ms':>10}  plan before -> after")
+    for name in QUERIES:
+        print(
+            f"{name:<32} {before[name][0]:>10.3f} {after[name][0]:>10.3f}  "
+            f"{before[name][1]} -> {after[name][1]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
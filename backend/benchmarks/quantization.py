@@ -0,0 +1,137 @@
+"""
+Measures the recall and latency of the quantized vector search of uploaded
+files, comparing float32, int8 and binary codes for several rescore factors.
+
+Runs on two corpora:
+- pdf: the chunks of the PDFs in backend/tests/test_data, embedded with Cohere
+  if COHERE_API_KEY is set and with hashed bags of words otherwise. Queries
+  are the first words of sampled chunks.
+- synthetic: clustered embeddings of each of --sizes, see the vector_search
+  benchmark.
+
+The recall@k of each search is measured against the exact float32 search.
+
+Usage:
+    python -m backend.benchmarks.quantization --sizes 10000,100000,1000000 --dim 768
+"""
+
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from backend.benchmarks.vector_search import (
+    get_queries,
+    recall,
+    time_queries,
+    write_vectors,
+)
+from backend.tools.retrieval.file_index import get_embeddings, split_file
+from backend.tools.retrieval.vector_search import (
+    QUANTIZED_CODES,
+    cosine_top_k,
+    normalize,
+    quantized_top_k,
+)
+
+TEST_DATA_FOLDER = Path(__file__).parent.parent / "tests" / "test_data"
+QUERY_WORDS = 8
+
+
+def embed_hashed(texts: list[str], dim: int) -> np.ndarray:
+    # Stand-in for an embedding model without an API key: signed counts of hashed words
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in re.findall(r"\w+", text.lower()):
+            word_hash = zlib.crc32(word.encode())
+            vectors[i, word_hash % dim] += 1 if word_hash & 1 << 31 else -1
+    return normalize(vectors)
+
+
+def get_pdf_corpus(dim: int, count: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    chunks = [
+        chunk
+        for path in sorted(TEST_DATA_FOLDER.glob("*.pdf"))
+        for chunk in split_file(str(path))[0]
+    ]
+    rng = np.random.default_rng(seed)
+    sampled = rng.choice(len(chunks), min(count, len(chunks)), replace=False)
+    queries = [" ".join(chunks[i].split()[:QUERY_WORDS]) for i in sampled]
+
+    if os.getenv("COHERE_API_KEY"):
+        embeddings = get_embeddings()
+        return normalize(embeddings.embed_documents(chunks)), normalize(
+            [embeddings.embed_query(query) for query in queries]
+        )
+
+    return embed_hashed(chunks, dim), embed_hashed(queries, dim)
+
+
+def report(name: str, latencies: list[float], found: float) -> None:
+    p50 = statistics.median(latencies) * 1000
+    p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+    print(f"  {name:<18} p50 {p50:8.2f}ms p95 {p95:8.2f}ms recall {found:.3f}")
+
+
+def run(vectors: np.ndarray, queries: np.ndarray, k: int, factors: list[int]) -> None:
+    exact_latencies, exact = time_queries(
+        lambda query: cosine_top_k(vectors, query, k), queries
+    )
+    report("float32", exact_latencies, 1.0)
+
+    for name, codes_class in QUANTIZED_CODES.items():
+        start = time.perf_counter()
+        codes = codes_class.build(vectors)
+        build_time = time.perf_counter() - start
+        size = sum(getattr(codes, array).nbytes for array in codes.arrays)
+        print(
+            f"  {name}: {size / vectors.nbytes:.3f}x the float32 size, "
+            f"built in {build_time:.2f}s"
+        )
+        for factor in factors:
+            latencies, approximate = time_queries(
+                lambda query: quantized_top_k(vectors, codes, query, k, factor),
+                queries,
+            )
+            report(f"{name} rescore x{factor}", latencies, recall(exact, approximate))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--factors", default="1,2,4,8,16")
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--folder", help="Folder for the vectors, temporary if unset")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    factors = [int(factor) for factor in args.factors.split(",")]
+
+    vectors, queries = get_pdf_corpus(args.dim, args.queries, args.seed)
+    print(f"pdf: {len(vectors)} chunks of {vectors.shape[1]} dimensions")
+    run(vectors, queries, args.k, factors)
+
+    with tempfile.TemporaryDirectory() as tmp_folder:
+        folder = Path(args.folder or tmp_folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        for size in (int(size) for size in args.sizes.split(",")):
+            path = folder / f"vectors_{size}_{args.dim}.npy"
+            if not path.exists():
+                write_vectors(path, size, args.dim, args.topics, args.seed)
+
+            vectors = np.load(path, mmap_mode="r")
+            queries = get_queries(vectors, min(args.queries, size), args.seed + 1)
+            print(f"synthetic: {size} chunks of {args.dim} dimensions")
+            run(vectors, queries, args.k, factors)
+
+
+if __name__ == "__main__":
+    main()
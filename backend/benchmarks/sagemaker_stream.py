@@ -0,0 +1,82 @@
+"""
+Compares the SageMaker stream line decoder with the previous BytesIO based
+LineIterator on synthetic multi-megabyte event streams.
+
+Usage:
+    python -m backend.benchmarks.sagemaker_stream --size-mb 8 --part-size 1024
+"""
+
+import argparse
+import io
+import json
+import time
+import tracemalloc
+
+from backend.chat.custom.model_deployments.line_decoder import iter_payload_lines
+
+
+class BytesIOLineIterator:
+    """LineIterator as it was before the LineDecoder, kept for comparison."""
+
+    def __init__(self, stream):
+        self.byte_iterator = iter(stream)
+        self.buffer = io.BytesIO()
+        self.read_pos = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            self.buffer.seek(self.read_pos)
+            line = self.buffer.readline()
+            if line and line[-1] == ord("\n"):
+                self.read_pos += len(line)
+                return line[:-1]
+            try:
+                chunk = next(self.byte_iterator)
+            except StopIteration:
+                raise
+            if "PayloadPart" not in chunk:
+                continue
+            self.buffer.seek(0, io.SEEK_END)
+            self.buffer.write(chunk["PayloadPart"]["Bytes"])
+
+
+def build_event_stream(size_mb: float, part_size: int) -> list[dict]:
+    event = {"event_type": "text-generation", "text": "token ", "is_finished": False}
+    line = (json.dumps(event) + "\n").encode()
+    payload = line * int(size_mb * 1024 * 1024 / len(line))
+    return [
+        {"PayloadPart": {"Bytes": payload[i : i + part_size]}}
+        for i in range(0, len(payload), part_size)
+    ]
+
+
+def run(name: str, iterator_factory, event_stream: list[dict]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = sum(1 for _ in iterator_factory(event_stream))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:>12}: {count} lines in {elapsed:.3f}s "
+        f"({elapsed / count * 1e6:.2f} us/line), peak memory {peak / 1024:.0f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--part-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    event_stream = build_event_stream(args.size_mb, args.part_size)
+    print(f"{len(event_stream)} payload parts, {args.size_mb} MiB")
+    run("BytesIO", BytesIOLineIterator, event_stream)
+    run("LineDecoder", iter_payload_lines, event_stream)
+
+
+if __name__ == "__main__":
+    main()
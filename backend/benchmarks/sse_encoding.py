@@ -0,0 +1,65 @@
+"""
+Measures the per-token cost of serializing text generation events for the SSE
+response, comparing the generic pydantic path with the sse_encoder fast path.
+
+Usage:
+    python -m backend.benchmarks.sse_encoding --tokens 200000
+"""
+
+import argparse
+import time
+
+from sse_starlette.sse import ensure_bytes
+
+from backend.chat.sse_encoder import (
+    SSE_SEPARATOR,
+    encode_chat_response_event,
+    encode_text_generation,
+)
+from backend.schemas.chat import StreamTextGeneration
+
+
+def generic_path(event: dict) -> bytes:
+    stream_event = StreamTextGeneration.model_validate(event)
+    return ensure_bytes(encode_chat_response_event(stream_event), SSE_SEPARATOR)
+
+
+def fast_path(event: dict) -> bytes:
+    return ensure_bytes(
+        encode_text_generation(event["text"], event["is_finished"]), SSE_SEPARATOR
+    )
+
+
+def run(name: str, encode, events: list[dict]) -> list[bytes]:
+    start = time.perf_counter()
+    frames = [encode(event) for event in events]
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:>8}: {len(events)} tokens in {elapsed:.3f}s "
+        f"({elapsed / len(events) * 1e6:.2f} us/token)"
+    )
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=200_000)
+    args = parser.parse_args()
+
+    words = [" the", " quick", ' "brown"', " fox\n", " café", " 🦊"]
+    events = [
+        {
+            "event_type": "text-generation",
+            "text": words[i % len(words)],
+            "is_finished": False,
+        }
+        for i in range(args.tokens)
+    ]
+
+    generic_frames = run("generic", generic_path, events)
+    fast_frames = run("fast", fast_path, events)
+    assert generic_frames == fast_frames, "Fast path output differs"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Measures the local vector search of uploaded files, comparing the exact
+memory-mapped top-k with the IVF index, from 10k to 10M chunks.
+
+Writes clustered synthetic embeddings of each size as .npy files in --folder,
+opens them memory-mapped like the file indexes and reports the build time of
+the IVF index, the latency of both searches and the recall@k of the IVF index
+against the exact results. The largest sizes need --dim x 4 bytes of disk per
+chunk, 5GB for 10M chunks of 128 dimensions.
+
+Usage:
+    python -m backend.benchmarks.vector_search --sizes 10000,100000,1000000,10000000 --dim 128
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from backend.tools.retrieval.vector_search import (
+    VECTOR_SEARCH_IVF_PROBES,
+    IVFIndex,
+    VectorIndex,
+    cosine_top_k,
+    normalize,
+)
+
+# Rows generated at once
+WRITE_ROWS = 100_000
+
+
+def write_vectors(path: Path, size: int, dim: int, topics: int, seed: int) -> None:
+    # Chunks of real documents cluster by topic, uniform noise would make IVF look worse
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim), dtype=np.float32)
+    vectors = open_memmap(path, mode="w+", dtype=np.float32, shape=(size, dim))
+    for start in range(0, size, WRITE_ROWS):
+        rows = min(WRITE_ROWS, size - start)
+        noise = rng.standard_normal((rows, dim), dtype=np.float32)
+        vectors[start : start + rows] = normalize(
+            centers[rng.integers(topics, size=rows)] + noise * 0.5
+        )
+    vectors.flush()
+    del vectors
+
+
+def get_queries(vectors: np.ndarray, count: int, seed: int) -> np.ndarray:
+    # Queries near stored chunks, like a question about a passage of a file
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(vectors), count, replace=False))
+    noise = normalize(rng.standard_normal((count, vectors.shape[1]), dtype=np.float32))
+    return normalize(np.asarray(vectors[rows]) + noise * 0.5)
+
+
+def time_queries(search, queries: np.ndarray) -> tuple[list[float], np.ndarray]:
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows, _ = search(query)
+        latencies.append(time.perf_counter() - start)
+        results.append(rows[0])
+    return latencies, np.array(results)
+
+
+def recall(exact: np.ndarray, approximate: np.ndarray) -> float:
+    found = [len(set(e) & set(a)) / len(e) for e, a in zip(exact, approximate)]
+    return statistics.mean(found)
+
+
+def report(name: str, latencies: list[float]) -> str:
+    p50 = statistics.median(latencies) * 1000
+    p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+    return f"{name} p50 {p50:8.2f}ms p95 {p95:8.2f}ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000,10000000")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--probes", type=int, default=VECTOR_SEARCH_IVF_PROBES)
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--folder", help="Folder for the vectors, temporary if unset")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_folder:
+        folder = Path(args.folder or tmp_folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        for size in (int(size) for size in args.sizes.split(",")):
+            path = folder / f"vectors_{size}_{args.dim}.npy"
+            if not path.exists():
+                write_vectors(path, size, args.dim, args.topics, args.seed)
+
+            vectors = VectorIndex.load(path).vectors
+            queries = get_queries(vectors, min(args.queries, size), args.seed + 1)
+
+            start = time.perf_counter()
+            ivf = IVFIndex.build(vectors, seed=args.seed)
+            build_time = time.perf_counter() - start
+
+            # Warm the page cache, like a file searched before
+            cosine_top_k(vectors, queries[0], args.k)
+            exact_latencies, exact = time_queries(
+                lambda query: cosine_top_k(vectors, query, args.k), queries
+            )
+            ivf_latencies, approximate = time_queries(
+                lambda query: ivf.search(vectors, query, args.k, args.probes),
+                queries,
+            )
+            start = time.perf_counter()
+            cosine_top_k(vectors, queries, args.k)
+            batch_time = (time.perf_counter() - start) / len(queries)
+
+            print(
+                f"{size:>10} chunks, {path.stat().st_size / 2**20:8.1f}MB: "
+                f"{report('exact', exact_latencies)}, "
+                f"batched {batch_time * 1000:8.2f}ms/query | "
+                f"{report('ivf', ivf_latencies)}, "
+                f"recall@{args.k} {recall(exact, approximate):.3f}, "
+                f"{len(ivf.centroids)} clusters built in {build_time:.1f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
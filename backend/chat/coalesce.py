@@ -0,0 +1,120 @@
+import asyncio
+import os
+from typing import Any, AsyncGenerator, AsyncIterator
+
+from backend.chat.enums import StreamEvent
+
+"""
+Opt-in coalescing of text generation events.
+
+Consecutive text generation events are merged into one event, so a stream
+sends one SSE frame per window instead of one per token. Any other event
+flushes the buffered text first and is passed through immediately.
+"""
+
+# Milliseconds to hold text generation events before sending them, 0 disables coalescing
+STREAM_COALESCE_MS = float(os.getenv("STREAM_COALESCE_MS", "0"))
+# Buffered text size in bytes that sends the merged event before the window ends
+STREAM_COALESCE_BYTES = int(os.getenv("STREAM_COALESCE_BYTES", "256"))
+
+
+def get_coalesced_stream(
+    stream: AsyncIterator[dict[str, Any]],
+    window_ms: float | None = None,
+    max_bytes: int | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Wrap a chat stream with text generation coalescing, if enabled.
+
+    Args:
+        stream (AsyncIterator[dict[str, Any]]): Model deployment stream.
+        window_ms (float | None): Coalescing window, defaults to STREAM_COALESCE_MS.
+        max_bytes (int | None): Flush threshold, defaults to STREAM_COALESCE_BYTES.
+
+    Returns:
+        AsyncIterator[dict[str, Any]]: The coalesced stream, or the stream itself if disabled.
+    """
+    window_ms = STREAM_COALESCE_MS if window_ms is None else window_ms
+    max_bytes = STREAM_COALESCE_BYTES if max_bytes is None else max_bytes
+
+    if window_ms <= 0:
+        return stream
+
+    return coalesce_text_generation(stream, window_ms / 1000, max_bytes)
+
+
+async def coalesce_text_generation(
+    stream: AsyncIterator[dict[str, Any]], window: float, max_bytes: int
+) -> AsyncGenerator[dict[str, Any], None]:
+    """
+    Merge consecutive text generation events.
+
+    Buffered text is sent when the window since the first buffered event ends,
+    when it reaches max_bytes, or when any other event arrives.
+
+    Args:
+        stream (AsyncIterator[dict[str, Any]]): Model deployment stream.
+        window (float): Coalescing window in seconds.
+        max_bytes (int): Buffered text size that sends the merged event early.
+
+    Yields:
+        dict[str, Any]: Stream events, with text generation events merged.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = stream.__aiter__()
+    buffer: list[dict[str, Any]] = []
+    buffered_bytes = 0
+    deadline = 0.0
+    # Pending read of the next event, kept across window timeouts
+    next_event = None
+
+    try:
+        while True:
+            if buffer:
+                if next_event is None:
+                    next_event = asyncio.ensure_future(iterator.__anext__())
+                done, _ = await asyncio.wait(
+                    {next_event}, timeout=max(deadline - loop.time(), 0)
+                )
+                if not done:
+                    yield _merge_text_generation(buffer)
+                    buffer, buffered_bytes = [], 0
+                    continue
+
+            try:
+                if next_event is not None:
+                    event = await next_event
+                else:
+                    event = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                next_event = None
+
+            if event["event_type"] != StreamEvent.TEXT_GENERATION:
+                if buffer:
+                    yield _merge_text_generation(buffer)
+                    buffer, buffered_bytes = [], 0
+                yield event
+                continue
+
+            if not buffer:
+                deadline = loop.time() + window
+            buffer.append(event)
+            buffered_bytes += len(event["text"].encode())
+            if buffered_bytes >= max_bytes:
+                yield _merge_text_generation(buffer)
+                buffer, buffered_bytes = [], 0
+
+        if buffer:
+            yield _merge_text_generation(buffer)
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+
+
+def _merge_text_generation(events: list[dict[str, Any]]) -> dict[str, Any]:
+    if len(events) == 1:
+        return events[0]
+
+    return events[-1] | {"text": "".join(event["text"] for event in events)}
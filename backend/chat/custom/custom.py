@@ -2,15 +2,24 @@ import logging
 from typing import Any
 
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 
 from backend.chat.base import BaseChat
 from backend.chat.custom.model_deployments.base import BaseDeployment
-from backend.chat.custom.model_deployments.deployment import get_deployment
+from backend.chat.custom.model_deployments.deployment import (
+    acquire_deployment,
+    release_after_async_stream,
+    release_after_stream,
+    release_deployment,
+)
+from backend.chat.custom.search_queries import invoke_search_queries_cached
 from backend.config.tools import AVAILABLE_TOOLS, ToolName
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.tool import Category, Tool
 from backend.services.logger import get_logger
+from backend.tools.retrieval.cache import CachedRetrieval
 from backend.tools.retrieval.collate import combine_documents
+from backend.tools.retrieval.parallel import retrieve_documents_in_parallel
 
 
 class CustomChat(BaseChat):
@@ -30,86 +39,163 @@ class CustomChat(BaseChat):
             Generator[StreamResponse, None, None]: Chat response.
         """
         # Choose the deployment model - validation already performed by request validator
-        deployment_model = get_deployment(kwargs.get("deployment_name"))
+        deployment_model = acquire_deployment(kwargs.get("deployment_name"))
         self.logger.info(f"Using deployment {deployment_model.__class__.__name__}")
 
+        # A stream outlives this call, it releases the deployment once consumed
+        is_released_by_stream = False
+        try:
+            invoke_kwargs = self.prepare_chat_request(
+                chat_request, deployment_model, **kwargs
+            )
+
+            # Generate Response
+            if kwargs.get("stream", True) is True:
+                stream = release_after_stream(
+                    deployment_model,
+                    deployment_model.invoke_chat_stream(chat_request, **invoke_kwargs),
+                )
+                is_released_by_stream = True
+                return stream
+            else:
+                return deployment_model.invoke_chat(chat_request, **invoke_kwargs)
+        finally:
+            if not is_released_by_stream:
+                release_deployment(deployment_model)
+
+    async def chat_async(self, chat_request: CohereChatRequest, **kwargs: Any) -> Any:
+        """
+        Chat flow for custom models, used by async routes.
+
+        Search query generation, retrieval and tool calls run in the threadpool,
+        the model response is produced by the deployment's async client.
+
+        Args:
+            chat_request (CohereChatRequest): Chat request.
+            **kwargs (Any): Keyword arguments.
+
+        Returns:
+            AsyncGenerator[StreamResponse, None]: Chat response.
+        """
+        # Choose the deployment model - validation already performed by request validator
+        deployment_model = acquire_deployment(kwargs.get("deployment_name"))
+        self.logger.info(f"Using deployment {deployment_model.__class__.__name__}")
+
+        # A stream outlives this call, it releases the deployment once consumed
+        is_released_by_stream = False
+        try:
+            invoke_kwargs = await run_in_threadpool(
+                self.prepare_chat_request, chat_request, deployment_model, **kwargs
+            )
+
+            # Generate Response
+            if kwargs.get("stream", True) is True:
+                stream = release_after_async_stream(
+                    deployment_model,
+                    deployment_model.invoke_chat_stream_async(
+                        chat_request, **invoke_kwargs
+                    ),
+                )
+                is_released_by_stream = True
+                return stream
+            else:
+                return await deployment_model.invoke_chat_async(
+                    chat_request, **invoke_kwargs
+                )
+        finally:
+            if not is_released_by_stream:
+                release_deployment(deployment_model)
+
+    def prepare_chat_request(
+        self,
+        chat_request: CohereChatRequest,
+        deployment_model: BaseDeployment,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Runs managed tools and retrieval, updating the chat request in place.
+
+        Args:
+            chat_request (CohereChatRequest): Chat request.
+            deployment_model (BaseDeployment): Deployment used for the chat.
+            **kwargs (Any): Keyword arguments.
+
+        Returns:
+            dict[str, Any]: Keyword arguments for the deployment invoke call.
+        """
         if len(chat_request.tools) > 0 and len(chat_request.documents) > 0:
             raise HTTPException(
                 status_code=400, detail="Both tools and documents cannot be provided."
             )
 
-        if kwargs.get("managed_tools", True):
-            # Generate Search Queries
-            chat_history = [message.to_dict() for message in chat_request.chat_history]
+        if not kwargs.get("managed_tools", True):
+            return {}
 
-            function_tools: list[Tool] = []
-            for tool in chat_request.tools:
-                available_tool = AVAILABLE_TOOLS.get(tool.name)
-                if available_tool and available_tool.category == Category.Function:
-                    function_tools.append(Tool(**available_tool.model_dump()))
+        # Generate Search Queries
+        chat_history = [message.to_dict() for message in chat_request.chat_history]
 
-            if len(function_tools) > 0:
-                tool_results = self.get_tool_results(
-                    chat_request.message, function_tools, deployment_model
-                )
+        function_tools: list[Tool] = []
+        for tool in chat_request.tools:
+            available_tool = AVAILABLE_TOOLS.get(tool.name)
+            if available_tool and available_tool.category == Category.Function:
+                function_tools.append(Tool(**available_tool.model_dump()))
 
-                chat_request.tools = None
-                if kwargs.get("stream", True) is True:
-                    return deployment_model.invoke_chat_stream(
-                        chat_request,
-                        tool_results=tool_results,
-                    )
-                else:
-                    return deployment_model.invoke_chat(
-                        chat_request,
-                        tool_results=tool_results,
-                    )
-
-            queries = deployment_model.invoke_search_queries(
-                chat_request.message, chat_history
+        if len(function_tools) > 0:
+            tool_results = self.get_tool_results(
+                chat_request.message, function_tools, deployment_model
             )
-            self.logger.info(f"Search queries generated: {queries}")
 
-            # Fetch Documents
-            retrievers = self.get_retrievers(
-                kwargs.get("file_paths", []), [tool.name for tool in chat_request.tools]
-            )
-            self.logger.info(
-                f"Using retrievers: {[retriever.__class__.__name__ for retriever in retrievers]}"
-            )
+            chat_request.tools = None
+            return {"tool_results": tool_results}
+
+        queries = invoke_search_queries_cached(
+            deployment_model,
+            chat_request.message,
+            chat_history,
+            deployment_name=kwargs.get("deployment_name"),
+            model=chat_request.model,
+        )
+        self.logger.info(f"Search queries generated: {queries}")
+
+        # Fetch Documents
+        retrievers = self.get_retrievers(
+            kwargs.get("file_paths", []),
+            [tool.name for tool in chat_request.tools],
+            kwargs.get("conversation_id"),
+        )
+        self.logger.info(
+            f"Using retrievers: {[retriever.__class__.__name__ for retriever in retrievers]}"
+        )
+
+        # No search queries were generated but retrievers were selected, use user message as query
+        if len(queries) == 0 and len(retrievers) > 0:
+            queries = [chat_request.message]
 
-            # No search queries were generated but retrievers were selected, use user message as query
-            if len(queries) == 0 and len(retrievers) > 0:
-                queries = [chat_request.message]
-
-            all_documents = {}
-            # TODO: call in parallel and error handling
-            for retriever in retrievers:
-                for query in queries:
-                    all_documents.setdefault(query, []).extend(
-                        retriever.retrieve_documents(query)
-                    )
-
-            # Collate Documents
-            documents = combine_documents(all_documents, deployment_model)
-            chat_request.documents = documents
-            chat_request.tools = []
-
-        # Generate Response
-        if kwargs.get("stream", True) is True:
-            return deployment_model.invoke_chat_stream(chat_request)
-        else:
-            return deployment_model.invoke_chat(chat_request)
+        all_documents = retrieve_documents_in_parallel(retrievers, queries)
+
+        # Collate Documents
+        documents = combine_documents(all_documents, deployment_model)
+        chat_request.documents = documents
+        chat_request.tools = []
+
+        return {}
 
     def get_retrievers(
-        self, file_paths: list[str], req_tools: list[ToolName]
+        self,
+        file_paths: list[str],
+        req_tools: list[ToolName],
+        conversation_id: str | None = None,
     ) -> list[Any]:
         """
         Get retrievers for the required tools.
 
+        File loaders with a `from_file_paths` constructor get one retriever searching
+        all the files at once, the others get one retriever per file.
+
         Args:
             file_paths (list[str]): File paths.
             req_tools (list[str]): Required tools.
+            conversation_id (str | None): Conversation the files are attached to.
 
         Returns:
             list[Any]: Retriever implementations.
@@ -135,10 +221,22 @@ class CustomChat(BaseChat):
                 continue
 
             if tool.category == Category.FileLoader and file_paths is not None:
+                if hasattr(tool.implementation, "from_file_paths"):
+                    if file_paths:
+                        retrievers.append(
+                            tool.implementation.from_file_paths(
+                                file_paths, conversation_id
+                            )
+                        )
+                    continue
+
                 for file_path in file_paths:
                     retrievers.append(tool.implementation(file_path, **tool.kwargs))
             elif tool.category != Category.FileLoader:
-                retrievers.append(tool.implementation(**tool.kwargs))
+                retriever = tool.implementation(**tool.kwargs)
+                if tool.cache_ttl:
+                    retriever = CachedRetrieval(retriever, tool.kwargs, tool.cache_ttl)
+                retrievers.append(retriever)
 
         return retrievers
 
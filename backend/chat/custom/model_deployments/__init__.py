@@ -1,11 +1,19 @@
 from backend.chat.custom.model_deployments.azure import AzureDeployment
 from backend.chat.custom.model_deployments.cohere_platform import CohereDeployment
-from backend.chat.custom.model_deployments.deployment import get_deployment
+from backend.chat.custom.model_deployments.deployment import (
+    acquire_deployment,
+    get_deployment,
+    release_deployment,
+    reset_deployment,
+)
 from backend.chat.custom.model_deployments.sagemaker import SageMakerDeployment
 
 __all__ = [
     "AzureDeployment",
     "CohereDeployment",
     "SageMakerDeployment",
+    "acquire_deployment",
     "get_deployment",
+    "release_deployment",
+    "reset_deployment",
 ]
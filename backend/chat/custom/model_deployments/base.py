@@ -1,7 +1,8 @@
 from abc import abstractmethod
-from typing import Any, Dict, Generator, List
+from typing import Any, AsyncGenerator, Dict, Generator, List
 
 from cohere.types import StreamedChatResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
 from backend.schemas.cohere_chat import CohereChatRequest
 
@@ -10,14 +11,22 @@ class BaseDeployment:
     """Base for all model deployment options.
 
     rerank_enabled: bool: Whether the deployment supports reranking.
+    rerank_model: str | None: Model used by invoke_rerank, part of the rerank cache key.
     invoke_chat_stream: Generator[StreamedChatResponse, None, None]: Invoke the chat stream.
     invoke_search_queries: list[str]: Invoke the search queries.
     invoke_rerank: Any: Invoke the rerank.
     invoke_tools: Any: Invoke the tools.
     list_models: List[str]: List all models.
     is_available: bool: Check if the deployment is available.
+    close: None: Release the deployment's clients, called when it's reset.
+
+    Every invoke method has an `_async` counterpart used by async routes. The defaults
+    run the sync implementation in the threadpool, deployments with a native async
+    client should override them so streams don't hold a worker thread.
     """
 
+    rerank_model: str | None = None
+
     @property
     @abstractmethod
     def rerank_enabled(self) -> bool: ...
@@ -51,3 +60,38 @@ class BaseDeployment:
 
     @staticmethod
     def is_available() -> bool: ...
+
+    def close(self) -> None:
+        """Close the HTTP clients owned by the deployment, shared clients are left open."""
+
+    async def invoke_chat_async(
+        self, chat_request: CohereChatRequest, **kwargs: Any
+    ) -> Any:
+        return await run_in_threadpool(self.invoke_chat, chat_request, **kwargs)
+
+    async def invoke_chat_stream_async(
+        self, chat_request: CohereChatRequest, **kwargs: Any
+    ) -> AsyncGenerator[StreamedChatResponse, None]:
+        stream = self.invoke_chat_stream(chat_request, **kwargs)
+        async for event in iterate_in_threadpool(stream):
+            yield event
+
+    async def invoke_search_queries_async(
+        self,
+        message: str,
+        chat_history: List[Dict[str, str]] | None = None,
+        **kwargs: Any
+    ) -> list[str]:
+        return await run_in_threadpool(
+            self.invoke_search_queries, message, chat_history, **kwargs
+        )
+
+    async def invoke_rerank_async(
+        self, query: str, documents: List[Dict[str, Any]], **kwargs: Any
+    ) -> Any:
+        return await run_in_threadpool(self.invoke_rerank, query, documents, **kwargs)
+
+    async def invoke_tools_async(
+        self, message: str, tools: List[Any], **kwargs: Any
+    ) -> Any:
+        return await run_in_threadpool(self.invoke_tools, message, tools, **kwargs)
@@ -1,12 +1,17 @@
 import logging
 import os
-from typing import Any, Dict, Generator, List
+from typing import Any, AsyncGenerator, Dict, Generator, List
 
 import cohere
 import requests
 from cohere.types import StreamedChatResponse
 
 from backend.chat.custom.model_deployments.base import BaseDeployment
+from backend.chat.custom.model_deployments.http_client import (
+    close_async_httpx_client,
+    create_async_httpx_client,
+    create_httpx_client,
+)
 from backend.schemas.cohere_chat import CohereChatRequest
 
 
@@ -15,9 +20,27 @@ class CohereDeployment(BaseDeployment):
 
     api_key = os.environ.get("COHERE_API_KEY")
     client_name = "cohere-toolkit"
+    rerank_model = "rerank-english-v2.0"
 
     def __init__(self):
-        self.client = cohere.Client(api_key=self.api_key, client_name=self.client_name)
+        # Read credentials on construction so rebuilt instances pick up updated env vars
+        self.api_key = os.environ.get("COHERE_API_KEY")
+        self.httpx_client = create_httpx_client()
+        self.async_httpx_client = create_async_httpx_client()
+        self.client = cohere.Client(
+            api_key=self.api_key,
+            client_name=self.client_name,
+            httpx_client=self.httpx_client,
+        )
+        self.async_client = cohere.AsyncClient(
+            api_key=self.api_key,
+            client_name=self.client_name,
+            httpx_client=self.async_httpx_client,
+        )
+
+    def close(self) -> None:
+        self.httpx_client.close()
+        close_async_httpx_client(self.async_httpx_client)
 
     @property
     def rerank_enabled(self) -> bool:
@@ -85,10 +108,60 @@ class CohereDeployment(BaseDeployment):
         self, query: str, documents: List[Dict[str, Any]], **kwargs: Any
     ) -> Any:
         return self.client.rerank(
-            query=query, documents=documents, model="rerank-english-v2.0", **kwargs
+            query=query, documents=documents, model=self.rerank_model, **kwargs
         )
 
     def invoke_tools(self, message: str, tools: List[Any], **kwargs: Any) -> List[Any]:
         return self.client.chat(
             message=message, tools=tools, model="command-r", **kwargs
         )
+
+    async def invoke_chat_async(
+        self, chat_request: CohereChatRequest, **kwargs: Any
+    ) -> Any:
+        return await self.async_client.chat(
+            **chat_request.model_dump(exclude={"stream"}),
+            **kwargs,
+        )
+
+    async def invoke_chat_stream_async(
+        self, chat_request: CohereChatRequest, **kwargs: Any
+    ) -> AsyncGenerator[StreamedChatResponse, None]:
+        stream = self.async_client.chat_stream(
+            **chat_request.model_dump(exclude={"stream"}),
+            **kwargs,
+        )
+        async for event in stream:
+            yield event.__dict__
+
+    async def invoke_search_queries_async(
+        self,
+        message: str,
+        chat_history: List[Dict[str, str]] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        res = await self.async_client.chat(
+            message=message,
+            chat_history=chat_history,
+            search_queries_only=True,
+            **kwargs,
+        )
+
+        if not res.search_queries:
+            return []
+
+        return [s.text for s in res.search_queries]
+
+    async def invoke_rerank_async(
+        self, query: str, documents: List[Dict[str, Any]], **kwargs: Any
+    ) -> Any:
+        return await self.async_client.rerank(
+            query=query, documents=documents, model=self.rerank_model, **kwargs
+        )
+
+    async def invoke_tools_async(
+        self, message: str, tools: List[Any], **kwargs: Any
+    ) -> List[Any]:
+        return await self.async_client.chat(
+            message=message, tools=tools, model="command-r", **kwargs
+        )
@@ -1,10 +1,47 @@
+import threading
+from collections import Counter
+from typing import Any, AsyncGenerator, AsyncIterable, Generator, Iterable
+
 from backend.chat.custom.model_deployments.base import BaseDeployment
 from backend.config.deployments import AVAILABLE_MODEL_DEPLOYMENTS, ModelDeploymentName
+from backend.services.logger import get_logger
+
+logger = get_logger()
+
+# Process-wide registry of long-lived deployment instances, built on first use.
+# Deployment clients are thread-safe, so one instance serves every request.
+_deployment_instances: dict[str, BaseDeployment] = {}
+_deployment_instances_lock = threading.Lock()
+# Requests holding each instance through acquire_deployment
+_deployment_users: Counter[BaseDeployment] = Counter()
+# Instances dropped by reset_deployment while in use, closed by their last release
+_reset_instances: set[BaseDeployment] = set()
 
 
 def get_deployment(deployment_name) -> BaseDeployment:
     """Get the deployment implementation.
 
+    The instance can be closed by reset_deployment at any time, use
+    acquire_deployment to keep it open while it is in use.
+
+    Args:
+        deployment (str): Deployment name.
+
+    Returns:
+        BaseDeployment: Deployment implementation instance based on the deployment name.
+
+    Raises:
+        ValueError: If the deployment is not supported.
+    """
+    return _get_or_create_instance(_get_available_deployment_name(deployment_name))
+
+
+def acquire_deployment(deployment_name) -> BaseDeployment:
+    """Get the deployment implementation and keep it open until it is released.
+
+    A deployment reset while in use is closed by the last release_deployment
+    call instead, so ongoing requests can finish with it.
+
     Args:
         deployment (str): Deployment name.
 
@@ -14,17 +51,143 @@ def get_deployment(deployment_name) -> BaseDeployment:
     Raises:
         ValueError: If the deployment is not supported.
     """
+    deployment_name = _get_available_deployment_name(deployment_name)
+
+    # Under the lock, so a reset can't close the instance before it is counted
+    with _deployment_instances_lock:
+        instance = _get_or_create_instance_locked(deployment_name)
+        _deployment_users[instance] += 1
+
+    return instance
+
+
+def release_deployment(instance: BaseDeployment) -> None:
+    """Release a deployment from acquire_deployment, closing it if it was reset meanwhile.
+
+    Args:
+        instance (BaseDeployment): Deployment implementation instance.
+    """
+    with _deployment_instances_lock:
+        if _deployment_users[instance] > 1:
+            _deployment_users[instance] -= 1
+            return
+
+        _deployment_users.pop(instance, None)
+        if instance not in _reset_instances:
+            return
+        _reset_instances.remove(instance)
+
+    _close_instance(instance)
+
+
+def release_after_stream(
+    instance: BaseDeployment, stream: Iterable[Any]
+) -> Generator[Any, None, None]:
+    """Yield the events of a stream, then release the deployment that produces it.
+
+    Args:
+        instance (BaseDeployment): Deployment from acquire_deployment.
+        stream (Iterable[Any]): Stream of the deployment.
+
+    Yields:
+        Any: Stream events.
+    """
+    try:
+        yield from stream
+    finally:
+        release_deployment(instance)
+
+
+async def release_after_async_stream(
+    instance: BaseDeployment, stream: AsyncIterable[Any]
+) -> AsyncGenerator[Any, None]:
+    """Async version of release_after_stream.
+
+    Args:
+        instance (BaseDeployment): Deployment from acquire_deployment.
+        stream (AsyncIterable[Any]): Stream of the deployment.
+
+    Yields:
+        Any: Stream events.
+    """
+    try:
+        async for event in stream:
+            yield event
+    finally:
+        release_deployment(instance)
+
+
+def reset_deployment(deployment_name: str | None = None) -> None:
+    """Drop cached deployment instances so they are rebuilt on next use.
+
+    Call this after credentials or endpoints change, e.g. when env vars are updated.
+    Instances without users are closed, the others once they are released.
+
+    Args:
+        deployment_name (str | None): Deployment name, or None to reset all deployments.
+    """
+    with _deployment_instances_lock:
+        if deployment_name is None:
+            instances = list(_deployment_instances.values())
+            _deployment_instances.clear()
+        else:
+            instance = _deployment_instances.pop(deployment_name, None)
+            instances = [] if instance is None else [instance]
+
+        unused_instances = []
+        for instance in instances:
+            if _deployment_users[instance] > 0:
+                _reset_instances.add(instance)
+            else:
+                _deployment_users.pop(instance, None)
+                unused_instances.append(instance)
+
+    # Close outside the lock, the other deployments stay usable meanwhile
+    for instance in unused_instances:
+        _close_instance(instance)
+
+
+def _get_available_deployment_name(deployment_name) -> str:
     deployment = AVAILABLE_MODEL_DEPLOYMENTS.get(deployment_name)
 
     # Check provided deployment against config const
     if deployment is not None and deployment.is_available:
-        return deployment.deployment_class()
+        return deployment_name
 
     # Fallback to first available deployment
-    for deployment in AVAILABLE_MODEL_DEPLOYMENTS.values():
+    for name, deployment in AVAILABLE_MODEL_DEPLOYMENTS.items():
         if deployment.is_available:
-            return deployment.deployment_class()
+            return name
 
     raise ValueError(
         f"Deployment {deployment_name} is not supported, and no available deployments were found."
     )
+
+
+def _close_instance(instance: BaseDeployment) -> None:
+    try:
+        instance.close()
+    except Exception as e:
+        logger.error(f"Failed to close deployment {instance.__class__.__name__}: {e}")
+
+
+def _get_or_create_instance(deployment_name: ModelDeploymentName) -> BaseDeployment:
+    instance = _deployment_instances.get(deployment_name)
+    if instance is not None:
+        return instance
+
+    with _deployment_instances_lock:
+        # Another thread may have built it while we waited for the lock
+        return _get_or_create_instance_locked(deployment_name)
+
+
+def _get_or_create_instance_locked(
+    deployment_name: ModelDeploymentName,
+) -> BaseDeployment:
+    instance = _deployment_instances.get(deployment_name)
+    if instance is None:
+        deployment = AVAILABLE_MODEL_DEPLOYMENTS[deployment_name]
+        instance = deployment.deployment_class()
+        _deployment_instances[deployment_name] = instance
+
+    return instance
@@ -0,0 +1,97 @@
+import asyncio
+import os
+
+import anyio.from_thread
+import httpx
+from botocore.config import Config as BotocoreConfig
+
+"""
+Connection pool settings shared by the long-lived deployment clients.
+
+Each deployment instance owns its own pool, sized with the values below.
+"""
+
+# Maximum number of open connections per deployment client
+DEPLOYMENT_MAX_CONNECTIONS = int(os.getenv("DEPLOYMENT_MAX_CONNECTIONS", "100"))
+# Maximum number of idle connections kept alive per deployment client
+DEPLOYMENT_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("DEPLOYMENT_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+# Seconds an idle connection is kept alive before being closed
+DEPLOYMENT_KEEPALIVE_EXPIRY = float(os.getenv("DEPLOYMENT_KEEPALIVE_EXPIRY", "30"))
+# Seconds to wait for a response, long enough for a full generation
+DEPLOYMENT_TIMEOUT = float(os.getenv("DEPLOYMENT_TIMEOUT", "300"))
+
+# Closing tasks scheduled on the running loop, kept so they aren't garbage collected
+_closing_tasks: set[asyncio.Task] = set()
+
+
+def get_httpx_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=DEPLOYMENT_MAX_CONNECTIONS,
+        max_keepalive_connections=DEPLOYMENT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=DEPLOYMENT_KEEPALIVE_EXPIRY,
+    )
+
+
+def create_httpx_client() -> httpx.Client:
+    """
+    Create a pooled HTTP client for sync deployment calls.
+
+    Returns:
+        httpx.Client: HTTP client with keep-alive connection pooling.
+    """
+    return httpx.Client(limits=get_httpx_limits(), timeout=DEPLOYMENT_TIMEOUT)
+
+
+def create_async_httpx_client() -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP client for async deployment calls.
+
+    Returns:
+        httpx.AsyncClient: HTTP client with keep-alive connection pooling.
+    """
+    return httpx.AsyncClient(limits=get_httpx_limits(), timeout=DEPLOYMENT_TIMEOUT)
+
+
+def close_async_httpx_client(client: httpx.AsyncClient) -> None:
+    """
+    Close an async HTTP client from sync or async code.
+
+    On the event loop thread, the close is scheduled as a task. From a threadpool
+    worker of the event loop, it runs on that loop. Without an event loop, it runs
+    on a new one.
+
+    Args:
+        client (httpx.AsyncClient): HTTP client to close.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is not None:
+        task = loop.create_task(client.aclose())
+        _closing_tasks.add(task)
+        task.add_done_callback(_closing_tasks.discard)
+        return
+
+    try:
+        anyio.from_thread.run(client.aclose)
+    except RuntimeError:
+        # Not in a worker thread of an event loop, e.g. scripts and tests
+        asyncio.run(client.aclose())
+
+
+def get_botocore_config() -> BotocoreConfig:
+    """
+    Get the botocore config used for AWS runtime clients.
+
+    Returns:
+        BotocoreConfig: Config with a connection pool sized like the HTTP clients.
+    """
+    return BotocoreConfig(
+        max_pool_connections=DEPLOYMENT_MAX_CONNECTIONS,
+        tcp_keepalive=True,
+        read_timeout=DEPLOYMENT_TIMEOUT,
+    )
@@ -0,0 +1,103 @@
+import os
+from typing import Any, Iterable, Iterator, List
+
+# Upper bound for a single undelimited line, guards against a stream that never sends "\n"
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", str(8 * 1024 * 1024)))
+
+
+class LineDecoder:
+    """
+    Incremental newline splitter for streamed bytes.
+
+    Each chunk is split in C with bytes.split, and only the unterminated tail is
+    kept, in a bytearray that grows in place until its newline arrives. Bytes of
+    complete lines are never held past the call that returns them, so memory is
+    bounded by the longest pending line rather than the whole response.
+
+    Lines are split on b"\\n", which never occurs inside a multi-byte UTF-8
+    sequence, so characters and JSON objects split across chunks are reassembled
+    before a line is returned.
+    """
+
+    def __init__(self, max_line_bytes: int = STREAM_MAX_LINE_BYTES):
+        self.max_line_bytes = max_line_bytes
+        # Start of a line whose newline hasn't arrived yet
+        self._pending = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Add a chunk of bytes and return the lines it completes.
+
+        Args:
+            data (bytes): Chunk of the stream.
+
+        Returns:
+            List[bytes]: Complete non-empty lines, without the trailing newline.
+
+        Raises:
+            ValueError: If a line grows beyond max_line_bytes.
+        """
+        if b"\n" not in data:
+            self._pending += data
+            self._check_pending()
+            return []
+
+        lines = data.split(b"\n")
+        tail = lines.pop()
+        if self._pending:
+            self._pending += lines[0]
+            lines[0] = bytes(self._pending)
+        self._pending = bytearray(tail)
+        self._check_pending()
+
+        # Skip blank keep-alive lines
+        if b"" in lines:
+            lines = [line for line in lines if line]
+        return lines
+
+    def flush(self) -> bytes | None:
+        """
+        Return the pending bytes of an unterminated last line, if any.
+
+        Returns:
+            bytes | None: Last line, or None if there is nothing pending.
+        """
+        line = bytes(self._pending)
+        self._pending = bytearray()
+        return line if line.strip() else None
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._pending)
+
+    def _check_pending(self) -> None:
+        if len(self._pending) > self.max_line_bytes:
+            raise ValueError(
+                f"Stream line exceeds the maximum of {self.max_line_bytes} bytes."
+            )
+
+
+def iter_payload_lines(
+    event_stream: Iterable[Any], max_line_bytes: int = STREAM_MAX_LINE_BYTES
+) -> Iterator[bytes]:
+    """
+    Iterate through each line of a SageMaker response stream.
+    https://aws.amazon.com/blogs/machine-learning/elevating-the-generative-ai-experience-introducing-streaming-support-in-amazon-sagemaker-hosting/
+
+    Args:
+        event_stream (Iterable[Any]): SageMaker event stream.
+        max_line_bytes (int): Maximum size of a single line.
+
+    Yields:
+        bytes: Each line of the response, without the trailing newline.
+    """
+    decoder = LineDecoder(max_line_bytes)
+    for chunk in event_stream:
+        if "PayloadPart" not in chunk:
+            # Unknown event type
+            continue
+        yield from decoder.feed(chunk["PayloadPart"]["Bytes"])
+
+    last_line = decoder.flush()
+    if last_line is not None:
+        yield last_line
@@ -1,12 +1,19 @@
-import io
 import json
 import os
-from typing import Any, Dict, Generator, List
+import threading
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Dict, Generator, List
 
 import boto3
 from cohere.types import StreamedChatResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
 from backend.chat.custom.model_deployments.base import BaseDeployment
+from backend.chat.custom.model_deployments.http_client import get_botocore_config
+from backend.chat.custom.model_deployments.line_decoder import (
+    LineDecoder,
+    iter_payload_lines,
+)
 from backend.schemas.cohere_chat import CohereChatRequest
 
 
@@ -22,14 +29,51 @@ class SageMakerDeployment(BaseDeployment):
     region_name = os.environ.get("SAGE_MAKER_REGION_NAME")
     endpoint_name = os.environ.get("SAGE_MAKER_ENDPOINT_NAME")
 
+    # Runtime clients shared by every instance, keyed by (profile, region)
+    _runtime_clients: Dict[tuple, Any] = {}
+    _runtime_clients_lock = threading.Lock()
+
     def __init__(self):
-        boto3.setup_default_session(profile_name=self.profile_name)
-        # Create the AWS client for the Bedrock runtime with boto3
-        self.client = boto3.client("sagemaker-runtime", region_name=self.region_name)
-        self.params = {
-            "EndpointName": self.endpoint_name,
-            "ContentType": "application/json",
-        }
+        # Read settings on construction so rebuilt instances pick up updated env vars
+        self.profile_name = os.environ.get("SAGE_MAKER_PROFILE_NAME")
+        self.region_name = os.environ.get("SAGE_MAKER_REGION_NAME")
+        self.endpoint_name = os.environ.get("SAGE_MAKER_ENDPOINT_NAME")
+        self.client = self.get_runtime_client(self.profile_name, self.region_name)
+        # Shared across concurrent calls, per-call payloads are built in _request_params
+        self.params = MappingProxyType(
+            {
+                "EndpointName": self.endpoint_name,
+                "ContentType": "application/json",
+            }
+        )
+
+    @classmethod
+    def get_runtime_client(cls, profile_name: str | None, region_name: str | None):
+        """
+        Get the pooled sagemaker-runtime client for a profile and region.
+
+        boto3 clients are thread-safe, but creating them is not, and
+        boto3.setup_default_session mutates global state. Build each client once
+        from its own Session and share it across threads and tasks.
+        """
+        key = (profile_name, region_name)
+        client = cls._runtime_clients.get(key)
+        if client is not None:
+            return client
+
+        with cls._runtime_clients_lock:
+            client = cls._runtime_clients.get(key)
+            if client is None:
+                session = boto3.Session(profile_name=profile_name)
+                # Create the AWS client for the Bedrock runtime with boto3
+                client = session.client(
+                    "sagemaker-runtime",
+                    region_name=region_name,
+                    config=get_botocore_config(),
+                )
+                cls._runtime_clients[key] = client
+
+        return client
 
     @property
     def rerank_enabled(self) -> bool:
@@ -55,21 +99,42 @@ class SageMakerDeployment(BaseDeployment):
     def invoke_chat_stream(
         self, chat_request: CohereChatRequest, **kwargs: Any
     ) -> Generator[StreamedChatResponse, None, None]:
-        # Create the payload for the request
-        json_params = {
-            "prompt_truncation": "AUTO_PRESERVE_ORDER",
-            "stream": True,
-            "message": chat_request.message,
-            "chat_history": [x.to_dict() for x in chat_request.chat_history],
-            "documents": chat_request.documents,
-        }
-        self.params["Body"] = json.dumps(json_params)
+        params = self._request_params(self._chat_stream_body(chat_request))
 
         # Invoke the model and print the response
-        result = self.client.invoke_endpoint_with_response_stream(**self.params)
+        result = self.client.invoke_endpoint_with_response_stream(**params)
+        event_stream = result["Body"]
+        for index, line in enumerate(iter_payload_lines(event_stream)):
+            stream_event = json.loads(line)
+            stream_event["index"] = index
+            yield stream_event
+
+    async def invoke_chat_stream_async(
+        self, chat_request: CohereChatRequest, **kwargs: Any
+    ) -> AsyncGenerator[StreamedChatResponse, None]:
+        params = self._request_params(self._chat_stream_body(chat_request))
+
+        # boto3 has no async client, keep the blocking socket reads off the event loop
+        result = await run_in_threadpool(
+            self.client.invoke_endpoint_with_response_stream, **params
+        )
         event_stream = result["Body"]
-        for index, line in enumerate(SageMakerDeployment.LineIterator(event_stream)):
-            stream_event = json.loads(line.decode())
+        # Only the socket reads go to the threadpool, lines are split on the event loop
+        decoder = LineDecoder()
+        index = 0
+        async for chunk in iterate_in_threadpool(iter(event_stream)):
+            if "PayloadPart" not in chunk:
+                # Unknown event type
+                continue
+            for line in decoder.feed(chunk["PayloadPart"]["Bytes"]):
+                stream_event = json.loads(line)
+                stream_event["index"] = index
+                index += 1
+                yield stream_event
+
+        last_line = decoder.flush()
+        if last_line is not None:
+            stream_event = json.loads(last_line)
             stream_event["index"] = index
             yield stream_event
 
@@ -79,50 +144,42 @@ class SageMakerDeployment(BaseDeployment):
         chat_history: List[Dict[str, str]] | None = None,
         **kwargs: Any
     ) -> list[str]:
+        params = self._request_params(self._search_queries_body(message, chat_history))
+
+        # Invoke the model and print the response
+        result = self.client.invoke_endpoint(**params)
+        response = json.loads(result["Body"].read().decode())
+        return [s["text"] for s in response["search_queries"]]
+
+    def _request_params(self, body: str) -> Dict[str, Any]:
+        # Build a new dict per call, the shared params must never hold a request body
+        return {**self.params, "Body": body}
+
+    @staticmethod
+    def _chat_stream_body(chat_request: CohereChatRequest) -> str:
+        # Create the payload for the request
+        json_params = {
+            "prompt_truncation": "AUTO_PRESERVE_ORDER",
+            "stream": True,
+            "message": chat_request.message,
+            "chat_history": [x.to_dict() for x in chat_request.chat_history],
+            "documents": chat_request.documents,
+        }
+        return json.dumps(json_params)
+
+    @staticmethod
+    def _search_queries_body(
+        message: str, chat_history: List[Dict[str, str]] | None = None
+    ) -> str:
         # Create the payload for the request
         json_params = {
             "search_queries_only": True,
             "message": message,
             "chat_history": chat_history,
         }
-        self.params["Body"] = json.dumps(json_params)
-
-        # Invoke the model and print the response
-        result = self.client.invoke_endpoint(**self.params)
-        response = json.loads(result["Body"].read().decode())
-        return [s["text"] for s in response["search_queries"]]
+        return json.dumps(json_params)
 
     def invoke_rerank(
         self, query: str, documents: List[Dict[str, Any]], **kwargs: Any
     ) -> Any:
         return None
-
-    # This class iterates through each line of Sagemaker's response
-    # https://aws.amazon.com/blogs/machine-learning/elevating-the-generative-ai-experience-introducing-streaming-support-in-amazon-sagemaker-hosting/
-    class LineIterator:
-        def __init__(self, stream):
-            self.byte_iterator = iter(stream)
-            self.buffer = io.BytesIO()
-            self.read_pos = 0
-
-        def __iter__(self):
-            return self
-
-        def __next__(self):
-            while True:
-                self.buffer.seek(self.read_pos)
-                line = self.buffer.readline()
-                if line and line[-1] == ord("\n"):
-                    self.read_pos += len(line)
-                    return line[:-1]
-                try:
-                    chunk = next(self.byte_iterator)
-                except StopIteration:
-                    if self.read_pos < self.buffer.getbuffer().nbytes:
-                        continue
-                    raise
-                if "PayloadPart" not in chunk:
-                    # Unknown event type
-                    continue
-                self.buffer.seek(0, io.SEEK_END)
-                self.buffer.write(chunk["PayloadPart"]["Bytes"])
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+
+from backend.chat.custom.model_deployments.base import BaseDeployment
+from backend.services.cache import (
+    CACHE_BACKEND,
+    CACHE_MAX_ENTRIES,
+    BaseCache,
+    create_cache,
+)
+from backend.services.metrics import metrics
+
+"""
+Cache of generated search queries.
+
+Generating search queries is a model round trip before retrieval can start.
+Regenerated turns and common questions reuse the queries generated for the
+same deployment, model, message and end of the chat history.
+"""
+
+# Seconds generated search queries are cached for, 0 disables the cache
+SEARCH_QUERY_CACHE_TTL = float(os.getenv("SEARCH_QUERY_CACHE_TTL", "3600"))
+# Number of most recent chat history messages the cache key depends on
+SEARCH_QUERY_CACHE_HISTORY_MESSAGES = int(
+    os.getenv("SEARCH_QUERY_CACHE_HISTORY_MESSAGES", "4")
+)
+# Backend of the search query cache, defaults to CACHE_BACKEND
+SEARCH_QUERY_CACHE_BACKEND = os.getenv("SEARCH_QUERY_CACHE_BACKEND", CACHE_BACKEND)
+# Maximum number of cached search query generations
+SEARCH_QUERY_CACHE_MAX_ENTRIES = int(
+    os.getenv("SEARCH_QUERY_CACHE_MAX_ENTRIES", str(CACHE_MAX_ENTRIES))
+)
+
+search_query_cache = create_cache(
+    SEARCH_QUERY_CACHE_BACKEND, "search_queries", SEARCH_QUERY_CACHE_MAX_ENTRIES
+)
+
+
+def get_search_query_cache_key(
+    deployment_name: str | None,
+    model: str | None,
+    message: str,
+    chat_history: List[Dict[str, str]] | None,
+    history_messages: int = SEARCH_QUERY_CACHE_HISTORY_MESSAGES,
+) -> str:
+    """
+    Get the cache key of a search query generation.
+
+    Args:
+        deployment_name (str | None): Name of the deployment.
+        model (str | None): Model of the chat request.
+        message (str): User message.
+        chat_history (List[Dict[str, str]] | None): Chat history.
+        history_messages (int): Number of most recent history messages in the key.
+
+    Returns:
+        str: Cache key.
+    """
+    history = (chat_history or [])[-history_messages:] if history_messages > 0 else []
+    key = [deployment_name, model, message.strip(), history]
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def invoke_search_queries_cached(
+    deployment_model: BaseDeployment,
+    message: str,
+    chat_history: List[Dict[str, str]] | None = None,
+    deployment_name: str | None = None,
+    model: str | None = None,
+    cache: BaseCache | None = None,
+    ttl: float = SEARCH_QUERY_CACHE_TTL,
+    **kwargs: Any,
+) -> list[str]:
+    """
+    Generate search queries, reusing the ones cached for the same turn.
+
+    Args:
+        deployment_model (BaseDeployment): Deployment generating the queries.
+        message (str): User message.
+        chat_history (List[Dict[str, str]] | None): Chat history.
+        deployment_name (str | None): Name of the deployment.
+        model (str | None): Model of the chat request.
+        cache (BaseCache | None): Cache to use, the shared search query cache if None.
+        ttl (float): Seconds the queries are cached for, 0 disables the cache.
+        **kwargs (Any): Keyword arguments for invoke_search_queries.
+
+    Returns:
+        list[str]: Search queries, empty if the turn needs no retrieval.
+    """
+    if ttl <= 0:
+        return deployment_model.invoke_search_queries(message, chat_history, **kwargs)
+
+    cache = search_query_cache if cache is None else cache
+    key = get_search_query_cache_key(deployment_name, model, message, chat_history)
+
+    queries = cache.get(key)
+    if queries is not None:
+        metrics.increment("search_query_cache.hits")
+        return queries
+
+    metrics.increment("search_query_cache.misses")
+    queries = deployment_model.invoke_search_queries(message, chat_history, **kwargs)
+    cache.set(key, queries, ttl)
+    return queries
@@ -0,0 +1,114 @@
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, List
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.schemas.chat import ChatResponse, ChatResponseEvent
+
+"""
+Serialization of chat stream events for the SSE response.
+
+Text and citation generation events make up almost the whole stream, so they
+skip the pydantic models and jsonable_encoder and are formatted from templates
+straight into framed SSE bytes. The output is byte-identical to the generic
+path: json.dumps with its default separators and ensure_ascii, framed the way
+sse_starlette frames a str with the default separator.
+"""
+
+SSE_SEPARATOR = "\r\n"
+
+_JSON_BOOLS = {True: "true", False: "false"}
+
+_TEXT_GENERATION_TEMPLATE = (
+    'data: {"event": "text-generation", "data": {"is_finished": %s, "text": %s}}'
+    + SSE_SEPARATOR * 2
+)
+_CITATION_GENERATION_TEMPLATE = (
+    'data: {"event": "citation-generation", "data": {"is_finished": %s, "citations": [%s]}}'
+    + SSE_SEPARATOR * 2
+)
+_CITATION_TEMPLATE = '{"text": %s, "start": %s, "end": %s, "document_ids": [%s]}'
+
+
+def encode_chat_response_event(stream_event: ChatResponse) -> str:
+    """
+    Serialize any chat stream event, sse_starlette frames the returned str.
+
+    Args:
+        stream_event (ChatResponse): Stream event.
+
+    Returns:
+        str: JSON representation of the ChatResponseEvent.
+    """
+    return json.dumps(
+        jsonable_encoder(
+            ChatResponseEvent(
+                event=stream_event.event_type.value,
+                data=stream_event,
+            )
+        )
+    )
+
+
+def encode_text_generation(text: Any, is_finished: Any) -> bytes | None:
+    """
+    Serialize a text generation event into a framed SSE message.
+
+    Args:
+        text (Any): Generated text.
+        is_finished (Any): Whether the stream has finished.
+
+    Returns:
+        bytes | None: SSE message, or None if the values need pydantic validation.
+    """
+    if type(text) is not str or type(is_finished) is not bool:
+        return None
+
+    return (
+        _TEXT_GENERATION_TEMPLATE
+        % (_JSON_BOOLS[is_finished], encode_basestring_ascii(text))
+    ).encode("ascii")
+
+
+def encode_citation_generation(citations: List[Any], is_finished: Any) -> bytes | None:
+    """
+    Serialize a citation generation event into a framed SSE message.
+
+    Args:
+        citations (List[Any]): Citations with text, start, end and document_ids.
+        is_finished (Any): Whether the stream has finished.
+
+    Returns:
+        bytes | None: SSE message, or None if the values need pydantic validation.
+    """
+    if type(is_finished) is not bool:
+        return None
+
+    encoded_citations = []
+    for citation in citations:
+        text, start, end = citation.text, citation.start, citation.end
+        document_ids = citation.document_ids
+        if (
+            type(text) is not str
+            or type(start) is not int
+            or type(end) is not int
+            or type(document_ids) is not list
+            or any(type(document_id) is not str for document_id in document_ids)
+        ):
+            return None
+
+        encoded_citations.append(
+            _CITATION_TEMPLATE
+            % (
+                encode_basestring_ascii(text),
+                start,
+                end,
+                ", ".join(map(encode_basestring_ascii, document_ids)),
+            )
+        )
+
+    return (
+        _CITATION_GENERATION_TEMPLATE
+        % (_JSON_BOOLS[is_finished], ", ".join(encoded_citations))
+    ).encode("ascii")
@@ -30,6 +30,10 @@ class ToolName(StrEnum):
 
 
 use_langchain = bool(strtobool(os.getenv("USE_EXPERIMENTAL_LANGCHAIN", "false")))
+# Seconds documents from reference sources (Wikipedia, Arxiv, Pub Med) are cached for
+RETRIEVAL_CACHE_TTL_LONG = float(os.getenv("RETRIEVAL_CACHE_TTL_LONG", "86400"))
+# Seconds internet search results are cached for
+RETRIEVAL_CACHE_TTL_SHORT = float(os.getenv("RETRIEVAL_CACHE_TTL_SHORT", "900"))
 
 COHERE_DEPLOYMENT_TOOLS = {
     ToolName.Wiki_Retriever_LangChain: ManagedTool(
@@ -38,6 +42,7 @@ COHERE_DEPLOYMENT_TOOLS = {
         kwargs={"chunk_size": 300, "chunk_overlap": 0},
         is_visible=True,
         category=Category.DataLoader,
+        cache_ttl=RETRIEVAL_CACHE_TTL_LONG,
         description="Retrieves documents from Wikipedia using LangChain.",
     ),
     ToolName.File_Upload_Langchain: ManagedTool(
@@ -87,6 +92,7 @@ COHERE_DEPLOYMENT_TOOLS = {
         implementation=tavily.TavilyInternetSearch,
         is_visible=True,
         category=Category.DataLoader,
+        cache_ttl=RETRIEVAL_CACHE_TTL_SHORT,
         description="Returns a list of relevant document snippets for a textual query retrieved from the internet using Tavily.",
     ),
     ToolName.Arxiv: ManagedTool(
@@ -94,6 +100,7 @@ COHERE_DEPLOYMENT_TOOLS = {
         implementation=arxiv.ArxivRetriever,
         is_visible=True,
         category=Category.DataLoader,
+        cache_ttl=RETRIEVAL_CACHE_TTL_LONG,
         description="Retrieves documents from Arxiv.",
     ),
     ToolName.Pub_Med: ManagedTool(
@@ -101,6 +108,7 @@ COHERE_DEPLOYMENT_TOOLS = {
         implementation=pub_med.PubMedRetriever,
         is_visible=True,
         category=Category.DataLoader,
+        cache_ttl=RETRIEVAL_CACHE_TTL_LONG,
         description="Retrieves documents from Pub Med.",
     ),
 }
@@ -0,0 +1,133 @@
+from typing import Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
+
+from backend.crud.utils import get_insert_row
+from backend.models.citation import Citation, citation_documents
+
+"""
+Async versions of backend/crud/citation.py.
+
+Citation documents can't be lazy loaded through an AsyncSession, pass
+selectinload(Citation.documents) to read them.
+"""
+
+
+async def create_citation(db: AsyncSession, citation: Citation) -> Citation:
+    """
+    Create a new citation.
+
+    Args:
+        db (AsyncSession): Database session.
+        citation (Citation): Citation data to be created.
+
+    Returns:
+        Citation: Created citation.
+    """
+    db.add(citation)
+    await db.commit()
+    await db.refresh(citation)
+    return citation
+
+
+async def get_citation(
+    db: AsyncSession, citation_id: str, options: Sequence[ExecutableOption] = ()
+) -> Citation | None:
+    """
+    Get a citation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        citation_id (str): Citation ID.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        Citation: Citation with the given ID.
+    """
+    return await db.scalar(
+        select(Citation).where(Citation.id == citation_id).options(*options).limit(1)
+    )
+
+
+async def get_citations(
+    db: AsyncSession,
+    offset: int = 0,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Citation]:
+    """
+    List all citations.
+
+    Args:
+        db (AsyncSession): Database session.
+        offset (int): Offset to start the list.
+        limit (int): Limit of citations to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Citation]: List of citations.
+    """
+    citations = await db.scalars(
+        select(Citation).options(*options).offset(offset).limit(limit)
+    )
+    return list(citations)
+
+
+async def get_citations_by_message_id(
+    db: AsyncSession, message_id: str, options: Sequence[ExecutableOption] = ()
+) -> list[Citation]:
+    """
+    List all citations from a message.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_id (str): Message ID.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Citation]: List of citations.
+    """
+    citations = await db.scalars(
+        select(Citation).where(Citation.message_id == message_id).options(*options)
+    )
+    return list(citations)
+
+
+async def delete_citation(db: AsyncSession, citation_id: str) -> None:
+    """
+    Delete a citation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        citation_id (str): Citation ID.
+    """
+    await db.execute(delete(Citation).where(Citation.id == citation_id))
+    await db.commit()
+
+
+async def insert_citations(db: AsyncSession, citations: list[Citation]) -> None:
+    """
+    Insert citations and their document associations in bulk without committing.
+
+    The cited documents must already be inserted.
+
+    Args:
+        db (AsyncSession): Database session.
+        citations (list[Citation]): Citations to be inserted, IDs are generated if missing.
+    """
+    if not citations:
+        return
+
+    await db.execute(
+        insert(Citation), [get_insert_row(citation) for citation in citations]
+    )
+
+    associations = [
+        {"left_id": document.id, "right_id": citation.id}
+        for citation in citations
+        for document in citation.documents
+    ]
+    if associations:
+        await db.execute(insert(citation_documents), associations)
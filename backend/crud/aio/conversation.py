@@ -0,0 +1,200 @@
+import datetime
+from typing import Sequence
+
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
+
+from backend.crud.conversation import (
+    CONVERSATION_DETAIL_OPTIONS,
+    CONVERSATION_LIST_OPTIONS,
+)
+from backend.crud.utils import get_insert_row
+from backend.models.conversation import Conversation
+from backend.schemas.conversation import UpdateConversation
+
+"""
+Async versions of backend/crud/conversation.py.
+
+Relationships can't be lazy loaded through an AsyncSession, pass loader
+options such as CONVERSATION_DETAIL_OPTIONS for the ones that are read.
+"""
+
+
+async def create_conversation(
+    db: AsyncSession, conversation: Conversation
+) -> Conversation:
+    """
+    Create a new conversation.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation (Conversation): Conversation data to be created.
+
+    Returns:
+        Conversation: Created conversation.
+    """
+    db.add(conversation)
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+
+async def get_conversation(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    options: Sequence[ExecutableOption] = (),
+) -> Conversation | None:
+    """
+    Get a conversation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        Conversation: Conversation with the given conversation ID and user ID.
+    """
+    return await db.scalar(
+        select(Conversation)
+        .where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+        .options(*options)
+        .limit(1)
+    )
+
+
+async def get_conversations(
+    db: AsyncSession,
+    user_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Conversation]:
+    """
+    List all conversations.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+        offset (int): Offset to start the list.
+        limit (int): Limit of conversations to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Conversation]: List of conversations.
+    """
+    conversations = await db.scalars(
+        select(Conversation)
+        .where(Conversation.user_id == user_id)
+        .options(*options)
+        .offset(offset)
+        .limit(limit)
+    )
+    return list(conversations)
+
+
+async def get_conversations_after(
+    db: AsyncSession,
+    user_id: str,
+    after: tuple[datetime.datetime, str] | None = None,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Conversation]:
+    """
+    List conversations, most recently updated first, starting after a sort key.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+        after (tuple[datetime.datetime, str] | None): (updated_at, id) of the last conversation of the previous page.
+        limit (int): Limit of conversations to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Conversation]: Conversations ordered by updated_at and ID, descending.
+    """
+    query = select(Conversation).where(Conversation.user_id == user_id)
+    if after is not None:
+        query = query.where(tuple_(Conversation.updated_at, Conversation.id) < after)
+
+    conversations = await db.scalars(
+        query.order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+        .options(*options)
+        .limit(limit)
+    )
+    return list(conversations)
+
+
+async def update_conversation(
+    db: AsyncSession, conversation: Conversation, new_conversation: UpdateConversation
+) -> Conversation:
+    """
+    Update a conversation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation (Conversation): Conversation to be updated.
+        new_conversation (Conversation): New conversation data.
+
+    Returns:
+        Conversation: Updated conversation.
+    """
+    for attr, value in new_conversation.model_dump().items():
+        if value is not None:
+            setattr(conversation, attr, value)
+
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+
+async def delete_conversation(
+    db: AsyncSession, conversation_id: str, user_id: str
+) -> None:
+    """
+    Delete a conversation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+    """
+    await db.execute(
+        delete(Conversation).where(
+            Conversation.id == conversation_id, Conversation.user_id == user_id
+        )
+    )
+    await db.commit()
+
+
+async def insert_conversation(db: AsyncSession, conversation: Conversation) -> None:
+    """
+    Insert a conversation without committing.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation (Conversation): Conversation to be inserted, an ID is generated if missing.
+    """
+    await db.execute(insert(Conversation), [get_insert_row(conversation)])
+
+
+async def update_conversation_description(
+    db: AsyncSession, conversation_id: str, user_id: str, description: str
+) -> None:
+    """
+    Update the description of a conversation without loading or committing it.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        description (str): New description.
+    """
+    await db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+        .values(description=description)
+    )
@@ -0,0 +1,86 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.crud.utils import get_insert_row
+from backend.models.document import Document
+
+"""
+Async versions of backend/crud/document.py.
+"""
+
+
+async def create_document(db: AsyncSession, document: Document) -> Document:
+    """
+    Create a new document.
+
+    Args:
+        db (AsyncSession): Database session.
+        document (Document): Document data to be created.
+
+    Returns:
+        Document: Created document.
+    """
+    db.add(document)
+    await db.commit()
+    await db.refresh(document)
+    return document
+
+
+async def get_document(db: AsyncSession, document_id: str) -> Document | None:
+    """
+    Get a document by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        document_id (str): Document ID.
+
+    Returns:
+        Document: Document with the given ID.
+    """
+    return await db.scalar(select(Document).where(Document.id == document_id).limit(1))
+
+
+async def get_documents(
+    db: AsyncSession, offset: int = 0, limit: int = 100
+) -> list[Document]:
+    """
+    List all documents.
+
+    Args:
+        db (AsyncSession): Database session.
+        offset (int): Offset to start the list.
+        limit (int): Limit of documents to be listed.
+
+    Returns:
+        list[Document]: List of documents.
+    """
+    documents = await db.scalars(select(Document).offset(offset).limit(limit))
+    return list(documents)
+
+
+async def delete_document(db: AsyncSession, document_id: str) -> None:
+    """
+    Delete a document by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        document_id (str): Document ID.
+    """
+    await db.execute(delete(Document).where(Document.id == document_id))
+    await db.commit()
+
+
+async def insert_documents(db: AsyncSession, documents: list[Document]) -> None:
+    """
+    Insert documents in bulk without committing.
+
+    Args:
+        db (AsyncSession): Database session.
+        documents (list[Document]): Documents to be inserted, IDs are generated if missing.
+    """
+    if not documents:
+        return
+
+    await db.execute(
+        insert(Document), [get_insert_row(document) for document in documents]
+    )
@@ -0,0 +1,194 @@
+import datetime
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.file import File
+from backend.schemas.file import UpdateFile
+
+"""
+Async versions of backend/crud/file.py.
+"""
+
+
+async def create_file(db: AsyncSession, file: File) -> File:
+    """
+    Create a new file.
+
+    Args:
+        db (AsyncSession): Database session.
+        file (File): File data to be created.
+
+    Returns:
+        File: Created file.
+    """
+    db.add(file)
+    await db.commit()
+    await db.refresh(file)
+    return file
+
+
+async def get_file(db: AsyncSession, file_id: str, user_id: str) -> File | None:
+    """
+    Get a file by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_id (str): File ID.
+        user_id (str): User ID.
+
+    Returns:
+        File: File with the given ID.
+    """
+    return await db.scalar(
+        select(File).where(File.id == file_id, File.user_id == user_id).limit(1)
+    )
+
+
+async def get_files(
+    db: AsyncSession, user_id: str, offset: int = 0, limit: int = 100
+) -> list[File]:
+    """
+    List all files.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+        offset (int): Offset to start the list.
+        limit (int): Limit of files to be listed.
+
+    Returns:
+        list[File]: List of files.
+    """
+    files = await db.scalars(
+        select(File).where(File.user_id == user_id).offset(offset).limit(limit)
+    )
+    return list(files)
+
+
+async def get_files_by_conversation_id(
+    db: AsyncSession, conversation_id: str, user_id: str
+) -> list[File]:
+    """
+    List all files from a conversation.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+
+    Returns:
+        list[File]: List of files from the conversation.
+    """
+    files = await db.scalars(
+        select(File).where(
+            File.conversation_id == conversation_id, File.user_id == user_id
+        )
+    )
+    return list(files)
+
+
+async def get_files_by_conversation_id_after(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    after: tuple[datetime.datetime, str] | None = None,
+    limit: int = 100,
+) -> list[File]:
+    """
+    List files from a conversation in upload order, starting after a sort key.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        after (tuple[datetime.datetime, str] | None): (created_at, id) of the last file of the previous page.
+        limit (int): Limit of files to be listed.
+
+    Returns:
+        list[File]: Files ordered by created_at and ID.
+    """
+    query = select(File).where(
+        File.conversation_id == conversation_id, File.user_id == user_id
+    )
+    if after is not None:
+        query = query.where(tuple_(File.created_at, File.id) > after)
+
+    files = await db.scalars(query.order_by(File.created_at, File.id).limit(limit))
+    return list(files)
+
+
+async def get_files_by_ids(
+    db: AsyncSession, file_ids: list[str], user_id: str
+) -> list[File]:
+    """
+    Get files by IDs.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_ids (list[str]): File IDs.
+        user_id (str): User ID.
+
+    Returns:
+        list[File]: List of files with the given IDs.
+    """
+    files = await db.scalars(
+        select(File).where(File.id.in_(file_ids), File.user_id == user_id)
+    )
+    return list(files)
+
+
+async def update_file(db: AsyncSession, file: File, new_file: UpdateFile) -> File:
+    """
+    Update a file by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        file (File): File to be updated.
+        new_file (File): New file data.
+
+    Returns:
+        File: Updated file.
+    """
+    for attr, value in new_file.model_dump(exclude_none=True).items():
+        setattr(file, attr, value)
+
+    await db.commit()
+    await db.refresh(file)
+    return file
+
+
+async def delete_file(db: AsyncSession, file_id: str, user_id: str) -> None:
+    """
+    Delete a file by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_id (str): File ID.
+        user_id (str): User ID.
+    """
+    await db.execute(delete(File).where(File.id == file_id, File.user_id == user_id))
+    await db.commit()
+
+
+async def attach_files_to_message(
+    db: AsyncSession, file_ids: list[str], user_id: str, message_id: str
+) -> None:
+    """
+    Attach files that are not attached to a message yet, without committing.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_ids (list[str]): File IDs.
+        user_id (str): User ID.
+        message_id (str): Message ID to attach the files to.
+    """
+    await db.execute(
+        update(File)
+        .where(
+            File.id.in_(file_ids),
+            File.user_id == user_id,
+            File.message_id.is_(None),
+        )
+        .values(message_id=message_id)
+    )
@@ -0,0 +1,248 @@
+import datetime
+from typing import Sequence
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
+
+from backend.crud.message import MESSAGE_DETAIL_OPTIONS
+from backend.crud.utils import get_insert_row
+from backend.models.message import Message
+from backend.schemas.message import UpdateMessage
+
+"""
+Async versions of backend/crud/message.py.
+
+Relationships can't be lazy loaded through an AsyncSession, pass loader
+options such as MESSAGE_DETAIL_OPTIONS for the ones that are read.
+"""
+
+
+async def create_message(db: AsyncSession, message: Message) -> Message:
+    """
+    Create a new message.
+
+    Args:
+        db (AsyncSession): Database session.
+        message (Message): Message data to be created.
+
+    Returns:
+        Message: Created message.
+    """
+    db.add(message)
+    await db.commit()
+    await db.refresh(message)
+    return message
+
+
+async def get_message(
+    db: AsyncSession,
+    message_id: str,
+    user_id: str,
+    options: Sequence[ExecutableOption] = (),
+) -> Message | None:
+    """
+    Get a message by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_id (str): Message ID.
+        user_id (str): User ID.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        Message: Message with the given ID.
+    """
+    return await db.scalar(
+        select(Message)
+        .where(Message.id == message_id, Message.user_id == user_id)
+        .options(*options)
+        .limit(1)
+    )
+
+
+async def get_messages(
+    db: AsyncSession,
+    user_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Message]:
+    """
+    List all messages.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+        offset (int): Offset to start the list.
+        limit (int): Limit of messages to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Message]: List of messages.
+    """
+    messages = await db.scalars(
+        select(Message)
+        .where(Message.user_id == user_id)
+        .options(*options)
+        .offset(offset)
+        .limit(limit)
+    )
+    return list(messages)
+
+
+async def get_messages_by_conversation_id(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Message]:
+    """
+    List all messages from a conversation, in conversation order.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Message]: List of messages from the conversation.
+    """
+    messages = await db.scalars(
+        select(Message)
+        .where(Message.conversation_id == conversation_id, Message.user_id == user_id)
+        .order_by(Message.position, Message.created_at, Message.id)
+        .options(*options)
+    )
+    return list(messages)
+
+
+async def get_messages_by_conversation_id_after(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    after: tuple[int, datetime.datetime, str] | None = None,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Message]:
+    """
+    List messages from a conversation in order, starting after a sort key.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        after (tuple[int, datetime.datetime, str] | None): (position, created_at, id) of the last message of the previous page.
+        limit (int): Limit of messages to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Message]: Messages ordered by position, created_at and ID.
+    """
+    query = select(Message).where(
+        Message.conversation_id == conversation_id, Message.user_id == user_id
+    )
+    if after is not None:
+        query = query.where(
+            tuple_(Message.position, Message.created_at, Message.id) > after
+        )
+
+    messages = await db.scalars(
+        query.order_by(Message.position, Message.created_at, Message.id)
+        .options(*options)
+        .limit(limit)
+    )
+    return list(messages)
+
+
+async def get_max_active_position(db: AsyncSession, conversation_id: str) -> int | None:
+    """
+    Get the highest position of the active messages in a conversation.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+
+    Returns:
+        int | None: Highest position, or None if the conversation has no active messages.
+    """
+    return await db.scalar(
+        select(func.max(Message.position)).where(
+            Message.conversation_id == conversation_id,
+            Message.is_active.is_(True),
+        )
+    )
+
+
+async def get_active_messages_before_position(
+    db: AsyncSession, conversation_id: str, position: int
+) -> list[Message]:
+    """
+    List the active messages of a conversation before a position, in order.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        position (int): Messages at this position or after are excluded.
+
+    Returns:
+        list[Message]: Messages ordered by position.
+    """
+    messages = await db.scalars(
+        select(Message)
+        .where(
+            Message.conversation_id == conversation_id,
+            Message.is_active.is_(True),
+            Message.position < position,
+        )
+        .order_by(Message.position, Message.created_at)
+    )
+    return list(messages)
+
+
+async def update_message(
+    db: AsyncSession, message: Message, new_message: UpdateMessage
+) -> Message:
+    """
+    Update a message by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        message (Message): Message to be updated.
+        new_message (Message): New message data.
+
+    Returns:
+        Message: Updated message.
+    """
+    for attr, value in new_message.model_dump().items():
+        setattr(message, attr, value)
+    await db.commit()
+    await db.refresh(message)
+    return message
+
+
+async def delete_message(db: AsyncSession, message_id: str, user_id: str) -> None:
+    """
+    Delete a message by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_id (str): Message ID.
+        user_id (str): User ID.
+    """
+    await db.execute(
+        delete(Message).where(Message.id == message_id, Message.user_id == user_id)
+    )
+    await db.commit()
+
+
+async def insert_message(db: AsyncSession, message: Message) -> None:
+    """
+    Insert a message without committing, its documents and citations are not inserted.
+
+    Args:
+        db (AsyncSession): Database session.
+        message (Message): Message to be inserted, an ID is generated if missing.
+    """
+    await db.execute(insert(Message), [get_insert_row(message)])
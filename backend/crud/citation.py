@@ -1,6 +1,8 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from backend.models.citation import Citation
+from backend.crud.utils import get_insert_row
+from backend.models.citation import Citation, citation_documents
 
 
 def create_citation(db: Session, citation: Citation) -> Citation:
@@ -74,3 +76,27 @@ def delete_citation(db: Session, citation_id: str) -> None:
     citation = db.query(Citation).filter(Citation.id == citation_id)
     citation.delete()
     db.commit()
+
+
+def insert_citations(db: Session, citations: list[Citation]) -> None:
+    """
+    Insert citations and their document associations in bulk without committing.
+
+    The cited documents must already be inserted.
+
+    Args:
+        db (Session): Database session.
+        citations (list[Citation]): Citations to be inserted, IDs are generated if missing.
+    """
+    if not citations:
+        return
+
+    db.execute(insert(Citation), [get_insert_row(citation) for citation in citations])
+
+    associations = [
+        {"left_id": document.id, "right_id": citation.id}
+        for citation in citations
+        for document in citation.documents
+    ]
+    if associations:
+        db.execute(insert(citation_documents), associations)
@@ -1,8 +1,23 @@
-from sqlalchemy.orm import Session
+import datetime
+from typing import Sequence
 
+from sqlalchemy import insert, tuple_, update
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from backend.crud.message import MESSAGE_DETAIL_OPTIONS
+from backend.crud.utils import get_insert_row
 from backend.models.conversation import Conversation
 from backend.schemas.conversation import UpdateConversation
 
+# Loads everything the Conversation schema serializes, in one query per relationship
+CONVERSATION_DETAIL_OPTIONS = (
+    selectinload(Conversation.text_messages).options(*MESSAGE_DETAIL_OPTIONS),
+    selectinload(Conversation.files),
+)
+# Loads what the ConversationWithoutMessages schema of conversation lists serializes
+CONVERSATION_LIST_OPTIONS = (selectinload(Conversation.files),)
+
 
 def create_conversation(db: Session, conversation: Conversation) -> Conversation:
     """
@@ -22,15 +37,22 @@ def create_conversation(db: Session, conversation: Conversation) -> Conversation
 
 
 def get_conversation(
-    db: Session, conversation_id: str, user_id: str
+    db: Session,
+    conversation_id: str,
+    user_id: str,
+    options: Sequence[ExecutableOption] = (),
 ) -> Conversation | None:
     """
     Get a conversation by ID.
 
+    Relationships are lazy loaded unless loader options are given, e.g.
+    CONVERSATION_DETAIL_OPTIONS when the whole conversation is serialized.
+
     Args:
         db (Session): Database session.
         conversation_id (str): Conversation ID.
         user_id (str): User ID.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
 
     Returns:
         Conversation: Conversation with the given conversation ID and user ID.
@@ -38,12 +60,17 @@ def get_conversation(
     return (
         db.query(Conversation)
         .filter(Conversation.id == conversation_id, Conversation.user_id == user_id)
+        .options(*options)
         .first()
     )
 
 
 def get_conversations(
-    db: Session, user_id: str, offset: int = 0, limit: int = 100
+    db: Session,
+    user_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
 ) -> list[Conversation]:
     """
     List all conversations.
@@ -53,6 +80,7 @@ def get_conversations(
         user_id (str): User ID.
         offset (int): Offset to start the list.
         limit (int): Limit of conversations to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
 
     Returns:
         list[Conversation]: List of conversations.
@@ -60,12 +88,48 @@ def get_conversations(
     return (
         db.query(Conversation)
         .filter(Conversation.user_id == user_id)
+        .options(*options)
         .offset(offset)
         .limit(limit)
         .all()
     )
 
 
+def get_conversations_after(
+    db: Session,
+    user_id: str,
+    after: tuple[datetime.datetime, str] | None = None,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Conversation]:
+    """
+    List conversations, most recently updated first, starting after a sort key.
+
+    A conversation updated while paging moves to the front of the list, so
+    later pages don't include it.
+
+    Args:
+        db (Session): Database session.
+        user_id (str): User ID.
+        after (tuple[datetime.datetime, str] | None): (updated_at, id) of the last conversation of the previous page.
+        limit (int): Limit of conversations to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Conversation]: Conversations ordered by updated_at and ID, descending.
+    """
+    query = db.query(Conversation).filter(Conversation.user_id == user_id)
+    if after is not None:
+        query = query.filter(tuple_(Conversation.updated_at, Conversation.id) < after)
+
+    return (
+        query.order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+        .options(*options)
+        .limit(limit)
+        .all()
+    )
+
+
 def update_conversation(
     db: Session, conversation: Conversation, new_conversation: UpdateConversation
 ) -> Conversation:
@@ -103,3 +167,33 @@ def delete_conversation(db: Session, conversation_id: str, user_id: str) -> None
     )
     conversation.delete()
     db.commit()
+
+
+def insert_conversation(db: Session, conversation: Conversation) -> None:
+    """
+    Insert a conversation without committing.
+
+    Args:
+        db (Session): Database session.
+        conversation (Conversation): Conversation to be inserted, an ID is generated if missing.
+    """
+    db.execute(insert(Conversation), [get_insert_row(conversation)])
+
+
+def update_conversation_description(
+    db: Session, conversation_id: str, user_id: str, description: str
+) -> None:
+    """
+    Update the description of a conversation without loading or committing it.
+
+    Args:
+        db (Session): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        description (str): New description.
+    """
+    db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+        .values(description=description)
+    )
@@ -1,5 +1,7 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from backend.crud.utils import get_insert_row
 from backend.models.document import Document
 
 
@@ -60,3 +62,17 @@ def delete_document(db: Session, document_id: str) -> None:
     document = db.query(Document).filter(Document.id == document_id)
     document.delete()
     db.commit()
+
+
+def insert_documents(db: Session, documents: list[Document]) -> None:
+    """
+    Insert documents in bulk without committing.
+
+    Args:
+        db (Session): Database session.
+        documents (list[Document]): Documents to be inserted, IDs are generated if missing.
+    """
+    if not documents:
+        return
+
+    db.execute(insert(Document), [get_insert_row(document) for document in documents])
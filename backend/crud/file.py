@@ -1,3 +1,6 @@
+import datetime
+
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Session
 
 from backend.models.file import File
@@ -75,6 +78,35 @@ def get_files_by_conversation_id(
     )
 
 
+def get_files_by_conversation_id_after(
+    db: Session,
+    conversation_id: str,
+    user_id: str,
+    after: tuple[datetime.datetime, str] | None = None,
+    limit: int = 100,
+) -> list[File]:
+    """
+    List files from a conversation in upload order, starting after a sort key.
+
+    Args:
+        db (Session): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        after (tuple[datetime.datetime, str] | None): (created_at, id) of the last file of the previous page.
+        limit (int): Limit of files to be listed.
+
+    Returns:
+        list[File]: Files ordered by created_at and ID.
+    """
+    query = db.query(File).filter(
+        File.conversation_id == conversation_id, File.user_id == user_id
+    )
+    if after is not None:
+        query = query.filter(tuple_(File.created_at, File.id) > after)
+
+    return query.order_by(File.created_at, File.id).limit(limit).all()
+
+
 def get_files_by_ids(db: Session, file_ids: list[str], user_id: str) -> list[File]:
     """
     Get files by IDs.
@@ -122,3 +154,26 @@ def delete_file(db: Session, file_id: str, user_id: str) -> None:
     file = db.query(File).filter(File.id == file_id, File.user_id == user_id)
     file.delete()
     db.commit()
+
+
+def attach_files_to_message(
+    db: Session, file_ids: list[str], user_id: str, message_id: str
+) -> None:
+    """
+    Attach files that are not attached to a message yet, without committing.
+
+    Args:
+        db (Session): Database session.
+        file_ids (list[str]): File IDs.
+        user_id (str): User ID.
+        message_id (str): Message ID to attach the files to.
+    """
+    db.execute(
+        update(File)
+        .where(
+            File.id.in_(file_ids),
+            File.user_id == user_id,
+            File.message_id.is_(None),
+        )
+        .values(message_id=message_id)
+    )
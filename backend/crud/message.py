@@ -1,8 +1,21 @@
-from sqlalchemy.orm import Session
+import datetime
+from typing import Sequence
 
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from backend.crud.utils import get_insert_row
 from backend.models.message import Message
 from backend.schemas.message import UpdateMessage
 
+# Loads everything the Message schema serializes, in one query per relationship
+MESSAGE_DETAIL_OPTIONS = (
+    selectinload(Message.documents),
+    selectinload(Message.citations),
+    selectinload(Message.files),
+)
+
 
 def create_message(db: Session, message: Message) -> Message:
     """
@@ -68,7 +81,7 @@ def get_messages_by_conversation_id(
     db: Session, conversation_id: str, user_id: str
 ) -> list[Message]:
     """
-    List all messages from a conversation.
+    List all messages from a conversation, in conversation order.
 
     Args:
         db (Session): Database session.
@@ -81,6 +94,90 @@ def get_messages_by_conversation_id(
     return (
         db.query(Message)
         .filter(Message.conversation_id == conversation_id, Message.user_id == user_id)
+        .order_by(Message.position, Message.created_at, Message.id)
+        .all()
+    )
+
+
+def get_messages_by_conversation_id_after(
+    db: Session,
+    conversation_id: str,
+    user_id: str,
+    after: tuple[int, datetime.datetime, str] | None = None,
+    limit: int = 100,
+    options: Sequence[ExecutableOption] = (),
+) -> list[Message]:
+    """
+    List messages from a conversation in order, starting after a sort key.
+
+    Args:
+        db (Session): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        after (tuple[int, datetime.datetime, str] | None): (position, created_at, id) of the last message of the previous page.
+        limit (int): Limit of messages to be listed.
+        options (Sequence[ExecutableOption]): Loader options for relationships.
+
+    Returns:
+        list[Message]: Messages ordered by position, created_at and ID.
+    """
+    query = db.query(Message).filter(
+        Message.conversation_id == conversation_id, Message.user_id == user_id
+    )
+    if after is not None:
+        query = query.filter(
+            tuple_(Message.position, Message.created_at, Message.id) > after
+        )
+
+    return (
+        query.order_by(Message.position, Message.created_at, Message.id)
+        .options(*options)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_max_active_position(db: Session, conversation_id: str) -> int | None:
+    """
+    Get the highest position of the active messages in a conversation.
+
+    Args:
+        db (Session): Database session.
+        conversation_id (str): Conversation ID.
+
+    Returns:
+        int | None: Highest position, or None if the conversation has no active messages.
+    """
+    return db.scalar(
+        select(func.max(Message.position)).where(
+            Message.conversation_id == conversation_id,
+            Message.is_active.is_(True),
+        )
+    )
+
+
+def get_active_messages_before_position(
+    db: Session, conversation_id: str, position: int
+) -> list[Message]:
+    """
+    List the active messages of a conversation before a position, in order.
+
+    Args:
+        db (Session): Database session.
+        conversation_id (str): Conversation ID.
+        position (int): Messages at this position or after are excluded.
+
+    Returns:
+        list[Message]: Messages ordered by position.
+    """
+    return (
+        db.query(Message)
+        .filter(
+            Message.conversation_id == conversation_id,
+            Message.is_active.is_(True),
+            Message.position < position,
+        )
+        .order_by(Message.position, Message.created_at)
         .all()
     )
 
@@ -120,3 +217,14 @@ def delete_message(db: Session, message_id: str, user_id: str) -> None:
     )
     message.delete()
     db.commit()
+
+
+def insert_message(db: Session, message: Message) -> None:
+    """
+    Insert a message without committing, its documents and citations are not inserted.
+
+    Args:
+        db (Session): Database session.
+        message (Message): Message to be inserted, an ID is generated if missing.
+    """
+    db.execute(insert(Message), [get_insert_row(message)])
@@ -0,0 +1,31 @@
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import inspect
+
+from backend.models.base import Base
+
+
+def get_insert_row(model: Base) -> dict[str, Any]:
+    """
+    Get the column values of a model for a bulk insert.
+
+    Only values set on the model are included, so column defaults still apply.
+    An ID is generated if the model has none, so related rows can reference it
+    before the insert is flushed.
+
+    Args:
+        model (Base): Model to insert.
+
+    Returns:
+        dict[str, Any]: Column values keyed by attribute name.
+    """
+    if model.id is None:
+        model.id = str(uuid4())
+
+    state = inspect(model)
+    return {
+        attr.key: state.dict[attr.key]
+        for attr in state.mapper.column_attrs
+        if attr.key in state.dict
+    }
@@ -3,20 +3,31 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
+from backend.models.database import get_session_factory
 from backend.routers.chat import router as chat_router
 from backend.routers.conversation import router as conversation_router
 from backend.routers.deployment import router as deployment_router
+from backend.routers.metrics import router as metrics_router
 from backend.routers.tool import router as tool_router
 from backend.routers.user import router as user_router
-
+from backend.services.pagination import NEXT_CURSOR_HEADER
+from backend.services.persistence import start_persistence_queue, stop_persistence_queue
 
 load_dotenv()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Resolved like the routes' dependency, so overrides apply to queued writes too
+    get_app_session_factory = app.dependency_overrides.get(
+        get_session_factory, get_session_factory
+    )
+    start_persistence_queue(get_app_session_factory())
     yield
+    # Write queued chat turns before the process exits
+    await run_in_threadpool(stop_persistence_queue)
 
 
 origins = ["*"]
@@ -29,6 +40,7 @@ def create_app():
     app.include_router(conversation_router)
     app.include_router(tool_router)
     app.include_router(deployment_router)
+    app.include_router(metrics_router)
 
     app.add_middleware(
         CORSMiddleware,
@@ -36,6 +48,7 @@ def create_app():
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     return app
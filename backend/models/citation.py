@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import Column, ForeignKey, String, Table
+from sqlalchemy import Column, ForeignKey, Index, String, Table
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,6 +12,8 @@ citation_documents = Table(
     Base.metadata,
     Column("left_id", ForeignKey("documents.id", ondelete="CASCADE")),
     Column("right_id", ForeignKey("citations.id", ondelete="CASCADE")),
+    Index("ix_citation_documents_left_id", "left_id"),
+    Index("ix_citation_documents_right_id", "right_id"),
 )
 
 
@@ -29,3 +31,5 @@ class Citation(Base):
     documents: Mapped[List[Document]] = relationship(secondary=citation_documents)
 
     document_ids: Mapped[List[str]] = mapped_column(ARRAY(String))
+
+    __table_args__ = (Index("ix_citations_message_id", "message_id"),)
@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from sqlalchemy.pool.base import ConnectionPoolEntry, PoolProxiedConnection
+
+from backend.services.metrics import metrics
+
+
+class InstrumentedPoolMixin:
+    """
+    Times how long a checkout waits, including opening a new connection, and
+    counts checkout timeouts.
+
+    Pool events don't cover a checkout that waits or fails, the other pool
+    metrics are recorded by listen_pool_events.
+    """
+
+    metrics_prefix = "db.pool"
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except TimeoutError:
+            metrics.increment(f"{self.metrics_prefix}.timeouts")
+            raise
+        finally:
+            metrics.observe(
+                f"{self.metrics_prefix}.checkout_wait_seconds",
+                time.perf_counter() - start,
+            )
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    metrics_prefix = "db.pool"
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_prefix = "db.async_pool"
+
+
+def listen_pool_events(pool: Pool, metrics_prefix: str | None = None) -> None:
+    """
+    Record the pool events of an engine in the metrics registry.
+
+    Counts checkouts and new connections, and keeps gauges of the connections
+    checked out and of the overflow connections in use.
+
+    Args:
+        pool (Pool): Pool of the engine, e.g. engine.pool.
+        metrics_prefix (str | None): Prefix of the metric names, the pool's metrics_prefix if None.
+    """
+    metrics_prefix = metrics_prefix or getattr(pool, "metrics_prefix", "db.pool")
+    # The checkin event runs before the connection is back in the pool, so
+    # pool.checkedout() is still counting it, count checkouts from the events instead
+    lock = threading.Lock()
+    checked_out = 0
+
+    def set_usage_gauges(change: int) -> None:
+        nonlocal checked_out
+        with lock:
+            checked_out = max(checked_out + change, 0)
+            metrics.set_gauge(f"{metrics_prefix}.checked_out", checked_out)
+            metrics.set_gauge(
+                f"{metrics_prefix}.overflow", max(checked_out - pool.size(), 0)
+            )
+
+    def on_connect(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        metrics.increment(f"{metrics_prefix}.connections_opened")
+
+    def on_checkout(
+        dbapi_connection: Any,
+        record: ConnectionPoolEntry,
+        proxy: PoolProxiedConnection,
+    ) -> None:
+        metrics.increment(f"{metrics_prefix}.checkouts")
+        set_usage_gauges(1)
+
+    def on_checkin(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        set_usage_gauges(-1)
+
+    def on_detach(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        # A detached connection leaves the pool without being checked in
+        set_usage_gauges(-1)
+
+    event.listen(pool, "connect", on_connect)
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+    event.listen(pool, "detach", on_detach)
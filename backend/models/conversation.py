@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.models.base import Base
@@ -15,9 +15,16 @@ class Conversation(Base):
     title: Mapped[str] = mapped_column(String, default="New Conversation")
     description: Mapped[str] = mapped_column(String, nullable=True, default=None)
 
-    text_messages: Mapped[List["Message"]] = relationship()
+    text_messages: Mapped[List["Message"]] = relationship(
+        order_by=[Message.position, Message.created_at]
+    )
     files: Mapped[List["File"]] = relationship()
 
+    __table_args__ = (
+        # Conversation list, most recently updated first
+        Index("ix_conversations_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
+
     @property
     def messages(self):
-        return sorted(self.text_messages, key=lambda x: x.position)
+        return self.text_messages
@@ -1,23 +1,269 @@
 import os
-from typing import Annotated, Any, Generator
+from contextlib import asynccontextmanager
+from distutils.util import strtobool
+from typing import (
+    Annotated,
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    Callable,
+    ContextManager,
+    Generator,
+    Iterable,
+)
+from uuid import uuid4
 
 from dotenv import load_dotenv
 from fastapi import Depends
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import Result, ScalarResult
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from backend.models.connection_pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    listen_pool_events,
+)
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.environ["DATABASE_URL"]
+# Use an asyncpg engine for the async routes, requires the async-db extra (asyncpg)
+USE_ASYNC_DATABASE = bool(strtobool(os.getenv("USE_ASYNC_DATABASE", "false")))
+# Connections kept open by each engine's pool
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+# Connections opened on top of the pool size under load, closed when returned
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+# Seconds to wait for a connection before raising a TimeoutError
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+# Seconds after which a connection is replaced on checkout, -1 never replaces it
+DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "-1"))
+# Test connections on checkout, so ones dropped by the server are replaced
+DATABASE_POOL_PRE_PING = bool(strtobool(os.getenv("DATABASE_POOL_PRE_PING", "false")))
+# "default", or "pgbouncer" when connecting through PgBouncer in transaction pooling mode
+DATABASE_POOL_PROFILE = os.getenv("DATABASE_POOL_PROFILE", "default")
+
+POOL_PROFILES = ("default", "pgbouncer")
+
+
+def get_engine_options(
+    profile: str = DATABASE_POOL_PROFILE, is_async: bool = False
+) -> dict[str, Any]:
+    """
+    Get the engine keyword arguments for the pool settings.
+
+    With the pgbouncer profile, asyncpg doesn't cache prepared statements and
+    names them uniquely, since consecutive transactions can run on different
+    server connections. psycopg2 never prepares statements on the server.
+
+    Args:
+        profile (str): Pool profile, one of POOL_PROFILES.
+        is_async (bool): Whether the options are for the asyncpg engine.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for create_engine or create_async_engine.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    if profile not in POOL_PROFILES:
+        raise ValueError(
+            f"Unknown database pool profile {profile}, expected one of {POOL_PROFILES}"
+        )
+
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DATABASE_POOL_SIZE,
+        "max_overflow": DATABASE_MAX_OVERFLOW,
+        "pool_timeout": DATABASE_POOL_TIMEOUT,
+        "pool_recycle": DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": DATABASE_POOL_PRE_PING,
+    }
+
+    if profile == "pgbouncer" and is_async:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return options
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options())
+listen_pool_events(engine.pool)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, pool_size=5, max_overflow=10, pool_timeout=30
+
+session_factory = sessionmaker(engine)
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Get the asyncpg version of a PostgreSQL database URL.
+
+    Args:
+        url (str): Database URL, with any PostgreSQL driver.
+
+    Returns:
+        str: Database URL using the asyncpg driver.
+    """
+    return (
+        make_url(url)
+        .set(drivername="postgresql+asyncpg")
+        .render_as_string(hide_password=False)
+    )
+
+
+async_engine = (
+    create_async_engine(
+        get_async_database_url(SQLALCHEMY_DATABASE_URL),
+        **get_engine_options(is_async=True),
+    )
+    if USE_ASYNC_DATABASE
+    else None
 )
+if async_engine is not None:
+    # Pool events are dispatched by the sync engine wrapped by the async one
+    listen_pool_events(async_engine.sync_engine.pool)
+
+# Loaded objects stay usable after a commit, an async session can't lazy load them again
+async_session_factory = (
+    async_sessionmaker(async_engine, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+
+class ThreadpoolSession:
+    """
+    Awaitable subset of the AsyncSession interface over a sync session.
+
+    Each call runs in the threadpool, so async routes and backend/crud/aio
+    don't block the event loop when the async engine is disabled.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Iterable[Any]) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement: Any, params: Any = None, **kwargs) -> Result:
+        return await run_in_threadpool(
+            self.sync_session.execute, statement, params, **kwargs
+        )
+
+    async def scalar(self, statement: Any, params: Any = None, **kwargs) -> Any:
+        return await run_in_threadpool(
+            self.sync_session.scalar, statement, params, **kwargs
+        )
+
+    async def scalars(
+        self, statement: Any, params: Any = None, **kwargs
+    ) -> ScalarResult:
+        return await run_in_threadpool(
+            self.sync_session.scalars, statement, params, **kwargs
+        )
+
+    async def get(self, entity: Any, ident: Any, **kwargs) -> Any:
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def refresh(self, instance: Any, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
 
 
 def get_session() -> Generator[Session, Any, None]:
-    with Session(engine) as session:
+    with session_factory() as session:
         yield session
 
 
+def get_session_factory() -> Callable[[], ContextManager[Session]]:
+    """
+    Get a factory of short-lived sessions.
+
+    Use it instead of a request-scoped session when the request outlives its
+    database work, e.g. streamed responses, so a pooled connection is only
+    checked out inside each `with session_factory() as session:` block.
+
+    Returns:
+        Callable[[], ContextManager[Session]]: Session factory.
+    """
+    return session_factory
+
+
+@asynccontextmanager
+async def open_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open a short-lived session with an awaitable interface.
+
+    With USE_ASYNC_DATABASE this is an AsyncSession on the asyncpg engine,
+    otherwise a ThreadpoolSession over a sync session.
+
+    Yields:
+        AsyncSession: Database session with an awaitable interface.
+    """
+    if async_session_factory is None:
+        session = ThreadpoolSession(session_factory())
+        try:
+            yield session
+        finally:
+            await session.close()
+        return
+
+    async with async_session_factory() as session:
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a session for async routes.
+
+    Yields:
+        AsyncSession: Database session with an awaitable interface, see open_async_session.
+    """
+    async with open_async_session() as session:
+        yield session
+
+
+def get_async_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """
+    Get a factory of short-lived sessions for async routes.
+
+    The async counterpart of get_session_factory, for streamed responses that
+    write once the request's session is closed.
+
+    Returns:
+        Callable[[], AsyncContextManager[AsyncSession]]: Session factory.
+    """
+    return open_async_session
+
+
 DBSessionDep = Annotated[Session, Depends(get_session)]
+DBSessionFactoryDep = Annotated[
+    Callable[[], ContextManager[Session]], Depends(get_session_factory)
+]
+AsyncDBSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+AsyncDBSessionFactoryDep = Annotated[
+    Callable[[], AsyncContextManager[AsyncSession]],
+    Depends(get_async_session_factory),
+]
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.models.base import Base
@@ -20,3 +20,8 @@ class Document(Base):
     )
     # User facing ID returned from model, not storage UUID ex: doc_0
     document_id: Mapped[str]
+
+    __table_args__ = (
+        Index("ix_documents_message_id", "message_id"),
+        Index("ix_documents_conversation_id", "conversation_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.models.base import Base
@@ -18,3 +18,16 @@ class File(Base):
     file_name: Mapped[str]
     file_path: Mapped[str]
     file_size: Mapped[int] = mapped_column(default=0)
+
+    __table_args__ = (
+        Index("ix_files_user_id", "user_id"),
+        # Files of a conversation, in upload order
+        Index(
+            "ix_files_conversation_id_user_id_created_at_id",
+            "conversation_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+        Index("ix_files_message_id", "message_id"),
+    )
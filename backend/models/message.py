@@ -1,7 +1,7 @@
 from enum import StrEnum
 from typing import List
 
-from sqlalchemy import Boolean, Enum, ForeignKey, String
+from sqlalchemy import Boolean, Enum, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.models.base import Base
@@ -55,3 +55,22 @@ class Message(MessageBase):
     agent: Mapped[MessageAgent] = mapped_column(
         Enum(MessageAgent, native_enum=False),
     )
+
+    __table_args__ = (
+        # Next message position and chat history lookups
+        Index(
+            "ix_messages_conversation_id_is_active_position",
+            "conversation_id",
+            "is_active",
+            "position",
+        ),
+        Index("ix_messages_user_id", "user_id"),
+        # Paginated messages of a conversation
+        Index(
+            "ix_messages_conversation_id_position_created_at_id",
+            "conversation_id",
+            "position",
+            "created_at",
+            "id",
+        ),
+    )
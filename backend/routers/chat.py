@@ -1,7 +1,17 @@
 import json
 import os
 from distutils.util import strtobool
-from typing import Any, Generator, List, Union
+from functools import partial
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    Callable,
+    ContextManager,
+    Generator,
+    List,
+    Union,
+)
 from uuid import uuid4
 
 from cohere.types import StreamedChatResponse
@@ -9,19 +19,38 @@ from fastapi import APIRouter, Depends, Request
 from fastapi.encoders import jsonable_encoder
 from langchain_core.agents import AgentActionMessageLog
 from langchain_core.runnables.utils import AddableDict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from sse_starlette.sse import EventSourceResponse
 
+from backend.chat.coalesce import get_coalesced_stream
 from backend.chat.custom.custom import CustomChat
 from backend.chat.custom.langchain import LangChainChat
 from backend.chat.enums import StreamEvent
+from backend.chat.sse_encoder import (
+    encode_chat_response_event,
+    encode_citation_generation,
+    encode_text_generation,
+)
 from backend.config.tools import AVAILABLE_TOOLS
+from backend.crud import citation as citation_crud
 from backend.crud import conversation as conversation_crud
+from backend.crud import document as document_crud
 from backend.crud import file as file_crud
 from backend.crud import message as message_crud
-from backend.models import get_session
+from backend.crud.aio import citation as async_citation_crud
+from backend.crud.aio import conversation as async_conversation_crud
+from backend.crud.aio import document as async_document_crud
+from backend.crud.aio import file as async_file_crud
+from backend.crud.aio import message as async_message_crud
 from backend.models.citation import Citation
 from backend.models.conversation import Conversation
-from backend.models.database import DBSessionDep
+from backend.models.database import (
+    AsyncDBSessionDep,
+    AsyncDBSessionFactoryDep,
+    DBSessionDep,
+    DBSessionFactoryDep,
+)
 from backend.models.document import Document
 from backend.models.message import Message, MessageAgent, MessageType
 from backend.schemas.chat import (
@@ -41,11 +70,10 @@ from backend.schemas.chat import (
     ToolInputType,
 )
 from backend.schemas.cohere_chat import CohereChatRequest
-from backend.schemas.conversation import UpdateConversation
-from backend.schemas.file import UpdateFile
 from backend.schemas.langchain_chat import LangchainChatRequest
 from backend.schemas.search_query import SearchQuery
 from backend.schemas.tool import ToolCall
+from backend.services.persistence import persistence_queue
 from backend.services.request_validators import (
     validate_chat_request,
     validate_deployment_header,
@@ -54,7 +82,6 @@ from backend.services.request_validators import (
 
 router = APIRouter(
     dependencies=[
-        Depends(get_session),
         Depends(validate_chat_request),
         Depends(validate_user_header),
     ]
@@ -63,7 +90,8 @@ router = APIRouter(
 
 @router.post("/chat-stream", dependencies=[Depends(validate_deployment_header)])
 async def chat_stream(
-    session: DBSessionDep,
+    session: AsyncDBSessionDep,
+    session_factory: AsyncDBSessionFactoryDep,
     chat_request: CohereChatRequest,
     request: Request,
 ) -> Generator[ChatResponseEvent, Any, None]:
@@ -71,15 +99,17 @@ async def chat_stream(
     Stream chat endpoint to handle user messages and return chatbot responses.
 
     Args:
-        session (DBSessionDep): Database session.
+        session (AsyncDBSessionDep): Database session, closed before streaming.
+        session_factory (AsyncDBSessionFactoryDep): Factory of short-lived database sessions.
         chat_request (CohereChatRequest): Chat request data.
         request (Request): Request object.
 
     Returns:
         EventSourceResponse: Server-sent event response with chatbot responses.
     """
+    # The connection is released before streaming, the response is stored in a new session
     (
-        session,
+        _,
         chat_request,
         file_paths,
         response_message,
@@ -88,17 +118,24 @@ async def chat_stream(
         deployment_name,
         should_store,
         managed_tools,
-    ) = process_chat(session, chat_request, request)
+    ) = await process_chat_async(session, chat_request, request)
+
+    model_deployment_stream = await CustomChat().chat_async(
+        chat_request,
+        stream=True,
+        deployment_name=deployment_name,
+        file_paths=file_paths,
+        conversation_id=conversation_id,
+        managed_tools=managed_tools,
+    )
 
     return EventSourceResponse(
         generate_chat_stream(
-            session,
-            CustomChat().chat(
-                chat_request,
-                stream=True,
-                deployment_name=deployment_name,
-                file_paths=file_paths,
-                managed_tools=managed_tools,
+            session_factory,
+            get_coalesced_stream(
+                model_deployment_stream,
+                chat_request.stream_coalesce_ms,
+                chat_request.stream_coalesce_bytes,
             ),
             response_message,
             conversation_id,
@@ -111,7 +148,7 @@ async def chat_stream(
 
 @router.post("/chat", dependencies=[Depends(validate_deployment_header)])
 def chat(
-    session: DBSessionDep,
+    session_factory: DBSessionFactoryDep,
     chat_request: CohereChatRequest,
     request: Request,
 ) -> NonStreamedChatResponse:
@@ -120,31 +157,34 @@ def chat(
 
     Args:
         chat_request (CohereChatRequest): Chat request data.
-        session (DBSessionDep): Database session.
+        session_factory (DBSessionFactoryDep): Factory of short-lived database sessions.
         request (Request): Request object.
 
     Returns:
         NonStreamedChatResponse: Chatbot response.
     """
-    (
-        session,
-        chat_request,
-        file_paths,
-        response_message,
-        conversation_id,
-        user_id,
-        deployment_name,
-        should_store,
-        managed_tools,
-    ) = process_chat(session, chat_request, request)
+    # Release the connection while the model generates, the response is stored in a new session
+    with session_factory() as session:
+        (
+            _,
+            chat_request,
+            file_paths,
+            response_message,
+            conversation_id,
+            user_id,
+            deployment_name,
+            should_store,
+            managed_tools,
+        ) = process_chat(session, chat_request, request)
 
     return generate_chat_response(
-        session,
+        session_factory,
         CustomChat().chat(
             chat_request,
             stream=False,
             deployment_name=deployment_name,
             file_paths=file_paths,
+            conversation_id=conversation_id,
             managed_tools=managed_tools,
         ),
         response_message,
@@ -176,7 +216,7 @@ def process_chat(
     )
 
     # Get position to put next message in
-    next_message_position = get_next_message_position(conversation)
+    next_message_position = get_next_message_position(session, conversation.id)
     user_message = create_message(
         session,
         chat_request,
@@ -208,9 +248,14 @@ def process_chat(
         )
 
     chat_history = create_chat_history(
-        conversation, next_message_position, chat_request
+        session, conversation.id, next_message_position, chat_request
     )
 
+    # Read before committing, committing expires loaded conversations
+    conversation_id = conversation.id
+    # Conversation, user message and file attachments are written in one transaction
+    session.commit()
+
     # co.chat expects either chat_history or conversation_id, not both
     chat_request.chat_history = chat_history
     chat_request.conversation_id = ""
@@ -225,8 +270,96 @@ def process_chat(
         chat_request,
         file_paths,
         chatbot_message,
+        conversation_id,
+        user_id,
+        deployment_name,
+        should_store,
+        managed_tools,
+    )
+
+
+async def process_chat_async(
+    session: AsyncSession, chat_request: BaseChatRequest, request: Request
+) -> tuple[AsyncSession, BaseChatRequest, Union[list[str], None], Message, str, str]:
+    """
+    Process a chat request with backend/crud/aio, for async routes.
+
+    Args:
+        session (AsyncSession): Database session.
+        chat_request (BaseChatRequest): Chat request data.
+        request (Request): Request object.
+
+    Returns:
+        Tuple: Same as process_chat.
+    """
+    user_id = request.headers.get("User-Id", "")
+    deployment_name = request.headers.get("Deployment-Name", "")
+    should_store = chat_request.chat_history is None
+    conversation = await get_or_create_conversation_async(
+        session, chat_request, user_id, should_store
+    )
+
+    # Get position to put next message in
+    next_message_position = await get_next_message_position_async(
+        session, conversation.id
+    )
+    user_message = await create_message_async(
+        session,
+        chat_request,
+        conversation.id,
+        user_id,
+        next_message_position,
+        chat_request.message,
+        MessageAgent.USER,
+        should_store,
+        id=str(uuid4()),
+    )
+    chatbot_message = await create_message_async(
+        session,
+        chat_request,
         conversation.id,
         user_id,
+        next_message_position,
+        "",
+        MessageAgent.CHATBOT,
+        False,
+        id=str(uuid4()),
+    )
+
+    file_paths = None
+    if isinstance(chat_request, CohereChatRequest):
+        file_paths = await handle_file_retrieval_async(
+            session, user_id, chat_request.file_ids
+        )
+        if chat_request.file_ids is not None:
+            await async_file_crud.attach_files_to_message(
+                session, chat_request.file_ids, user_id, user_message.id
+            )
+
+    chat_history = await create_chat_history_async(
+        session, conversation.id, next_message_position, chat_request
+    )
+
+    conversation_id = conversation.id
+    # Conversation, user message and file attachments are written in one transaction
+    await session.commit()
+
+    # co.chat expects either chat_history or conversation_id, not both
+    chat_request.chat_history = chat_history
+    chat_request.conversation_id = ""
+
+    tools = chat_request.tools
+    managed_tools = (
+        len([tool.name for tool in tools if tool.name in AVAILABLE_TOOLS]) > 0
+    )
+
+    return (
+        session,
+        chat_request,
+        file_paths,
+        chatbot_message,
+        conversation_id,
+        user_id,
         deployment_name,
         should_store,
         managed_tools,
@@ -261,31 +394,90 @@ def get_or_create_conversation(
         )
 
         if should_store:
-            conversation_crud.create_conversation(session, conversation)
+            conversation_crud.insert_conversation(session, conversation)
+
+    return conversation
+
+
+async def get_or_create_conversation_async(
+    session: AsyncSession,
+    chat_request: BaseChatRequest,
+    user_id: str,
+    should_store: bool,
+) -> Conversation:
+    """
+    Async version of get_or_create_conversation.
+
+    Args:
+        session (AsyncSession): Database session.
+        chat_request (BaseChatRequest): Chat request data.
+        user_id (str): User ID.
+        should_store (bool): Whether to store the conversation in the database.
+
+    Returns:
+        Conversation: Conversation object.
+    """
+    conversation_id = chat_request.conversation_id or ""
+    conversation = await async_conversation_crud.get_conversation(
+        session, conversation_id, user_id
+    )
+
+    if conversation is None:
+        conversation = Conversation(
+            user_id=user_id,
+            id=chat_request.conversation_id,
+        )
+
+        if should_store:
+            await async_conversation_crud.insert_conversation(session, conversation)
 
     return conversation
 
 
-def get_next_message_position(conversation: Conversation) -> int:
+def get_next_message_position(session: DBSessionDep, conversation_id: str) -> int:
     """
     Gets message position to create next messages.
 
     Args:
-        conversation (Conversation): current Conversation.
+        session (DBSessionDep): Database session.
+        conversation_id (str): Conversation ID.
 
     Returns:
         int: Position to save new messages with
     """
+    # Get current max position from existing Messages, without loading them
+    current_active_position = message_crud.get_max_active_position(
+        session, conversation_id
+    )
 
     # Message starts the conversation
-    if len(conversation.messages) == 0:
+    if current_active_position is None:
         return 0
 
-    # Get current max position from existing Messages
-    current_active_position = max(
-        [message.position for message in conversation.messages if message.is_active]
+    return current_active_position + 1
+
+
+async def get_next_message_position_async(
+    session: AsyncSession, conversation_id: str
+) -> int:
+    """
+    Async version of get_next_message_position.
+
+    Args:
+        session (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+
+    Returns:
+        int: Position to save new messages with
+    """
+    current_active_position = await async_message_crud.get_max_active_position(
+        session, conversation_id
     )
 
+    # Message starts the conversation
+    if current_active_position is None:
+        return 0
+
     return current_active_position + 1
 
 
@@ -301,7 +493,7 @@ def create_message(
     id: str | None = None,
 ) -> Message:
     """
-    Create a message object and store it in the database.
+    Create a message object and insert it in the current transaction.
 
     Args:
         session (DBSessionDep): Database session.
@@ -328,7 +520,53 @@ def create_message(
     )
 
     if should_store:
-        return message_crud.create_message(session, message)
+        message_crud.insert_message(session, message)
+    return message
+
+
+async def create_message_async(
+    session: AsyncSession,
+    chat_request: BaseChatRequest,
+    conversation_id: str,
+    user_id: str,
+    user_message_position: int,
+    text: str | None = None,
+    agent: MessageAgent = MessageAgent.USER,
+    should_store: bool = True,
+    id: str | None = None,
+) -> Message:
+    """
+    Async version of create_message.
+
+    Args:
+        session (AsyncSession): Database session.
+        chat_request (BaseChatRequest): Chat request data.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        user_message_position (int): User message position.
+        text (str): Message text.
+        agent (MessageAgent): Message agent.
+        should_store (bool): Whether to store the message in the database.
+        id (str): Message ID.
+
+    Returns:
+        Message: Message object.
+    """
+    # Without storing, create_message doesn't use the session
+    message = create_message(
+        session,
+        chat_request,
+        conversation_id,
+        user_id,
+        user_message_position,
+        text,
+        agent,
+        False,
+        id,
+    )
+
+    if should_store:
+        await async_message_crud.insert_message(session, message)
     return message
 
 
@@ -355,6 +593,29 @@ def handle_file_retrieval(
     return file_paths
 
 
+async def handle_file_retrieval_async(
+    session: AsyncSession, user_id: str, file_ids: List[str] | None = None
+) -> list[str] | None:
+    """
+    Async version of handle_file_retrieval.
+
+    Args:
+        session (AsyncSession): Database session.
+        user_id (str): User ID.
+        file_ids (List): List of File IDs.
+
+    Returns:
+        list[str] | None: List of file paths or None.
+    """
+    file_paths = None
+    # Use file_ids if provided
+    if file_ids is not None:
+        files = await async_file_crud.get_files_by_ids(session, file_ids, user_id)
+        file_paths = [file.file_path for file in files]
+
+    return file_paths
+
+
 def attach_files_to_messages(
     session: DBSessionDep,
     user_id: str,
@@ -374,14 +635,12 @@ def attach_files_to_messages(
         None
     """
     if file_ids is not None:
-        files = file_crud.get_files_by_ids(session, file_ids, user_id)
-        for file in files:
-            if file.message_id is None:
-                file_crud.update_file(session, file, UpdateFile(message_id=message_id))
+        file_crud.attach_files_to_message(session, file_ids, user_id, message_id)
 
 
 def create_chat_history(
-    conversation: Conversation,
+    session: DBSessionDep,
+    conversation_id: str,
     user_message_position: int,
     chat_request: BaseChatRequest,
 ) -> list[ChatMessage]:
@@ -389,7 +648,8 @@ def create_chat_history(
     Create chat history from conversation messages or request.
 
     Args:
-        conversation (Conversation): Conversation object.
+        session (DBSessionDep): Database session.
+        conversation_id (str): Conversation ID.
         user_message_position (int): User message position.
         chat_request (BaseChatRequest): Chat request data.
 
@@ -401,7 +661,9 @@ def create_chat_history(
 
     text_messages = [
         message
-        for message in conversation.messages[:user_message_position]
+        for message in message_crud.get_active_messages_before_position(
+            session, conversation_id, user_message_position
+        )
         if message.type == MessageType.TEXT
     ]
     return [
@@ -413,6 +675,40 @@ def create_chat_history(
     ]
 
 
+async def create_chat_history_async(
+    session: AsyncSession,
+    conversation_id: str,
+    user_message_position: int,
+    chat_request: BaseChatRequest,
+) -> list[ChatMessage]:
+    """
+    Async version of create_chat_history.
+
+    Args:
+        session (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_message_position (int): User message position.
+        chat_request (BaseChatRequest): Chat request data.
+
+    Returns:
+        list[ChatMessage]: List of chat messages.
+    """
+    if chat_request.chat_history is not None:
+        return chat_request.chat_history
+
+    messages = await async_message_crud.get_active_messages_before_position(
+        session, conversation_id, user_message_position
+    )
+    return [
+        ChatMessage(
+            role=ChatRole(message.agent.value.upper()),
+            message=message.text,
+        )
+        for message in messages
+        if message.type == MessageType.TEXT
+    ]
+
+
 def update_conversation_after_turn(
     session: DBSessionDep,
     response_message: Message,
@@ -421,40 +717,171 @@ def update_conversation_after_turn(
     user_id: str,
 ) -> None:
     """
-    After the last message in a conversation, updates the conversation description with that message's text
+    After the last message in a conversation, stores the message with its documents and citations
+    and updates the conversation description with that message's text, in a single transaction.
+
+    Args:
+        session (DBSessionDep): Database session.
+        response_message (Message): Response message object.
+        conversation_id (str): Conversation ID.
+        final_message_text (str): Final message text.
+    """
+    add_conversation_turn(
+        session, response_message, conversation_id, final_message_text, user_id
+    )
+    session.commit()
+
+
+def add_conversation_turn(
+    session: DBSessionDep,
+    response_message: Message,
+    conversation_id: str,
+    final_message_text: str,
+    user_id: str,
+) -> None:
+    """
+    Adds the writes of update_conversation_after_turn to the session, without committing.
 
     Args:
         session (DBSessionDep): Database session.
         response_message (Message): Response message object.
         conversation_id (str): Conversation ID.
         final_message_text (str): Final message text.
+        user_id (str): User ID.
     """
-    message_crud.create_message(session, response_message)
+    for citation in response_message.citations:
+        citation.message_id = response_message.id
+
+    # Bulk inserts in foreign key order, the message stays transient so nothing is refreshed
+    message_crud.insert_message(session, response_message)
+    document_crud.insert_documents(session, response_message.documents)
+    citation_crud.insert_citations(session, response_message.citations)
 
     # Update conversation description with final message
-    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
-    new_conversation = UpdateConversation(
-        description=final_message_text,
-        user_id=conversation.user_id,
+    conversation_crud.update_conversation_description(
+        session, conversation_id, user_id, final_message_text
     )
-    conversation_crud.update_conversation(session, conversation, new_conversation)
 
 
-def generate_chat_stream(
-    session: DBSessionDep,
-    model_deployment_stream: Generator[StreamedChatResponse, None, None],
+async def add_conversation_turn_async(
+    session: AsyncSession,
+    response_message: Message,
+    conversation_id: str,
+    final_message_text: str,
+    user_id: str,
+) -> None:
+    """
+    Async version of add_conversation_turn.
+
+    Args:
+        session (AsyncSession): Database session.
+        response_message (Message): Response message object.
+        conversation_id (str): Conversation ID.
+        final_message_text (str): Final message text.
+        user_id (str): User ID.
+    """
+    for citation in response_message.citations:
+        citation.message_id = response_message.id
+
+    await async_message_crud.insert_message(session, response_message)
+    await async_document_crud.insert_documents(session, response_message.documents)
+    await async_citation_crud.insert_citations(session, response_message.citations)
+
+    await async_conversation_crud.update_conversation_description(
+        session, conversation_id, user_id, final_message_text
+    )
+
+
+def store_conversation_turn(
+    session_factory: Callable[[], ContextManager[Session]],
+    response_message: Message,
+    conversation_id: str,
+    final_message_text: str,
+    user_id: str,
+) -> None:
+    """
+    Store the chatbot response in a short-lived session, once generation is over.
+
+    If the persistence queue is running the turn is written in the background instead.
+
+    Args:
+        session_factory (Callable[[], ContextManager[Session]]): Factory of short-lived database sessions.
+        response_message (Message): Response message object.
+        conversation_id (str): Conversation ID.
+        final_message_text (str): Final message text.
+        user_id (str): User ID.
+    """
+    queued = persistence_queue.submit(
+        partial(
+            add_conversation_turn,
+            response_message=response_message,
+            conversation_id=conversation_id,
+            final_message_text=final_message_text,
+            user_id=user_id,
+        )
+    )
+    if queued:
+        return
+
+    with session_factory() as session:
+        update_conversation_after_turn(
+            session, response_message, conversation_id, final_message_text, user_id
+        )
+
+
+async def store_conversation_turn_async(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    response_message: Message,
+    conversation_id: str,
+    final_message_text: str,
+    user_id: str,
+) -> None:
+    """
+    Async version of store_conversation_turn.
+
+    If the persistence queue is running the turn is written in the background instead.
+
+    Args:
+        session_factory (Callable[[], AsyncContextManager[AsyncSession]]): Factory of short-lived database sessions.
+        response_message (Message): Response message object.
+        conversation_id (str): Conversation ID.
+        final_message_text (str): Final message text.
+        user_id (str): User ID.
+    """
+    queued = persistence_queue.submit(
+        partial(
+            add_conversation_turn,
+            response_message=response_message,
+            conversation_id=conversation_id,
+            final_message_text=final_message_text,
+            user_id=user_id,
+        )
+    )
+    if queued:
+        return
+
+    async with session_factory() as session:
+        await add_conversation_turn_async(
+            session, response_message, conversation_id, final_message_text, user_id
+        )
+        await session.commit()
+
+
+async def generate_chat_stream(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    model_deployment_stream: AsyncGenerator[StreamedChatResponse, None],
     response_message: Message,
     conversation_id: str,
     user_id: str,
     should_store: bool = True,
     **kwargs: Any,
-) -> Generator[bytes, Any, None]:
+) -> AsyncGenerator[bytes, Any]:
     """
     Generate chat stream from model deployment stream.
 
     Args:
-        session (DBSessionDep): Database session.
-        model_deployment_stream (Generator[StreamResponse, None, None]): Model deployment stream.
+        session_factory (Callable[[], AsyncContextManager[AsyncSession]]): Factory of short-lived database sessions.
+        model_deployment_stream (AsyncGenerator[StreamResponse, None]): Model deployment stream.
         response_message (Message): Response message object.
         conversation_id (str): Conversation ID.
         user_id (str): User ID.
@@ -470,20 +897,28 @@ def generate_chat_stream(
     }
 
     # Given a stream of CohereEventStream objects, save the final message to DB and yield byte representations
-    final_message_text = ""
+    text_chunks = []
 
     # Map the user facing document_ids field returned from model to storage ID for document model
     document_ids_to_document = {}
     all_citations = []
 
     stream_event = None
-    for event in model_deployment_stream:
+    stream_payload = None
+    async for event in model_deployment_stream:
         if event["event_type"] == StreamEvent.STREAM_START:
             stream_event = StreamStart.model_validate(event)
             response_message.generation_id = event["generation_id"]
             stream_end_data["generation_id"] = event["generation_id"]
         elif event["event_type"] == StreamEvent.TEXT_GENERATION:
-            final_message_text += event["text"]
+            text_chunks.append(event["text"])
+            # Hot path, pre-framed bytes when the event needs no validation
+            stream_payload = encode_text_generation(
+                event["text"], event.get("is_finished")
+            )
+            if stream_payload is not None:
+                yield stream_payload
+                continue
             stream_event = StreamTextGeneration.model_validate(event)
         elif event["event_type"] == StreamEvent.SEARCH_RESULTS:
             for document in event["documents"]:
@@ -548,9 +983,16 @@ def generate_chat_stream(
                     if document is not None:
                         citation.documents.append(document)
                 citations.append(citation)
-            stream_event = StreamCitationGeneration(**event | {"citations": citations})
             all_citations.extend(citations)
+            stream_payload = encode_citation_generation(
+                citations, event.get("is_finished")
+            )
+            if stream_payload is not None:
+                yield stream_payload
+                continue
+            stream_event = StreamCitationGeneration(**event | {"citations": citations})
         elif event["event_type"] == StreamEvent.STREAM_END:
+            final_message_text = "".join(text_chunks)
             response_message.citations = all_citations
             response_message.text = final_message_text
 
@@ -559,23 +1001,22 @@ def generate_chat_stream(
             stream_end = StreamEnd.model_validate(event | stream_end_data)
             stream_event = stream_end
 
-        yield json.dumps(
-            jsonable_encoder(
-                ChatResponseEvent(
-                    event=stream_event.event_type.value,
-                    data=stream_event,
-                )
-            )
-        )
+        if event["event_type"] != StreamEvent.TOOL_CALLS_GENERATION:
+            stream_payload = encode_chat_response_event(stream_event)
+        yield stream_payload
 
     if should_store:
-        update_conversation_after_turn(
-            session, response_message, conversation_id, final_message_text, user_id
+        await store_conversation_turn_async(
+            session_factory,
+            response_message,
+            conversation_id,
+            "".join(text_chunks),
+            user_id,
         )
 
 
 def generate_chat_response(
-    session: DBSessionDep,
+    session_factory: Callable[[], ContextManager[Session]],
     model_deployment_response: Generator[StreamedChatResponse, None, None],
     response_message: Message,
     conversation_id: str,
@@ -587,7 +1028,7 @@ def generate_chat_response(
     Generate chat response from model deployment non streaming response.
 
     Args:
-        session (DBSessionDep): Database session.
+        session_factory (Callable[[], ContextManager[Session]]): Factory of short-lived database sessions.
         model_deployment_response (Any): Model deployment response.
         response_message (Message): Response message object.
         conversation_id (str): Conversation ID.
@@ -654,8 +1095,8 @@ def generate_chat_response(
     response_message.generation_id = non_streamed_chat_response.generation_id
 
     if should_store:
-        update_conversation_after_turn(
-            session,
+        store_conversation_turn(
+            session_factory,
             response_message,
             conversation_id,
             non_streamed_chat_response.text,
@@ -667,28 +1108,31 @@ def generate_chat_response(
 
 @router.post("/langchain-chat")
 def langchain_chat_stream(
-    session: DBSessionDep, chat_request: LangchainChatRequest, request: Request
+    session_factory: DBSessionFactoryDep,
+    chat_request: LangchainChatRequest,
+    request: Request,
 ):
 
     use_langchain = bool(strtobool(os.getenv("USE_EXPERIMENTAL_LANGCHAIN", "false")))
     if not use_langchain:
         return {"error": "Langchain is not enabled."}
 
-    (
-        session,
-        chat_request,
-        _,
-        response_message,
-        conversation_id,
-        user_id,
-        _,
-        should_store,
-        managed_tools,
-    ) = process_chat(session, chat_request, request)
+    with session_factory() as session:
+        (
+            _,
+            chat_request,
+            _,
+            response_message,
+            conversation_id,
+            user_id,
+            _,
+            should_store,
+            managed_tools,
+        ) = process_chat(session, chat_request, request)
 
     return EventSourceResponse(
         generate_langchain_chat_stream(
-            session,
+            session_factory,
             LangChainChat().chat(chat_request, managed_tools=managed_tools),
             response_message,
             conversation_id,
@@ -700,7 +1144,7 @@ def langchain_chat_stream(
 
 
 def generate_langchain_chat_stream(
-    session: DBSessionDep,
+    session_factory: Callable[[], ContextManager[Session]],
     model_deployment_stream: Generator[Any, None, None],
     response_message: Message,
     conversation_id: str,
@@ -828,6 +1272,10 @@ def generate_langchain_chat_stream(
                     )
                 )
     if should_store:
-        update_conversation_after_turn(
-            session, response_message, conversation_id, final_message_text, user_id
+        store_conversation_turn(
+            session_factory,
+            response_message,
+            conversation_id,
+            final_message_text,
+            user_id,
         )
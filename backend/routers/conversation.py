@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends
+import datetime
+
+from fastapi import APIRouter, BackgroundTasks, Depends
 from fastapi import File as RequestFile
-from fastapi import Form, HTTPException, Request
+from fastapi import Form, HTTPException, Query, Request, Response
 from fastapi import UploadFile as FastAPIUploadFile
 
 from backend.crud import conversation as conversation_crud
-from backend.crud import file as file_crud
+from backend.crud import message as message_crud
+from backend.crud.aio import conversation as async_conversation_crud
+from backend.crud.aio import file as async_file_crud
 from backend.models import Conversation as ConversationModel
 from backend.models import File as FileModel
-from backend.models import get_session
-from backend.models.database import DBSessionDep
+from backend.models.database import AsyncDBSessionDep, DBSessionDep
 from backend.schemas.conversation import (
     Conversation,
     ConversationWithoutMessages,
@@ -16,12 +19,15 @@ from backend.schemas.conversation import (
     UpdateConversation,
 )
 from backend.schemas.file import DeleteFile, File, ListFile, UpdateFile, UploadFile
+from backend.schemas.message import Message
 from backend.services.file.service import FileService
+from backend.services.pagination import NEXT_CURSOR_HEADER, decode_cursor, get_page
 from backend.services.request_validators import validate_user_header
+from backend.tools.retrieval.file_index import delete_file_index, index_uploaded_file
 
 router = APIRouter(
     prefix="/conversations",
-    dependencies=[Depends(get_session), Depends(validate_user_header)],
+    dependencies=[Depends(validate_user_header)],
 )
 
 
@@ -45,7 +51,12 @@ def get_conversation(
         HTTPException: If the conversation with the given ID is not found.
     """
     user_id = request.headers.get("User-Id", "")
-    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
+    conversation = conversation_crud.get_conversation(
+        session,
+        conversation_id,
+        user_id,
+        options=conversation_crud.CONVERSATION_DETAIL_OPTIONS,
+    )
 
     if not conversation:
         raise HTTPException(
@@ -58,24 +69,68 @@ def get_conversation(
 
 @router.get("/", response_model=list[ConversationWithoutMessages])
 def list_conversations(
-    *, offset: int = 0, limit: int = 100, session: DBSessionDep, request: Request
+    *,
+    offset: int | None = None,
+    limit: int = Query(default=100, ge=1),
+    cursor: str | None = None,
+    session: DBSessionDep,
+    request: Request,
+    response: Response,
 ) -> list[ConversationWithoutMessages]:
     """
-    List all conversations.
+    List all conversations, most recently updated first.
+
+    The cursor of the next page is returned in the X-Next-Cursor header. Passing
+    an offset instead of a cursor uses offset pagination, without a next cursor.
 
     Args:
-        offset (int): Offset to start the list.
+        offset (int | None): Offset to start the list.
         limit (int): Limit of conversations to be listed.
+        cursor (str | None): Cursor of the page to list.
         session (DBSessionDep): Database session.
         request (Request): Request object.
+        response (Response): Response object.
 
     Returns:
         list[ConversationWithoutMessages]: List of conversations.
+
+    Raises:
+        HTTPException: If both an offset and a cursor are given, or the cursor is invalid.
     """
     user_id = request.headers.get("User-Id")
-    return conversation_crud.get_conversations(
-        session, offset=offset, limit=limit, user_id=user_id
+
+    if offset is not None:
+        if cursor is not None:
+            raise HTTPException(
+                status_code=400, detail="Use either offset or cursor, not both."
+            )
+
+        return conversation_crud.get_conversations(
+            session,
+            offset=offset,
+            limit=limit,
+            user_id=user_id,
+            options=conversation_crud.CONVERSATION_LIST_OPTIONS,
+        )
+
+    after = decode_cursor(cursor, (datetime.datetime, str)) if cursor else None
+    # One extra row tells if there is a next page
+    conversations = conversation_crud.get_conversations_after(
+        session,
+        user_id,
+        after=after,
+        limit=limit + 1,
+        options=conversation_crud.CONVERSATION_LIST_OPTIONS,
+    )
+    conversations, next_cursor = get_page(
+        conversations,
+        limit,
+        key=lambda conversation: (conversation.updated_at, conversation.id),
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return conversations
 
 
 @router.put("/{conversation_id}", response_model=Conversation)
@@ -101,7 +156,13 @@ def update_conversation(
         HTTPException: If the conversation with the given ID is not found.
     """
     user_id = request.headers.get("User-Id")
-    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
+    # Refreshing after the update reloads the eager loaded relationships
+    conversation = conversation_crud.get_conversation(
+        session,
+        conversation_id,
+        user_id,
+        options=conversation_crud.CONVERSATION_DETAIL_OPTIONS,
+    )
 
     if not conversation:
         raise HTTPException(
@@ -148,12 +209,71 @@ def delete_conversation(
     return DeleteConversation()
 
 
+# MESSAGES
+@router.get("/{conversation_id}/messages", response_model=list[Message])
+def list_messages(
+    conversation_id: str,
+    session: DBSessionDep,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=100, ge=1),
+    cursor: str | None = None,
+) -> list[Message]:
+    """
+    List the messages of a conversation in order, one page at a time.
+
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
+    Args:
+        conversation_id (str): Conversation ID.
+        session (DBSessionDep): Database session.
+        request (Request): Request object.
+        response (Response): Response object.
+        limit (int): Limit of messages to be listed.
+        cursor (str | None): Cursor of the page to list.
+
+    Returns:
+        list[Message]: Messages from the conversation.
+
+    Raises:
+        HTTPException: If the conversation with the given ID is not found, or the cursor is invalid.
+    """
+    user_id = request.headers.get("User-Id", "")
+    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
+
+    if not conversation:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Conversation with ID: {conversation_id} not found.",
+        )
+
+    after = decode_cursor(cursor, (int, datetime.datetime, str)) if cursor else None
+    messages = message_crud.get_messages_by_conversation_id_after(
+        session,
+        conversation_id,
+        user_id,
+        after=after,
+        limit=limit + 1,
+        options=message_crud.MESSAGE_DETAIL_OPTIONS,
+    )
+    messages, next_cursor = get_page(
+        messages,
+        limit,
+        key=lambda message: (message.position, message.created_at, message.id),
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return messages
+
+
 # FILES
 @router.post("/{conversation_id}/upload_file", response_model=UploadFile)
 async def upload_file_with_conversation(
     conversation_id: str,
-    session: DBSessionDep,
+    session: AsyncDBSessionDep,
     request: Request,
+    background_tasks: BackgroundTasks,
     file: FastAPIUploadFile = RequestFile(...),
 ) -> UploadFile:
     """
@@ -164,7 +284,8 @@ async def upload_file_with_conversation(
 
     Args:
         conversation_id (str): Conversation ID.
-        session (DBSessionDep): Database session.
+        session (AsyncDBSessionDep): Database session.
+        background_tasks (BackgroundTasks): Builds the file's vector index after the response.
         file (FastAPIUploadFile): File to be uploaded.
 
     Returns:
@@ -175,7 +296,9 @@ async def upload_file_with_conversation(
         HTTPException: If the file wasn't uploaded correctly. Status code 500.
     """
     user_id = request.headers.get("User-Id")
-    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
+    conversation = await async_conversation_crud.get_conversation(
+        session, conversation_id, user_id
+    )
 
     if not conversation:
         raise HTTPException(
@@ -199,24 +322,28 @@ async def upload_file_with_conversation(
         file_size=file_path.stat().st_size,
     )
 
-    db_file = file_crud.create_file(session, db_file)
+    db_file = await async_file_crud.create_file(session, db_file)
+    background_tasks.add_task(index_uploaded_file, db_file.file_path)
 
     return db_file
 
 
 @router.post("/upload_file", response_model=UploadFile)
 async def upload_file(
-    session: DBSessionDep,
+    session: AsyncDBSessionDep,
     request: Request,
+    background_tasks: BackgroundTasks,
     conversation_id: str = Form(None),
     file: FastAPIUploadFile = RequestFile(...),
 ) -> UploadFile:
     """
     Uploads and creates a File object.
     If no conversation_id is provided, a new Conversation is created as well.
+    The file's vector index is built in the background, after the response.
 
     Args:
-        session (DBSessionDep): Database session.
+        session (AsyncDBSessionDep): Database session.
+        background_tasks (BackgroundTasks): Builds the file's vector index after the response.
         file (FastAPIUploadFile): File to be uploaded.
         conversation_id (Optional[str]): Conversation ID passed from request query parameter.
 
@@ -232,13 +359,13 @@ async def upload_file(
 
     # Create new conversation
     if not conversation_id:
-        conversation = conversation_crud.create_conversation(
+        conversation = await async_conversation_crud.create_conversation(
             session,
             ConversationModel(user_id=user_id),
         )
     # Check for existing conversation
     else:
-        conversation = conversation_crud.get_conversation(
+        conversation = await async_conversation_crud.get_conversation(
             session, conversation_id, user_id
         )
 
@@ -251,7 +378,7 @@ async def upload_file(
                 )
 
             # Create new conversation
-            conversation = conversation_crud.create_conversation(
+            conversation = await async_conversation_crud.create_conversation(
                 session,
                 ConversationModel(user_id=user_id),
             )
@@ -274,30 +401,45 @@ async def upload_file(
         file_size=file_path.stat().st_size,
     )
 
-    upload_file = file_crud.create_file(session, upload_file)
+    upload_file = await async_file_crud.create_file(session, upload_file)
+    background_tasks.add_task(index_uploaded_file, upload_file.file_path)
 
     return upload_file
 
 
 @router.get("/{conversation_id}/files", response_model=list[ListFile])
 async def list_files(
-    conversation_id: str, session: DBSessionDep, request: Request
+    conversation_id: str,
+    session: AsyncDBSessionDep,
+    request: Request,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = None,
 ) -> list[ListFile]:
     """
-    List all files from a conversation. Important - no pagination support yet.
+    List files from a conversation, in upload order.
+
+    All files are listed unless a limit or a cursor is given. Then the cursor
+    of the next page is returned in the X-Next-Cursor header.
 
     Args:
         conversation_id (str): Conversation ID.
-        session (DBSessionDep): Database session.
+        session (AsyncDBSessionDep): Database session.
+        request (Request): Request object.
+        response (Response): Response object.
+        limit (int | None): Limit of files to be listed, defaults to 100 with a cursor.
+        cursor (str | None): Cursor of the page to list.
 
     Returns:
         list[ListFile]: List of files from the conversation.
 
     Raises:
-        HTTPException: If the conversation with the given ID is not found.
+        HTTPException: If the conversation with the given ID is not found, or the cursor is invalid.
     """
     user_id = request.headers.get("User-Id", "")
-    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
+    conversation = await async_conversation_crud.get_conversation(
+        session, conversation_id, user_id
+    )
 
     if not conversation:
         raise HTTPException(
@@ -305,7 +447,22 @@ async def list_files(
             detail=f"Conversation with ID: {conversation_id} not found.",
         )
 
-    files = file_crud.get_files_by_conversation_id(session, conversation_id, user_id)
+    if limit is None and cursor is None:
+        return await async_file_crud.get_files_by_conversation_id(
+            session, conversation_id, user_id
+        )
+
+    limit = limit or 100
+    after = decode_cursor(cursor, (datetime.datetime, str)) if cursor else None
+    files = await async_file_crud.get_files_by_conversation_id_after(
+        session, conversation_id, user_id, after=after, limit=limit + 1
+    )
+    files, next_cursor = get_page(
+        files, limit, key=lambda file: (file.created_at, file.id)
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
     return files
 
 
@@ -314,7 +471,7 @@ async def update_file(
     conversation_id: str,
     file_id: str,
     new_file: UpdateFile,
-    session: DBSessionDep,
+    session: AsyncDBSessionDep,
     request: Request,
 ) -> File:
     """
@@ -324,7 +481,7 @@ async def update_file(
         conversation_id (str): Conversation ID.
         file_id (str): File ID.
         new_file (UpdateFile): New file data.
-        session (DBSessionDep): Database session.
+        session (AsyncDBSessionDep): Database session.
 
     Returns:
         File: Updated file.
@@ -334,7 +491,9 @@ async def update_file(
     """
     user_id = request.headers.get("User-Id", "")
 
-    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
+    conversation = await async_conversation_crud.get_conversation(
+        session, conversation_id, user_id
+    )
 
     if not conversation:
         raise HTTPException(
@@ -342,7 +501,7 @@ async def update_file(
             detail=f"Conversation with ID: {conversation_id} not found.",
         )
 
-    file = file_crud.get_file(session, file_id, user_id)
+    file = await async_file_crud.get_file(session, file_id, user_id)
 
     if not file:
         raise HTTPException(
@@ -350,14 +509,14 @@ async def update_file(
             detail=f"File with ID: {file_id} not found.",
         )
 
-    file = file_crud.update_file(session, file, new_file)
+    file = await async_file_crud.update_file(session, file, new_file)
 
     return file
 
 
 @router.delete("/{conversation_id}/files/{file_id}")
 async def delete_file(
-    conversation_id: str, file_id: str, session: DBSessionDep, request: Request
+    conversation_id: str, file_id: str, session: AsyncDBSessionDep, request: Request
 ) -> DeleteFile:
     """
     Delete a file by ID.
@@ -365,7 +524,7 @@ async def delete_file(
     Args:
         conversation_id (str): Conversation ID.
         file_id (str): File ID.
-        session (DBSessionDep): Database session.
+        session (AsyncDBSessionDep): Database session.
 
     Returns:
         DeleteFile: Empty response.
@@ -374,7 +533,9 @@ async def delete_file(
         HTTPException: If the conversation with the given ID is not found.
     """
     user_id = request.headers.get("User-Id", "")
-    conversation = conversation_crud.get_conversation(session, conversation_id, user_id)
+    conversation = await async_conversation_crud.get_conversation(
+        session, conversation_id, user_id
+    )
 
     if not conversation:
         raise HTTPException(
@@ -382,7 +543,7 @@ async def delete_file(
             detail=f"Conversation with ID: {conversation_id} not found.",
         )
 
-    file = file_crud.get_file(session, file_id, user_id)
+    file = await async_file_crud.get_file(session, file_id, user_id)
 
     if not file:
         raise HTTPException(
@@ -390,8 +551,9 @@ async def delete_file(
             detail=f"File with ID: {file_id} not found.",
         )
 
-    # Delete File from local volume, and also the File DB object
+    # Delete File and its vector index from local volume, and also the File DB object
     FileService().delete_file(file.file_path)
-    file_crud.delete_file(session, file_id, user_id)
+    delete_file_index(file.file_path)
+    await async_file_crud.delete_file(session, file_id, user_id)
 
     return DeleteFile()
@@ -1,14 +1,15 @@
+from urllib.parse import unquote_plus
+
 from fastapi import APIRouter, Depends, HTTPException, Response
 
+from backend.chat.custom.model_deployments.deployment import reset_deployment
 from backend.config.deployments import AVAILABLE_MODEL_DEPLOYMENTS
-from backend.models import get_session
 from backend.schemas.deployment import Deployment, UpdateDeploymentEnv
 from backend.services.env import update_env_file
 from backend.services.request_validators import validate_env_vars
 
 router = APIRouter(
     prefix="/deployments",
-    dependencies=[Depends(get_session)],
 )
 
 
@@ -50,3 +51,5 @@ def set_env_vars(
         str: Empty string.
     """
     update_env_file(env_vars.env_vars)
+    # Rebuild the deployment's clients with the new credentials on next use
+    reset_deployment(unquote_plus(name))
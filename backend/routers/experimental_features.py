@@ -1,13 +1,10 @@
 import os
 from distutils.util import strtobool
 
-from fastapi import APIRouter, Depends
-
-from backend.models import get_session
+from fastapi import APIRouter
 
 router = APIRouter(
     prefix="/experimental_features",
-    dependencies=[Depends(get_session)],
 )
 
 
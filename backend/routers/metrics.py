@@ -0,0 +1,22 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from backend.services.metrics import metrics
+from backend.services.request_validators import validate_user_header
+
+router = APIRouter(
+    prefix="/metrics",
+    dependencies=[Depends(validate_user_header)],
+)
+
+
+@router.get("/")
+def get_metrics() -> dict[str, Any]:
+    """
+    Get the in-process metrics of this server.
+
+    Returns:
+        dict[str, Any]: Counters, gauges and timings keyed by metric name.
+    """
+    return metrics.snapshot()
@@ -1,13 +1,10 @@
 from fastapi import APIRouter, Depends
 
 from backend.config.tools import AVAILABLE_TOOLS
-from backend.models import get_session
 from backend.schemas.tool import ManagedTool
 from backend.services.request_validators import validate_user_header
 
-router = APIRouter(
-    prefix="/tools", dependencies=[Depends(get_session), Depends(validate_user_header)]
-)
+router = APIRouter(prefix="/tools", dependencies=[Depends(validate_user_header)])
 
 
 @router.get("/", response_model=list[ManagedTool])
@@ -101,3 +101,15 @@ class CohereChatRequest(BaseChatRequest):
         default=CohereChatPromptTruncation.AUTO_PRESERVE_ORDER,
         title="Dictates how the prompt will be constructed. Defaults to 'AUTO_PRESERVE_ORDER'.",
     )
+    stream_coalesce_ms: float | None = Field(
+        default=None,
+        title="Milliseconds to merge consecutive text generation events into one streamed event. 0 disables it. Defaults to the STREAM_COALESCE_MS setting.",
+        ge=0,
+        exclude=True,
+    )
+    stream_coalesce_bytes: int | None = Field(
+        default=None,
+        title="Size in bytes at which merged text generation events are sent before the window ends. Defaults to the STREAM_COALESCE_BYTES setting.",
+        ge=1,
+        exclude=True,
+    )
@@ -1,7 +1,7 @@
 import datetime
 from typing import List, Optional, Union
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, computed_field
 
 from backend.schemas.file import File
 from backend.schemas.message import Message
@@ -11,13 +11,13 @@ class ConversationBase(BaseModel):
     user_id: str
 
 
-class Conversation(ConversationBase):
+class ConversationWithoutMessages(ConversationBase):
+    # No messages field, so validating from a model doesn't load the messages
     id: str
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
     title: str
-    messages: List[Message]
     files: List[File]
     description: Optional[str]
 
@@ -29,8 +29,8 @@ class Conversation(ConversationBase):
         from_attributes = True
 
 
-class ConversationWithoutMessages(Conversation):
-    messages: List[Message] = Field(exclude=True)
+class Conversation(ConversationWithoutMessages):
+    messages: List[Message]
 
 
 class UpdateConversation(BaseModel):
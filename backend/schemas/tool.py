@@ -25,6 +25,8 @@ class ManagedTool(Tool):
     is_visible: bool = False
     category: Category = Category.DataLoader
     implementation: Any = Field(exclude=True)
+    # Seconds retrieved documents are cached for, None doesn't cache them
+    cache_ttl: Optional[float] = Field(default=None, exclude=True)
 
     class Config:
         from_attributes = True
@@ -0,0 +1,264 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable
+
+"""
+Key-value caches with per-entry TTLs and LRU eviction.
+
+Values must be JSON serializable. MemoryCache lives in one process, SQLiteCache
+is a file on the local disk shared by every worker of the host.
+"""
+
+# Backend of the shared caches: "memory", "sqlite" or "none" to disable them
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+# Maximum number of entries kept by each cache before the least recently used are evicted
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+# SQLite database file of the sqlite backend
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "src/backend/data/cache.sqlite")
+
+CACHE_BACKENDS = ("memory", "sqlite", "none")
+
+SQLITE_MAX_KEYS = 500
+
+
+class BaseCache:
+    """Base for all cache backends."""
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """
+        Get a value, None if it's missing or expired.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Any | None: Cached value.
+        """
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store a value, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (str): Cache key.
+            value (Any): JSON serializable value.
+            ttl (float): Seconds before the value expires.
+        """
+        ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Get the values of several keys.
+
+        Args:
+            keys (Iterable[str]): Cache keys.
+
+        Returns:
+            dict[str, Any]: Cached values by key, without the missing or expired keys.
+        """
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_many(self, values: dict[str, Any], ttl: float) -> None:
+        """
+        Store several values with the same TTL.
+
+        Args:
+            values (dict[str, Any]): JSON serializable values by key.
+            ttl (float): Seconds before the values expire.
+        """
+        for key, value in values.items():
+            self.set(key, value, ttl)
+
+
+class NullCache(BaseCache):
+    """Cache that stores nothing."""
+
+    def get(self, key: str) -> Any | None:
+        return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache(BaseCache):
+    """In-process cache, safe to use from any thread."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (expires at, serialized value), least recently used first
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        # Stored serialized, so callers can't mutate the cached value
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        entry = (time.time() + ttl, json.dumps(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache in a SQLite database, shared by the processes of the host.
+
+    The database is created on first use, in WAL mode so readers don't block
+    the writer.
+    """
+
+    def __init__(
+        self, path: str = CACHE_SQLITE_PATH, max_entries: int = CACHE_MAX_ENTRIES
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def get(self, key: str) -> Any | None:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.set_many({key: value}, ttl)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        connection = self._get_connection()
+        now = time.time()
+        rows = []
+        with connection:
+            # Stay under the SQLite limit of variables per statement
+            for i in range(0, len(keys), SQLITE_MAX_KEYS):
+                chunk = keys[i : i + SQLITE_MAX_KEYS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows += connection.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders}) "
+                    "AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+            connection.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                [(now, key) for key, _ in rows],
+            )
+
+        return {key: json.loads(value) for key, value in rows}
+
+    def set_many(self, values: dict[str, Any], ttl: float) -> None:
+        if not values:
+            return
+
+        connection = self._get_connection()
+        now = time.time()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (key, json.dumps(value), now + ttl, now)
+                    for key, value in values.items()
+                ],
+            )
+            connection.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM cache")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_accessed_at ON cache (accessed_at)"
+        )
+        self._local.connection = connection
+        return connection
+
+
+def create_cache(
+    backend: str = CACHE_BACKEND,
+    namespace: str = "default",
+    max_entries: int = CACHE_MAX_ENTRIES,
+) -> BaseCache:
+    """
+    Create a cache with the configured backend.
+
+    Args:
+        backend (str): Cache backend, one of CACHE_BACKENDS.
+        namespace (str): Name of the cache, caches with different names don't share entries.
+        max_entries (int): Maximum number of entries.
+
+    Returns:
+        BaseCache: Cache instance.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend == "memory":
+        return MemoryCache(max_entries)
+    if backend == "sqlite":
+        path = Path(CACHE_SQLITE_PATH)
+        return SQLiteCache(str(path.with_stem(f"{path.stem}_{namespace}")), max_entries)
+    if backend == "none":
+        return NullCache()
+
+    raise ValueError(
+        f"Unknown cache backend {backend}, expected one of {CACHE_BACKENDS}"
+    )
@@ -1,3 +1,5 @@
+import os
+
 from dotenv import find_dotenv, load_dotenv, set_key
 
 
@@ -10,5 +12,7 @@ def update_env_file(env_vars: dict[str, str]):
 
     for key in env_vars:
         set_key(dotenv_path, key, env_vars[key])
+        # load_dotenv does not override variables that are already set
+        os.environ[key] = env_vars[key]
 
     load_dotenv(dotenv_path)
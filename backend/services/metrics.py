@@ -0,0 +1,63 @@
+import threading
+from collections import defaultdict
+from typing import Any
+
+
+class Metrics:
+    """
+    In-process metrics registry, safe to update from any thread.
+
+    Counters only go up, gauges hold the last value set and timings keep the
+    count, total and maximum of the observed values.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = {"count": 1, "total": value, "max": value}
+                return
+
+            timing["count"] += 1
+            timing["total"] += value
+            timing["max"] = max(timing["max"], value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get a copy of all metrics.
+
+        Returns:
+            dict[str, Any]: Counters, gauges and timings keyed by metric name.
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {
+                    name: timing | {"mean": timing["total"] / timing["count"]}
+                    for name, timing in self._timings.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,89 @@
+import base64
+import datetime
+import json
+from typing import Any, Callable, Sequence, TypeVar
+
+from fastapi import HTTPException
+
+"""
+Opaque cursors for keyset pagination.
+
+A cursor holds the sort key of the last row of a page, and the next page
+starts right after that key. Unlike an offset, the database can seek to the
+key through an index, so deep pages are as fast as the first one.
+"""
+
+# Response header holding the cursor of the next page, absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """
+    Encode a sort key into an opaque cursor.
+
+    Args:
+        key (Sequence[Any]): Sort key values, strings, integers or datetimes.
+
+    Returns:
+        str: URL safe cursor.
+    """
+    values = [
+        value.isoformat() if isinstance(value, datetime.datetime) else value
+        for value in key
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """
+    Decode a cursor into a sort key.
+
+    Args:
+        cursor (str): Cursor returned with a previous page.
+        types (Sequence[type]): Expected type of each sort key value.
+
+    Returns:
+        tuple: Sort key values.
+
+    Raises:
+        HTTPException: If the cursor is malformed or doesn't match the sort key.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Cursor length doesn't match the sort key")
+
+        key = []
+        for value, value_type in zip(values, types):
+            if value_type is datetime.datetime:
+                value = datetime.datetime.fromisoformat(value)
+            elif not isinstance(value, value_type) or isinstance(value, bool):
+                raise ValueError(f"Expected {value_type.__name__} in cursor")
+            key.append(value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}.")
+
+    return tuple(key)
+
+
+def get_page(
+    rows: list[T], limit: int, key: Callable[[T], Sequence[Any]]
+) -> tuple[list[T], str | None]:
+    """
+    Split rows fetched with limit + 1 into a page and the cursor of the next page.
+
+    Args:
+        rows (list[T]): Rows in sort order, at most limit + 1.
+        limit (int): Page size.
+        key (Callable[[T], Sequence[Any]]): Gets the sort key of a row.
+
+    Returns:
+        tuple[list[T], str | None]: The page, and the next cursor if there are more rows.
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
@@ -0,0 +1,243 @@
+import os
+import queue
+import threading
+import time
+from distutils.util import strtobool
+from typing import Callable, ContextManager
+
+from sqlalchemy.orm import Session
+
+from backend.models.database import session_factory as default_session_factory
+from backend.services.logger import get_logger
+from backend.services.metrics import metrics
+
+"""
+Write-behind persistence of finished chat turns.
+
+When enabled, a finished turn is queued and the response ends right away.
+Worker threads write queued turns in batches, one transaction per batch, and
+the queue is drained when the app shuts down.
+"""
+
+logger = get_logger()
+
+# Write finished chat turns from a background queue instead of before the response ends
+USE_PERSISTENCE_QUEUE = bool(strtobool(os.getenv("USE_PERSISTENCE_QUEUE", "false")))
+# Number of worker threads writing queued turns
+PERSISTENCE_WORKERS = int(os.getenv("PERSISTENCE_WORKERS", "2"))
+# Maximum number of turns written in one transaction
+PERSISTENCE_BATCH_SIZE = int(os.getenv("PERSISTENCE_BATCH_SIZE", "32"))
+# Seconds a worker waits for more turns before writing a partial batch
+PERSISTENCE_FLUSH_INTERVAL = float(os.getenv("PERSISTENCE_FLUSH_INTERVAL", "0.05"))
+# Maximum number of queued turns, turns are written inline when the queue is full
+PERSISTENCE_MAX_QUEUE_SIZE = int(os.getenv("PERSISTENCE_MAX_QUEUE_SIZE", "1000"))
+# Seconds to wait for queued turns to be written on shutdown
+PERSISTENCE_SHUTDOWN_TIMEOUT = float(os.getenv("PERSISTENCE_SHUTDOWN_TIMEOUT", "30"))
+
+# A write adds a turn to the session, the queue commits once per batch
+TurnWrite = Callable[[Session], None]
+
+_STOP = object()
+
+
+class PersistenceQueue:
+    """
+    In-process queue with a pool of worker threads writing chat turns in batches.
+
+    If a batch fails, its turns are retried one transaction each, so one bad turn
+    doesn't lose the others.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], ContextManager[Session]
+        ] = default_session_factory,
+        workers: int = PERSISTENCE_WORKERS,
+        batch_size: int = PERSISTENCE_BATCH_SIZE,
+        flush_interval: float = PERSISTENCE_FLUSH_INTERVAL,
+        max_queue_size: int = PERSISTENCE_MAX_QUEUE_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return len(self._threads) > 0
+
+    def start(
+        self, session_factory: Callable[[], ContextManager[Session]] | None = None
+    ) -> None:
+        """
+        Start the worker threads, if they aren't running.
+
+        Args:
+            session_factory (Callable[[], ContextManager[Session]] | None): Factory of the
+                sessions turns are written with, the one given at construction if None.
+        """
+        with self._lock:
+            if self.is_running:
+                return
+
+            if session_factory is not None:
+                self.session_factory = session_factory
+            self._threads = [
+                threading.Thread(
+                    target=self._run, name=f"persistence-worker-{i}", daemon=True
+                )
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: float = PERSISTENCE_SHUTDOWN_TIMEOUT) -> bool:
+        """
+        Stop accepting turns, write the queued ones and stop the workers.
+
+        Args:
+            timeout (float): Seconds to wait for the queued turns to be written.
+
+        Returns:
+            bool: Whether every queued turn was written before the timeout.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+
+        # Sentinels are queued behind pending turns, so the queue is drained first
+        for _ in threads:
+            self._queue.put(_STOP)
+
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+        pending = self._queue.qsize()
+        if pending:
+            logger.error(f"Persistence queue stopped with {pending} unwritten turns")
+        return pending == 0 and not any(thread.is_alive() for thread in threads)
+
+    def submit(self, write: TurnWrite) -> bool:
+        """
+        Queue a turn to be written in the background.
+
+        Args:
+            write (TurnWrite): Adds the turn to a session, without committing.
+
+        Returns:
+            bool: Whether the turn was queued, if not the caller must write it.
+        """
+        # Under the lock, so no turn is queued behind the stop sentinels
+        with self._lock:
+            if not self.is_running:
+                return False
+
+            try:
+                self._queue.put_nowait(write)
+            except queue.Full:
+                metrics.increment("persistence.queue_full")
+                return False
+
+        metrics.set_gauge("persistence.queue_depth", self._queue.qsize())
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until every queued turn is written.
+
+        Args:
+            timeout (float | None): Seconds to wait, None waits forever.
+
+        Returns:
+            bool: Whether the queue was drained before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            metrics.set_gauge("persistence.queue_depth", self._queue.qsize())
+            if stop:
+                return
+
+    def _next_batch(self) -> tuple[list[TurnWrite], bool]:
+        # Block for the first turn, then wait up to flush_interval to fill the batch
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _write_batch(self, batch: list[TurnWrite]) -> None:
+        start = time.perf_counter()
+        try:
+            with self.session_factory() as session:
+                for write in batch:
+                    write(session)
+                session.commit()
+            metrics.increment("persistence.turns_written", len(batch))
+        except Exception as e:
+            logger.error(f"Failed to write batch of {len(batch)} turns, retrying: {e}")
+            for write in batch:
+                self._write_one(write)
+
+        metrics.observe("persistence.flush_seconds", time.perf_counter() - start)
+        metrics.observe("persistence.batch_size", len(batch))
+
+    def _write_one(self, write: TurnWrite) -> None:
+        try:
+            with self.session_factory() as session:
+                write(session)
+                session.commit()
+            metrics.increment("persistence.turns_written")
+        except Exception as e:
+            logger.error(f"Failed to write turn: {e}")
+            metrics.increment("persistence.turns_failed")
+
+
+persistence_queue = PersistenceQueue()
+
+
+def start_persistence_queue(
+    session_factory: Callable[[], ContextManager[Session]] | None = None
+) -> None:
+    """
+    Start the persistence queue if USE_PERSISTENCE_QUEUE is set.
+
+    Args:
+        session_factory (Callable[[], ContextManager[Session]] | None): Factory of the
+            sessions turns are written with, pass the app's so queued writes use the
+            same database as inline ones.
+    """
+    if USE_PERSISTENCE_QUEUE:
+        persistence_queue.start(session_factory)
+
+
+def stop_persistence_queue() -> None:
+    persistence_queue.stop()
@@ -0,0 +1,22 @@
+from backend.chat.custom.custom import CustomChat
+from backend.config.tools import ToolName
+from backend.tools.retrieval.conversation_index import ConversationFilesRetriever
+
+
+def test_get_retrievers_searches_files_together() -> None:
+    retrievers = CustomChat().get_retrievers(
+        ["data/a.pdf", "data/b.pdf"],
+        [ToolName.File_Upload_Langchain],
+        "conversation",
+    )
+
+    assert len(retrievers) == 1
+    assert isinstance(retrievers[0], ConversationFilesRetriever)
+    assert retrievers[0].file_paths == ["data/a.pdf", "data/b.pdf"]
+    assert retrievers[0].key == "conversation"
+
+
+def test_get_retrievers_without_files() -> None:
+    retrievers = CustomChat().get_retrievers([], [ToolName.File_Upload_Langchain])
+
+    assert retrievers == []
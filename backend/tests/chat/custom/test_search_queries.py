@@ -0,0 +1,73 @@
+from typing import Any
+
+from backend.chat.custom.search_queries import (
+    get_search_query_cache_key,
+    invoke_search_queries_cached,
+)
+from backend.services.cache import MemoryCache
+from backend.services.metrics import metrics
+
+
+class CountingDeployment:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_search_queries(
+        self, message: str, chat_history: Any = None, **kwargs: Any
+    ) -> list[str]:
+        self.calls += 1
+        return [message.lower()]
+
+
+def test_invoke_search_queries_cached_calls_deployment_once() -> None:
+    metrics.reset()
+    deployment = CountingDeployment()
+    cache = MemoryCache()
+    history = [{"role": "User", "message": "Hi"}]
+
+    for _ in range(2):
+        queries = invoke_search_queries_cached(
+            deployment, "Who is Ada?", history, "Cohere Platform", "command-r", cache
+        )
+
+    assert queries == ["who is ada?"]
+    assert deployment.calls == 1
+    counters = metrics.snapshot()["counters"]
+    assert counters["search_query_cache.hits"] == 1
+    assert counters["search_query_cache.misses"] == 1
+
+
+def test_invoke_search_queries_cached_caches_empty_queries() -> None:
+    deployment = CountingDeployment()
+    deployment.invoke_search_queries = lambda *args, **kwargs: []
+    cache = MemoryCache()
+
+    invoke_search_queries_cached(deployment, "Hello", cache=cache)
+
+    assert invoke_search_queries_cached(deployment, "Hello", cache=cache) == []
+
+
+def test_invoke_search_queries_cached_disabled() -> None:
+    deployment = CountingDeployment()
+    cache = MemoryCache()
+
+    for _ in range(2):
+        invoke_search_queries_cached(deployment, "Hello", cache=cache, ttl=0)
+
+    assert deployment.calls == 2
+
+
+def test_cache_key_depends_on_recent_history_only() -> None:
+    history = [{"role": "User", "message": str(i)} for i in range(10)]
+    key = get_search_query_cache_key("Cohere Platform", None, "Hello", history, 2)
+
+    assert key == get_search_query_cache_key(
+        "Cohere Platform", None, "Hello", history[-2:], 2
+    )
+    assert key != get_search_query_cache_key(
+        "Cohere Platform", None, "Hello", history[:-1], 2
+    )
+    assert key != get_search_query_cache_key("SageMaker", None, "Hello", history, 2)
+    assert key != get_search_query_cache_key(
+        "Cohere Platform", "command-r", "Hello", history, 2
+    )
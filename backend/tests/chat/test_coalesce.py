@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any
+
+from backend.chat.coalesce import coalesce_text_generation, get_coalesced_stream
+
+
+def text(value: str) -> dict[str, Any]:
+    return {"event_type": "text-generation", "text": value, "is_finished": False}
+
+
+async def stream_events(events: list[Any]):
+    for event in events:
+        if isinstance(event, float):
+            # Pause the upstream stream
+            await asyncio.sleep(event)
+            continue
+        yield event
+
+
+def collect(stream) -> list[dict[str, Any]]:
+    async def run():
+        return [event async for event in stream]
+
+    return asyncio.run(run())
+
+
+def test_coalescing_disabled_returns_stream() -> None:
+    stream = stream_events([text("a")])
+
+    assert get_coalesced_stream(stream, 0) is stream
+
+
+def test_merges_text_within_window() -> None:
+    events = [text("Hello"), text(" "), text("world")]
+
+    result = collect(get_coalesced_stream(stream_events(events), 1000, 1024))
+
+    assert result == [text("Hello world")]
+
+
+def test_flushes_when_window_ends_without_new_events() -> None:
+    events = [text("a"), text("b"), 0.2, text("c")]
+
+    result = collect(coalesce_text_generation(stream_events(events), 0.02, 1024))
+
+    assert result == [text("ab"), text("c")]
+
+
+def test_flushes_at_max_bytes() -> None:
+    events = [text("aa"), text("bb"), text("cc"), text("d")]
+
+    result = collect(coalesce_text_generation(stream_events(events), 10, 4))
+
+    assert result == [text("aabb"), text("ccd")]
+
+
+def test_other_events_flush_immediately() -> None:
+    citation = {"event_type": "citation-generation", "citations": []}
+    stream_end = {"event_type": "stream-end", "finish_reason": "COMPLETE"}
+    events = [text("a"), text("b"), citation, text("c"), stream_end]
+
+    result = collect(coalesce_text_generation(stream_events(events), 10, 1024))
+
+    assert result == [text("ab"), citation, text("c"), stream_end]
@@ -0,0 +1,59 @@
+import pytest
+from sse_starlette.sse import ensure_bytes
+
+from backend.chat.sse_encoder import (
+    SSE_SEPARATOR,
+    encode_chat_response_event,
+    encode_citation_generation,
+    encode_text_generation,
+)
+from backend.models.citation import Citation
+from backend.schemas.chat import StreamCitationGeneration, StreamTextGeneration
+
+TEXTS = [
+    "",
+    "Hello world",
+    ' quotes " and \\ backslashes',
+    "new\nlines\r\tand \x00 control \x1f chars",
+    "accents é and emoji 🚀 and \u2028 separators",
+    "</script>",
+]
+
+
+def sse_frame(stream_event) -> bytes:
+    return ensure_bytes(encode_chat_response_event(stream_event), SSE_SEPARATOR)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("is_finished", [True, False])
+def test_encode_text_generation_matches_generic_path(
+    text: str, is_finished: bool
+) -> None:
+    event = StreamTextGeneration(text=text, is_finished=is_finished)
+
+    assert encode_text_generation(text, is_finished) == sse_frame(event)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_encode_citation_generation_matches_generic_path(text: str) -> None:
+    citations = [
+        Citation(text=text, start=0, end=12, document_ids=["doc_0", text]),
+        Citation(text="b", start=3, end=4, document_ids=[]),
+    ]
+    event = StreamCitationGeneration(citations=citations, is_finished=False)
+
+    assert encode_citation_generation(citations, False) == sse_frame(event)
+    assert encode_citation_generation([], False) == sse_frame(
+        StreamCitationGeneration(citations=[], is_finished=False)
+    )
+
+
+def test_encode_falls_back_when_validation_is_needed() -> None:
+    assert encode_text_generation("hi", None) is None
+    assert encode_text_generation(None, False) is None
+    assert (
+        encode_citation_generation(
+            [Citation(text="a", start="0", end=1, document_ids=[])], False
+        )
+        is None
+    )
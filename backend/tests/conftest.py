@@ -1,5 +1,15 @@
+import asyncio
 import os
-from typing import Any, Generator
+from contextlib import nullcontext
+from typing import (
+    Any,
+    AsyncContextManager,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Generator,
+    TypeVar,
+)
 from unittest.mock import patch
 
 import pytest
@@ -7,18 +17,32 @@ from alembic.command import upgrade
 from alembic.config import Config
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
 from backend.chat.custom.model_deployments.base import BaseDeployment
 from backend.config.deployments import AVAILABLE_MODEL_DEPLOYMENTS, ModelDeploymentName
 from backend.main import app, create_app
-from backend.models import get_session
+from backend.models import (
+    ThreadpoolSession,
+    get_async_session,
+    get_async_session_factory,
+    get_session,
+    get_session_factory,
+)
+from backend.models.database import (
+    POOL_PROFILES,
+    get_async_database_url,
+    get_engine_options,
+)
 from backend.schemas.deployment import Deployment
 from backend.schemas.user import User
 from backend.tests.factories import get_factory
 
 DATABASE_URL = os.environ["DATABASE_URL"]
 
+T = TypeVar("T")
+
 
 @pytest.fixture
 def client():
@@ -61,6 +85,49 @@ def session(engine: Any) -> Generator[Session, None, None]:
     connection.close()
 
 
+@pytest.fixture(scope="function", params=POOL_PROFILES)
+def run_in_async_session(
+    request: pytest.FixtureRequest,
+) -> Callable[[Callable[[AsyncSession], Awaitable[T]]], T]:
+    """
+    Runs a test coroutine with a real AsyncSession on asyncpg, within a
+    transaction that is rolled back afterwards, once per pool profile
+
+    asyncpg connections belong to the event loop that opened them, so the
+    engine, the session and the test all run in one asyncio.run call
+    """
+    pytest.importorskip("asyncpg")
+    # Run Alembic migrations
+    alembic_cfg = Config("src/backend/alembic.ini")
+    upgrade(alembic_cfg, "head")
+
+    async def run_test(test: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        engine = create_async_engine(
+            get_async_database_url(DATABASE_URL),
+            **get_engine_options(request.param, is_async=True),
+        )
+        try:
+            async with engine.connect() as connection:
+                # Begin the nested transaction
+                transaction = await connection.begin()
+                # Commits in the test release a savepoint of the transaction
+                session = AsyncSession(
+                    bind=connection,
+                    expire_on_commit=False,
+                    join_transaction_mode="create_savepoint",
+                )
+                try:
+                    return await test(session)
+                finally:
+                    await session.close()
+                    # Roll back the transaction
+                    await transaction.rollback()
+        finally:
+            await engine.dispose()
+
+    return lambda test: asyncio.run(run_test(test))
+
+
 @pytest.fixture(scope="function")
 def session_client(session: Session) -> Generator[TestClient, None, None]:
     """
@@ -70,8 +137,24 @@ def session_client(session: Session) -> Generator[TestClient, None, None]:
     def override_get_session() -> Generator[Session, Any, None]:
         yield session
 
+    def override_get_session_factory() -> Callable[[], ContextManager[Session]]:
+        return lambda: nullcontext(session)
+
+    def override_get_async_session() -> ThreadpoolSession:
+        return ThreadpoolSession(session)
+
+    def override_get_async_session_factory() -> (
+        Callable[[], AsyncContextManager[ThreadpoolSession]]
+    ):
+        return lambda: nullcontext(ThreadpoolSession(session))
+
     app = create_app()
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    app.dependency_overrides[get_async_session_factory] = (
+        override_get_async_session_factory
+    )
 
     print("Session at fixture " + str(session))
 
@@ -133,8 +216,24 @@ def session_client_chat(session_chat: Session) -> Generator[TestClient, None, No
     def override_get_session() -> Generator[Session, Any, None]:
         yield session_chat
 
+    def override_get_session_factory() -> Callable[[], ContextManager[Session]]:
+        return lambda: nullcontext(session_chat)
+
+    def override_get_async_session() -> ThreadpoolSession:
+        return ThreadpoolSession(session_chat)
+
+    def override_get_async_session_factory() -> (
+        Callable[[], AsyncContextManager[ThreadpoolSession]]
+    ):
+        return lambda: nullcontext(ThreadpoolSession(session_chat))
+
     app = create_app()
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    app.dependency_overrides[get_async_session_factory] = (
+        override_get_async_session_factory
+    )
 
     print("Session at fixture " + str(session_chat))
 
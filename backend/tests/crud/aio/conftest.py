@@ -0,0 +1,12 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.models import ThreadpoolSession
+
+
+@pytest.fixture
+def async_session(session: Session) -> ThreadpoolSession:
+    """
+    Async interface over the test session, so writes are rolled back with it
+    """
+    return ThreadpoolSession(session)
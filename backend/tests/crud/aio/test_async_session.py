@@ -0,0 +1,170 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.crud.aio import conversation as conversation_crud
+from backend.crud.aio import file as file_crud
+from backend.crud.aio import message as message_crud
+from backend.models.conversation import Conversation
+from backend.models.file import File
+from backend.models.message import Message
+from backend.models.user import User
+from backend.schemas.conversation import Conversation as ConversationSchema
+from backend.schemas.message import Message as MessageSchema
+
+# These tests run on asyncpg, see run_in_async_session. Unlike ThreadpoolSession,
+# a real AsyncSession raises MissingGreenlet on a lazy load.
+
+
+async def create_conversation(session: AsyncSession) -> Conversation:
+    session.add(User(id="1", fullname="John Doe"))
+    return await conversation_crud.create_conversation(
+        session, Conversation(id="1", user_id="1", title="Hello, World!")
+    )
+
+
+async def create_file(session: AsyncSession, file_name: str) -> File:
+    return await file_crud.create_file(
+        session,
+        File(
+            conversation_id="1",
+            user_id="1",
+            file_name=file_name,
+            file_path=f"/tmp/{file_name}",
+        ),
+    )
+
+
+def test_get_conversation_with_detail_options(run_in_async_session):
+    async def get_conversation(session: AsyncSession) -> ConversationSchema:
+        await create_conversation(session)
+        await message_crud.create_message(
+            session,
+            Message(
+                conversation_id="1", user_id="1", text="Hello", position=0, agent="USER"
+            ),
+        )
+        await create_file(session, "a.txt")
+        # Load everything again from the database
+        session.expunge_all()
+
+        conversation = await conversation_crud.get_conversation(
+            session, "1", "1", options=conversation_crud.CONVERSATION_DETAIL_OPTIONS
+        )
+        return ConversationSchema.model_validate(conversation)
+
+    conversation = run_in_async_session(get_conversation)
+
+    assert conversation.title == "Hello, World!"
+    assert [message.text for message in conversation.messages] == ["Hello"]
+    assert [file.file_name for file in conversation.files] == ["a.txt"]
+
+
+def test_get_conversation_without_options_does_not_lazy_load(run_in_async_session):
+    async def get_conversation(session: AsyncSession) -> None:
+        await create_conversation(session)
+        session.expunge_all()
+
+        conversation = await conversation_crud.get_conversation(session, "1", "1")
+        with pytest.raises(ValidationError, match="MissingGreenlet"):
+            ConversationSchema.model_validate(conversation)
+
+    run_in_async_session(get_conversation)
+
+
+def test_list_conversations_after(run_in_async_session):
+    async def list_conversations(session: AsyncSession) -> list[str]:
+        await create_conversation(session)
+        await conversation_crud.insert_conversation(
+            session, Conversation(id="2", user_id="1", title="Second")
+        )
+        await session.commit()
+
+        conversations = await conversation_crud.get_conversations_after(
+            session, "1", options=conversation_crud.CONVERSATION_LIST_OPTIONS
+        )
+        return [conversation.id for conversation in conversations]
+
+    assert sorted(run_in_async_session(list_conversations)) == ["1", "2"]
+
+
+def test_insert_message_and_list_with_detail_options(run_in_async_session):
+    async def list_messages(session: AsyncSession) -> list[MessageSchema]:
+        await create_conversation(session)
+        for position, text in enumerate(["Hello", "Hi"]):
+            await message_crud.insert_message(
+                session,
+                Message(
+                    conversation_id="1",
+                    user_id="1",
+                    text=text,
+                    position=position,
+                    agent="USER",
+                ),
+            )
+        await session.commit()
+        session.expunge_all()
+
+        messages = await message_crud.get_messages_by_conversation_id(
+            session, "1", "1", options=message_crud.MESSAGE_DETAIL_OPTIONS
+        )
+        return [MessageSchema.model_validate(message) for message in messages]
+
+    messages = run_in_async_session(list_messages)
+
+    assert [message.text for message in messages] == ["Hello", "Hi"]
+
+
+def test_get_active_messages_before_position(run_in_async_session):
+    async def get_messages(session: AsyncSession) -> tuple[int | None, list[str]]:
+        await create_conversation(session)
+        for position in range(3):
+            await message_crud.insert_message(
+                session,
+                Message(
+                    conversation_id="1",
+                    user_id="1",
+                    text=f"Message {position}",
+                    position=position,
+                    agent="USER",
+                    is_active=True,
+                ),
+            )
+
+        max_position = await message_crud.get_max_active_position(session, "1")
+        messages = await message_crud.get_active_messages_before_position(
+            session, "1", 2
+        )
+        return max_position, [message.text for message in messages]
+
+    assert run_in_async_session(get_messages) == (2, ["Message 0", "Message 1"])
+
+
+def test_attach_files_to_message(run_in_async_session):
+    async def attach_files(session: AsyncSession) -> tuple[str, list[str], list[str]]:
+        await create_conversation(session)
+        message = await message_crud.create_message(
+            session,
+            Message(
+                conversation_id="1", user_id="1", text="Hello", position=0, agent="USER"
+            ),
+        )
+        files = [await create_file(session, f"{i}.txt") for i in range(3)]
+        file_ids = [file.id for file in files[:2]]
+
+        await file_crud.attach_files_to_message(session, file_ids, "1", message.id)
+        await session.commit()
+        session.expunge_all()
+
+        attached = await file_crud.get_files_by_ids(session, file_ids, "1")
+        listed = await file_crud.get_files_by_conversation_id_after(session, "1", "1")
+        return (
+            message.id,
+            [file.message_id for file in attached],
+            [file.file_name for file in listed],
+        )
+
+    message_id, message_ids, file_names = run_in_async_session(attach_files)
+
+    assert message_ids == [message_id, message_id]
+    assert sorted(file_names) == ["0.txt", "1.txt", "2.txt"]
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from sqlalchemy.orm import selectinload
+
+from backend.crud.aio import citation as citation_crud
+from backend.crud.aio import document as document_crud
+from backend.models.citation import Citation
+from backend.models.document import Document
+from backend.tests.factories import get_factory
+
+
+@pytest.fixture(autouse=True)
+def message(session, user):
+    get_factory("Conversation", session).create(id="1", user_id=user.id)
+    return get_factory("Message", session).create(
+        id="1", conversation_id="1", user_id=user.id
+    )
+
+
+def test_insert_citations_with_documents(session, async_session, user):
+    document = Document(
+        conversation_id="1",
+        message_id="1",
+        user_id=user.id,
+        text="Document",
+        document_id="doc_0",
+    )
+    citation = Citation(
+        message_id="1",
+        user_id=user.id,
+        text="Citation",
+        start=0,
+        end=1,
+        document_ids=["doc_0"],
+        documents=[document],
+    )
+
+    asyncio.run(document_crud.insert_documents(async_session, [document]))
+    asyncio.run(citation_crud.insert_citations(async_session, [citation]))
+    session.expire_all()
+
+    citations = asyncio.run(
+        citation_crud.get_citations_by_message_id(
+            async_session, "1", options=[selectinload(Citation.documents)]
+        )
+    )
+    assert [document.document_id for document in citations[0].documents] == ["doc_0"]
+    assert asyncio.run(document_crud.get_document(async_session, document.id))
+
+
+def test_delete_citation(session, async_session, user):
+    citation = get_factory("Citation", session).create(message_id="1", user_id=user.id)
+
+    asyncio.run(citation_crud.delete_citation(async_session, citation.id))
+
+    assert asyncio.run(citation_crud.get_citation(async_session, citation.id)) is None
@@ -0,0 +1,91 @@
+import asyncio
+
+from sqlalchemy import inspect
+
+from backend.crud.aio import conversation as conversation_crud
+from backend.models.conversation import Conversation
+from backend.schemas.conversation import UpdateConversation
+from backend.tests.factories import get_factory
+
+
+def test_create_conversation(async_session, user):
+    conversation = asyncio.run(
+        conversation_crud.create_conversation(
+            async_session, Conversation(user_id=user.id, title="Hello, World!")
+        )
+    )
+
+    conversation = asyncio.run(
+        conversation_crud.get_conversation(async_session, conversation.id, user.id)
+    )
+    assert conversation.title == "Hello, World!"
+
+
+def test_get_conversation(session, async_session, user):
+    _ = get_factory("Conversation", session).create(
+        id="1", title="Hello, World!", user_id=user.id
+    )
+
+    conversation = asyncio.run(
+        conversation_crud.get_conversation(async_session, "1", user.id)
+    )
+    assert conversation.title == "Hello, World!"
+
+
+def test_fail_get_nonexistent_conversation(async_session, user):
+    conversation = asyncio.run(
+        conversation_crud.get_conversation(async_session, "123", user.id)
+    )
+    assert conversation is None
+
+
+def test_get_conversation_with_detail_options(session, async_session, user):
+    _ = get_factory("Conversation", session).create(id="1", user_id=user.id)
+    session.expire_all()
+
+    conversation = asyncio.run(
+        conversation_crud.get_conversation(
+            async_session,
+            "1",
+            user.id,
+            options=conversation_crud.CONVERSATION_DETAIL_OPTIONS,
+        )
+    )
+    assert inspect(conversation).unloaded.isdisjoint({"text_messages", "files"})
+
+
+def test_list_conversations_with_pagination(session, async_session, user):
+    for i in range(10):
+        get_factory("Conversation", session).create(
+            title=f"Conversation {i}", user_id=user.id
+        )
+
+    conversations = asyncio.run(
+        conversation_crud.get_conversations(
+            async_session, user_id=user.id, offset=5, limit=5
+        )
+    )
+    assert [conversation.title for conversation in conversations] == [
+        f"Conversation {i}" for i in range(5, 10)
+    ]
+
+
+def test_update_conversation(session, async_session, user):
+    conversation = get_factory("Conversation", session).create(
+        title="Hello, World!", user_id=user.id
+    )
+
+    conversation = asyncio.run(
+        conversation_crud.update_conversation(
+            async_session, conversation, UpdateConversation(title="New title")
+        )
+    )
+    assert conversation.title == "New title"
+
+
+def test_delete_conversation(session, async_session, user):
+    _ = get_factory("Conversation", session).create(id="1", user_id=user.id)
+
+    asyncio.run(conversation_crud.delete_conversation(async_session, "1", user.id))
+
+    assert session.get(Conversation, "1") is None
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from backend.crud.aio import file as file_crud
+from backend.schemas.file import UpdateFile
+from backend.tests.factories import get_factory
+
+
+@pytest.fixture(autouse=True)
+def conversation(session, user):
+    return get_factory("Conversation", session).create(id="1", user_id=user.id)
+
+
+def test_get_files_by_ids(session, async_session, user):
+    files = [
+        get_factory("File", session).create(conversation_id="1", user_id=user.id)
+        for _ in range(3)
+    ]
+
+    result = asyncio.run(
+        file_crud.get_files_by_ids(
+            async_session, [file.id for file in files[:2]], user.id
+        )
+    )
+    assert {file.id for file in result} == {file.id for file in files[:2]}
+
+
+def test_update_file(session, async_session, user):
+    file = get_factory("File", session).create(
+        file_name="test.txt", conversation_id="1", user_id=user.id
+    )
+
+    file = asyncio.run(
+        file_crud.update_file(async_session, file, UpdateFile(file_name="new.txt"))
+    )
+    assert file.file_name == "new.txt"
+
+
+def test_attach_files_to_message(session, async_session, user):
+    message = get_factory("Message", session).create(
+        conversation_id="1", user_id=user.id
+    )
+    file = get_factory("File", session).create(
+        conversation_id="1", user_id=user.id, message_id=None
+    )
+
+    asyncio.run(
+        file_crud.attach_files_to_message(async_session, [file.id], user.id, message.id)
+    )
+
+    session.refresh(file)
+    assert file.message_id == message.id
+
+
+def test_delete_file(session, async_session, user):
+    file = get_factory("File", session).create(conversation_id="1", user_id=user.id)
+
+    asyncio.run(file_crud.delete_file(async_session, file.id, user.id))
+
+    assert asyncio.run(file_crud.get_file(async_session, file.id, user.id)) is None
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from backend.crud.aio import message as message_crud
+from backend.models.message import Message
+from backend.tests.factories import get_factory
+
+
+@pytest.fixture(autouse=True)
+def conversation(session, user):
+    return get_factory("Conversation", session).create(id="1", user_id=user.id)
+
+
+def test_insert_message(session, async_session, user):
+    message = Message(
+        conversation_id="1",
+        user_id=user.id,
+        text="Hello, World!",
+        position=0,
+        agent="USER",
+    )
+
+    asyncio.run(message_crud.insert_message(async_session, message))
+
+    message = asyncio.run(message_crud.get_message(async_session, message.id, user.id))
+    assert message.text == "Hello, World!"
+
+
+def test_get_max_active_position(session, async_session, user):
+    for position in range(3):
+        get_factory("Message", session).create(
+            conversation_id="1", user_id=user.id, position=position, is_active=True
+        )
+
+    position = asyncio.run(message_crud.get_max_active_position(async_session, "1"))
+    assert position == 2
+
+
+def test_get_active_messages_before_position(session, async_session, user):
+    for position in range(3):
+        get_factory("Message", session).create(
+            text=f"{position}",
+            conversation_id="1",
+            user_id=user.id,
+            position=position,
+            is_active=True,
+        )
+
+    messages = asyncio.run(
+        message_crud.get_active_messages_before_position(async_session, "1", 2)
+    )
+    assert [message.text for message in messages] == ["0", "1"]
+
+
+def test_get_messages_with_detail_options(session, async_session, user):
+    message = get_factory("Message", session).create(
+        conversation_id="1", user_id=user.id
+    )
+    get_factory("Document", session).create(
+        conversation_id="1", message_id=message.id, user_id=user.id
+    )
+    session.expire_all()
+
+    messages = asyncio.run(
+        message_crud.get_messages_by_conversation_id(
+            async_session, "1", user.id, options=message_crud.MESSAGE_DETAIL_OPTIONS
+        )
+    )
+    assert len(messages[0].documents) == 1
+
+
+def test_delete_message(session, async_session, user):
+    message = get_factory("Message", session).create(
+        conversation_id="1", user_id=user.id
+    )
+
+    asyncio.run(message_crud.delete_message(async_session, message.id, user.id))
+
+    assert asyncio.run(message_crud.get_messages(async_session, user.id)) == []
@@ -1,7 +1,9 @@
 import pytest
 
 from backend.crud import citation as citation_crud
+from backend.crud import document as document_crud
 from backend.models.citation import Citation
+from backend.models.document import Document
 from backend.tests.factories import get_factory
 
 
@@ -124,3 +126,39 @@ def test_delete_citation(session):
 def test_delete_citation_nonexistent(session):
     citation = citation_crud.delete_citation(session, "1")
     assert citation is None
+
+
+def test_insert_citations(session, document):
+    new_document = Document(
+        text="Hello", user_id="1", conversation_id="1", message_id="1", document_id="2"
+    )
+    document_crud.insert_documents(session, [new_document])
+    citations_data = [
+        Citation(
+            text="Hello",
+            user_id="1",
+            start=1,
+            end=2,
+            message_id="1",
+            document_ids=["1", "2"],
+            documents=[document, new_document],
+        ),
+        Citation(
+            text="World",
+            user_id="1",
+            start=3,
+            end=4,
+            message_id="1",
+            document_ids=[],
+        ),
+    ]
+
+    citation_crud.insert_citations(session, citations_data)
+    session.commit()
+
+    citations = citation_crud.get_citations_by_message_id(session, "1")
+    assert sorted(citation.text for citation in citations) == ["Hello", "World"]
+    citation = citation_crud.get_citation(session, citations_data[0].id)
+    assert sorted(document.id for document in citation.documents) == sorted(
+        ["1", new_document.id]
+    )
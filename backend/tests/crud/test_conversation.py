@@ -1,9 +1,13 @@
+import datetime
+
+from sqlalchemy import inspect
+
 from backend.crud import citation as citation_crud
 from backend.crud import conversation as conversation_crud
 from backend.crud import document as document_crud
 from backend.crud import message as message_crud
 from backend.models.conversation import Conversation
-from backend.schemas.conversation import UpdateConversation
+from backend.schemas.conversation import ConversationWithoutMessages, UpdateConversation
 from backend.tests.factories import get_factory
 
 
@@ -132,3 +136,112 @@ def test_delete_conversation_cascade(session, user):
 
     document = document_crud.get_document(session, document_id)
     assert document is None
+
+
+def test_insert_conversation(session, user):
+    conversation_data = Conversation(user_id=user.id, description="This is a test")
+
+    conversation_crud.insert_conversation(session, conversation_data)
+    session.commit()
+
+    conversation = conversation_crud.get_conversation(
+        session, conversation_data.id, user.id
+    )
+    assert conversation.description == conversation_data.description
+    assert conversation.title == "New Conversation"
+
+
+def test_update_conversation_description(session, user):
+    conversation = get_factory("Conversation", session).create(
+        id="1", description="Old", user_id=user.id
+    )
+
+    conversation_crud.update_conversation_description(session, "1", user.id, "New")
+    session.commit()
+
+    conversation = conversation_crud.get_conversation(session, "1", user.id)
+    assert conversation.description == "New"
+
+
+def test_update_conversation_description_wrong_user(session, user):
+    _ = get_factory("Conversation", session).create(
+        id="1", description="Old", user_id=user.id
+    )
+
+    conversation_crud.update_conversation_description(session, "1", "123", "New")
+    session.commit()
+
+    conversation = conversation_crud.get_conversation(session, "1", user.id)
+    assert conversation.description == "Old"
+
+
+def test_conversation_messages_are_ordered_by_position(session, user):
+    conversation = get_factory("Conversation", session).create(id="1", user_id=user.id)
+    for position in [2, 0, 1]:
+        _ = get_factory("Message", session).create(
+            conversation_id="1", user_id=user.id, position=position
+        )
+    session.expire(conversation)
+
+    conversation = conversation_crud.get_conversation(session, "1", user.id)
+
+    assert [message.position for message in conversation.messages] == [0, 1, 2]
+
+
+def test_get_conversation_with_detail_options(session, user):
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+    message = get_factory("Message", session).create(
+        conversation_id=conversation.id, user_id=user.id, position=0
+    )
+    session.expire_all()
+
+    conversation = conversation_crud.get_conversation(
+        session,
+        conversation.id,
+        user.id,
+        options=conversation_crud.CONVERSATION_DETAIL_OPTIONS,
+    )
+
+    unloaded = inspect(conversation).unloaded
+    assert "text_messages" not in unloaded
+    assert "files" not in unloaded
+    assert conversation.messages[0].id == message.id
+    assert inspect(conversation.messages[0]).unloaded.isdisjoint(
+        {"documents", "citations", "files"}
+    )
+
+
+def test_list_conversations_with_list_options(session, user):
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+    get_factory("Message", session).create(
+        conversation_id=conversation.id, user_id=user.id, position=0
+    )
+    session.expire_all()
+
+    conversations = conversation_crud.get_conversations(
+        session, user_id=user.id, options=conversation_crud.CONVERSATION_LIST_OPTIONS
+    )
+    ConversationWithoutMessages.model_validate(conversations[0])
+
+    unloaded = inspect(conversations[0]).unloaded
+    assert "files" not in unloaded
+    assert "text_messages" in unloaded
+
+
+def test_list_conversations_after(session, user):
+    updated_at = datetime.datetime(2024, 1, 1)
+    for i in range(5):
+        get_factory("Conversation", session).create(
+            id=f"{i}", user_id=user.id, updated_at=updated_at
+        )
+    get_factory("Conversation", session).create(
+        id="latest", user_id=user.id, updated_at=updated_at + datetime.timedelta(1)
+    )
+
+    conversations = conversation_crud.get_conversations_after(session, user.id, limit=3)
+    assert [conversation.id for conversation in conversations] == ["latest", "4", "3"]
+
+    conversations = conversation_crud.get_conversations_after(
+        session, user.id, after=(updated_at, "3"), limit=3
+    )
+    assert [conversation.id for conversation in conversations] == ["2", "1", "0"]
@@ -97,3 +97,25 @@ def test_delete_document(session):
 
     document = document_crud.get_document(session, document.id)
     assert document is None
+
+
+def test_insert_documents(session):
+    documents_data = [
+        Document(
+            text=f"Document {i}",
+            user_id="1",
+            conversation_id="1",
+            document_id=f"doc_{i}",
+            message_id="1",
+        )
+        for i in range(3)
+    ]
+
+    document_crud.insert_documents(session, documents_data)
+    session.commit()
+
+    for document_data in documents_data:
+        document = document_crud.get_document(session, document_data.id)
+        assert document.text == document_data.text
+        assert document.document_id == document_data.document_id
+        assert document.message_id == "1"
@@ -1,3 +1,5 @@
+import datetime
+
 import pytest
 
 from backend.crud import file as file_crud
@@ -65,6 +67,26 @@ def test_list_files_empty(session, user):
     assert len(files) == 0
 
 
+def test_list_files_by_conversation_id_after(session, user):
+    created_at = datetime.datetime(2024, 1, 1)
+    for i in range(5):
+        _ = get_factory("File", session).create(
+            id=f"{i}",
+            file_name=f"test.txt {i}",
+            conversation_id="1",
+            user_id=user.id,
+            created_at=created_at,
+        )
+
+    files = file_crud.get_files_by_conversation_id_after(session, "1", user.id, limit=2)
+    assert [file.id for file in files] == ["0", "1"]
+
+    files = file_crud.get_files_by_conversation_id_after(
+        session, "1", user.id, after=(created_at, "1")
+    )
+    assert [file.id for file in files] == ["2", "3", "4"]
+
+
 def test_list_files_with_pagination(session, user):
     for i in range(10):
         _ = get_factory("File", session).create(
@@ -121,3 +143,22 @@ def test_delete_file(session, user):
 
     file_crud.delete_file(session, file.id, user.id)
     assert file_crud.get_file(session, file.id, user.id) is None
+
+
+def test_attach_files_to_message(session, user):
+    get_factory("Message", session).create(id="1", conversation_id="1")
+    get_factory("Message", session).create(id="2", conversation_id="1")
+    unattached = get_factory("File", session).create(
+        conversation_id="1", user_id=user.id
+    )
+    attached = get_factory("File", session).create(
+        conversation_id="1", user_id=user.id, message_id="2"
+    )
+
+    file_crud.attach_files_to_message(
+        session, [unattached.id, attached.id], user.id, "1"
+    )
+    session.commit()
+
+    assert file_crud.get_file(session, unattached.id, user.id).message_id == "1"
+    assert file_crud.get_file(session, attached.id, user.id).message_id == "2"
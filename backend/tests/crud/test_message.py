@@ -1,3 +1,5 @@
+import datetime
+
 import pytest
 
 from backend.crud import citation as citation_crud
@@ -79,7 +81,10 @@ def test_list_messages_with_pagination(session, user):
 def test_list_messages_by_conversation_id(session, user):
     for i in range(10):
         _ = get_factory("Message", session).create(
-            text=f"Hello, World! {i}", conversation_id="1", user_id=user.id
+            text=f"Hello, World! {i}",
+            conversation_id="1",
+            user_id=user.id,
+            position=i,
         )
 
     messages = message_crud.get_messages_by_conversation_id(session, "1", user.id)
@@ -95,6 +100,39 @@ def test_list_messages_by_conversation_id_empty(session, user):
     assert len(messages) == 0
 
 
+def test_list_messages_by_conversation_id_after(session, user):
+    created_at = datetime.datetime(2024, 1, 1)
+    for position in range(3):
+        for agent, offset in (("USER", 0), ("CHATBOT", 1)):
+            get_factory("Message", session).create(
+                text=f"{position} {agent}",
+                conversation_id="1",
+                user_id=user.id,
+                position=position,
+                agent=agent,
+                created_at=created_at + datetime.timedelta(seconds=offset),
+            )
+
+    messages = message_crud.get_messages_by_conversation_id_after(
+        session, "1", user.id, limit=3
+    )
+    assert [message.text for message in messages] == [
+        "0 USER",
+        "0 CHATBOT",
+        "1 USER",
+    ]
+
+    last = messages[-1]
+    messages = message_crud.get_messages_by_conversation_id_after(
+        session, "1", user.id, after=(last.position, last.created_at, last.id)
+    )
+    assert [message.text for message in messages] == [
+        "1 CHATBOT",
+        "2 USER",
+        "2 CHATBOT",
+    ]
+
+
 def test_update_message(session, user):
     message = get_factory("Message", session).create(
         text="Hello, World!", conversation_id="1", user_id=user.id
@@ -147,3 +185,59 @@ def test_delete_message_cascade(session, user):
     document = document_crud.get_document(session, document_id)
     assert document is None
     assert document_crud.get_documents(session, user.id) == []
+
+
+def test_insert_message(session, user):
+    message_data = Message(
+        text="Hello, World!",
+        user_id=user.id,
+        conversation_id="1",
+        position=1,
+        agent="USER",
+    )
+
+    message_crud.insert_message(session, message_data)
+    session.commit()
+
+    message = message_crud.get_message(session, message_data.id, user.id)
+    assert message.text == message_data.text
+    assert message.position == message_data.position
+    assert message.agent == message_data.agent
+    assert message.is_active
+    assert message.created_at is not None
+
+
+def test_get_max_active_position(session, user):
+    _ = get_factory("Message", session).create(
+        conversation_id="1", user_id=user.id, position=0, is_active=True
+    )
+    _ = get_factory("Message", session).create(
+        conversation_id="1", user_id=user.id, position=1, is_active=True
+    )
+    _ = get_factory("Message", session).create(
+        conversation_id="1", user_id=user.id, position=2, is_active=False
+    )
+
+    assert message_crud.get_max_active_position(session, "1") == 1
+
+
+def test_get_max_active_position_empty_conversation(session):
+    assert message_crud.get_max_active_position(session, "1") is None
+
+
+def test_get_active_messages_before_position(session, user):
+    for position in [2, 0, 1, 3]:
+        _ = get_factory("Message", session).create(
+            id=str(position),
+            conversation_id="1",
+            user_id=user.id,
+            position=position,
+            is_active=True,
+        )
+    _ = get_factory("Message", session).create(
+        id="inactive", conversation_id="1", user_id=user.id, position=0, is_active=False
+    )
+
+    messages = message_crud.get_active_messages_before_position(session, "1", 3)
+
+    assert [message.id for message in messages] == ["0", "1", "2"]
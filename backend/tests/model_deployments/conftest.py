@@ -20,13 +20,13 @@ def user(session_chat: Session) -> User:
 
 @pytest.fixture()
 def mock_cohere_deployment():
-    with patch("backend.chat.custom.custom.get_deployment") as mock:
+    with patch("backend.chat.custom.custom.acquire_deployment") as mock:
         mock.return_value = MockCohereDeployment()
         yield mock
 
 
 @pytest.fixture()
 def mock_sagemaker_deployment():
-    with patch("backend.chat.custom.custom.get_deployment") as mock:
+    with patch("backend.chat.custom.custom.acquire_deployment") as mock:
         mock.return_value = MockSageMakerDeployment()
         yield mock
@@ -1,4 +1,6 @@
+import io
 import json
+import time
 from typing import Any, Dict, Generator, List
 
 from cohere.types import StreamedChatResponse
@@ -66,3 +68,38 @@ class MockSageMakerDeployment(BaseDeployment):
         self, query: str, documents: List[Dict[str, Any]], **kwargs: Any
     ) -> Any:
         return None
+
+
+class MockSageMakerRuntimeClient:
+    """
+    Stand-in for the boto3 sagemaker-runtime client.
+
+    Echoes each request's message back so tests can check that concurrent
+    calls on a shared client never see each other's payloads.
+    """
+
+    def __init__(self, delay: float = 0.001):
+        self.delay = delay
+
+    def invoke_endpoint(self, **params: Any) -> Dict[str, Any]:
+        body = json.loads(params["Body"])
+        time.sleep(self.delay)
+        response = {"search_queries": [{"text": body["message"]}]}
+        return {"Body": io.BytesIO(json.dumps(response).encode())}
+
+    def invoke_endpoint_with_response_stream(self, **params: Any) -> Dict[str, Any]:
+        body = json.loads(params["Body"])
+        time.sleep(self.delay)
+        events = [
+            {"event_type": StreamEvent.STREAM_START, "is_finished": False},
+            {
+                "event_type": StreamEvent.TEXT_GENERATION,
+                "text": body["message"],
+                "is_finished": False,
+            },
+            {"event_type": StreamEvent.STREAM_END, "is_finished": True},
+        ]
+        payload = "".join(json.dumps(event) + "\n" for event in events).encode()
+        # Split the payload in small parts like SageMaker does
+        parts = [payload[i : i + 7] for i in range(0, len(payload), 7)]
+        return {"Body": [{"PayloadPart": {"Bytes": part}} for part in parts]}
@@ -2,10 +2,15 @@ from unittest.mock import MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from backend.config.deployments import ModelDeploymentName
+from backend.models.message import Message, MessageAgent
 from backend.models.user import User
+from backend.schemas.chat import ChatMessage, ChatRole
 from backend.schemas.cohere_chat import CohereChatRequest
+from backend.tests.factories import get_factory
 
 
 def test_streamed_chat(
@@ -51,6 +56,54 @@ def test_streamed_chat(
     )
 
 
+def test_streamed_chat_stores_turn(
+    session_client_chat: TestClient,
+    session_chat: Session,
+    user: User,
+    mock_cohere_deployment,
+    mock_available_model_deployments,
+):
+    conversation = get_factory("Conversation", session_chat).create(user_id=user.id)
+    get_factory("Message", session_chat).create(
+        conversation_id=conversation.id,
+        user_id=user.id,
+        position=0,
+        is_active=True,
+        agent=MessageAgent.USER,
+        text="Hi",
+    )
+    deployment = mock_cohere_deployment.return_value
+    deployment.invoke_chat_stream = MagicMock(wraps=deployment.invoke_chat_stream)
+
+    response = session_client_chat.post(
+        "/chat-stream",
+        headers={
+            "User-Id": user.id,
+            "Deployment-Name": ModelDeploymentName.CoherePlatform,
+        },
+        json={"message": "Hello", "conversation_id": conversation.id},
+    )
+
+    assert response.status_code == 200
+    assert "This is a test." in response.text
+    chat_request = deployment.invoke_chat_stream.call_args.args[0]
+    assert chat_request.chat_history == [ChatMessage(role=ChatRole.USER, message="Hi")]
+    messages = session_chat.scalars(
+        select(Message)
+        .where(Message.conversation_id == conversation.id)
+        .order_by(Message.position, Message.agent)
+    ).all()
+    assert [
+        (message.position, message.agent, message.text) for message in messages
+    ] == [
+        (0, MessageAgent.USER, "Hi"),
+        (1, MessageAgent.CHATBOT, "This is a test."),
+        (1, MessageAgent.USER, "Hello"),
+    ]
+    session_chat.refresh(conversation)
+    assert conversation.description == "This is a test."
+
+
 def test_non_streamed_chat(
     session_client_chat: TestClient,
     user: User,
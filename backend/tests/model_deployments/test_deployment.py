@@ -0,0 +1,149 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from backend.chat.custom.custom import CustomChat
+from backend.chat.custom.model_deployments import deployment as deployment_module
+from backend.chat.custom.model_deployments.deployment import (
+    acquire_deployment,
+    get_deployment,
+    release_after_stream,
+    release_deployment,
+    reset_deployment,
+)
+from backend.chat.custom.model_deployments.http_client import close_async_httpx_client
+from backend.config.deployments import ModelDeploymentName
+from backend.schemas.cohere_chat import CohereChatRequest
+
+
+@pytest.fixture(autouse=True)
+def reset_deployments():
+    reset_deployment()
+    yield
+    reset_deployment()
+
+
+def test_get_deployment_reuses_instance(mock_available_model_deployments: Mock):
+    deployment = get_deployment(ModelDeploymentName.CoherePlatform)
+
+    assert get_deployment(ModelDeploymentName.CoherePlatform) is deployment
+    assert get_deployment(ModelDeploymentName.SageMaker) is not deployment
+
+
+def test_reset_deployment_rebuilds_instance(mock_available_model_deployments: Mock):
+    cohere_deployment = get_deployment(ModelDeploymentName.CoherePlatform)
+    sagemaker_deployment = get_deployment(ModelDeploymentName.SageMaker)
+
+    reset_deployment(ModelDeploymentName.CoherePlatform)
+
+    assert get_deployment(ModelDeploymentName.CoherePlatform) is not cohere_deployment
+    assert get_deployment(ModelDeploymentName.SageMaker) is sagemaker_deployment
+
+
+def test_reset_deployment_closes_instance(mock_available_model_deployments: Mock):
+    cohere_deployment = get_deployment(ModelDeploymentName.CoherePlatform)
+    sagemaker_deployment = get_deployment(ModelDeploymentName.SageMaker)
+
+    with patch.object(cohere_deployment, "close") as close_cohere:
+        reset_deployment(ModelDeploymentName.CoherePlatform)
+
+    close_cohere.assert_called_once()
+    with patch.object(sagemaker_deployment, "close") as close_sagemaker:
+        reset_deployment()
+
+    close_sagemaker.assert_called_once()
+
+
+def test_reset_deployment_logs_close_errors(mock_available_model_deployments: Mock):
+    cohere_deployment = get_deployment(ModelDeploymentName.CoherePlatform)
+
+    with (
+        patch.object(cohere_deployment, "close", side_effect=RuntimeError("closed")),
+        patch.object(deployment_module.logger, "error") as log_error,
+    ):
+        reset_deployment()
+
+    log_error.assert_called_once()
+    assert get_deployment(ModelDeploymentName.CoherePlatform) is not cohere_deployment
+
+
+def test_reset_deployment_closes_instance_after_last_release(
+    mock_available_model_deployments: Mock,
+):
+    deployment = acquire_deployment(ModelDeploymentName.CoherePlatform)
+    assert acquire_deployment(ModelDeploymentName.CoherePlatform) is deployment
+
+    with patch.object(deployment, "close") as close:
+        reset_deployment()
+        release_deployment(deployment)
+        close.assert_not_called()
+        release_deployment(deployment)
+
+    close.assert_called_once()
+    assert get_deployment(ModelDeploymentName.CoherePlatform) is not deployment
+
+
+def test_reset_deployment_during_stream(mock_available_model_deployments: Mock):
+    deployment = acquire_deployment(ModelDeploymentName.CoherePlatform)
+    stream = release_after_stream(deployment, iter(["a", "b"]))
+
+    with patch.object(deployment, "close") as close:
+        assert next(stream) == "a"
+        reset_deployment()
+        close.assert_not_called()
+        assert list(stream) == ["b"]
+
+    close.assert_called_once()
+
+
+def test_reset_deployment_during_chat_stream(mock_available_model_deployments: Mock):
+    deployment = get_deployment(ModelDeploymentName.CoherePlatform)
+
+    async def invoke_chat_stream_async(chat_request, **kwargs):
+        yield "a"
+        yield "b"
+
+    async def chat() -> list[str]:
+        stream = await CustomChat().chat_async(
+            CohereChatRequest(message="Hello"),
+            stream=True,
+            deployment_name=ModelDeploymentName.CoherePlatform,
+            managed_tools=False,
+        )
+        events = [await anext(stream)]
+        reset_deployment()
+        close.assert_not_called()
+        return events + [event async for event in stream]
+
+    with (
+        patch.object(
+            deployment, "invoke_chat_stream_async", new=invoke_chat_stream_async
+        ),
+        patch.object(deployment, "close") as close,
+    ):
+        assert asyncio.run(chat()) == ["a", "b"]
+
+    close.assert_called_once()
+
+
+def test_close_async_httpx_client_without_event_loop():
+    client = httpx.AsyncClient()
+
+    close_async_httpx_client(client)
+
+    assert client.is_closed
+
+
+def test_close_async_httpx_client_on_event_loop():
+    client = httpx.AsyncClient()
+
+    async def close():
+        close_async_httpx_client(client)
+        # Let the scheduled close run
+        await asyncio.sleep(0)
+
+    asyncio.run(close())
+
+    assert client.is_closed
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from backend.chat.custom.model_deployments.line_decoder import (
+    LineDecoder,
+    iter_payload_lines,
+)
+
+
+def to_event_stream(payload: bytes, part_size: int) -> list[dict]:
+    return [
+        {"PayloadPart": {"Bytes": payload[i : i + part_size]}}
+        for i in range(0, len(payload), part_size)
+    ]
+
+
+def test_lines_split_across_chunks() -> None:
+    decoder = LineDecoder()
+
+    assert decoder.feed(b'{"text": "hel') == []
+    assert decoder.feed(b'lo"}\n{"text"') == [b'{"text": "hello"}']
+    assert decoder.feed(b': "world"}\n\n') == [b'{"text": "world"}']
+    assert decoder.flush() is None
+
+
+def test_multibyte_characters_split_across_chunks() -> None:
+    events = [{"text": "Mañana, 東京 🌊"}, {"text": "naïve"}]
+    payload = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+
+    # One byte per part splits every multi-byte character
+    lines = list(iter_payload_lines(to_event_stream(payload.encode(), 1)))
+
+    assert [json.loads(line) for line in lines] == events
+
+
+def test_unterminated_last_line_is_flushed() -> None:
+    stream = to_event_stream(b'{"a": 1}\n{"b": 2}', 3)
+
+    assert list(iter_payload_lines(stream)) == [b'{"a": 1}', b'{"b": 2}']
+
+
+def test_unknown_events_are_skipped() -> None:
+    stream = [
+        {"PayloadPart": {"Bytes": b'{"a": '}},
+        {"InternalStreamFailure": {}},
+        {"PayloadPart": {"Bytes": b"1}\n"}},
+    ]
+
+    assert list(iter_payload_lines(stream)) == [b'{"a": 1}']
+
+
+def test_only_pending_line_is_buffered() -> None:
+    decoder = LineDecoder()
+    line = b"x" * 100 + b"\n"
+
+    for _ in range(10_000):
+        decoder.feed(line[:60])
+        assert decoder.pending_bytes == 60
+        decoder.feed(line[60:])
+
+    assert decoder.pending_bytes == 0
+
+
+def test_line_exceeding_max_size_raises() -> None:
+    decoder = LineDecoder(max_line_bytes=10)
+    decoder.feed(b"12345")
+
+    with pytest.raises(ValueError):
+        decoder.feed(b"678901")
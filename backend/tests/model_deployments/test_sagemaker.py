@@ -1,11 +1,28 @@
-from unittest.mock import MagicMock
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from backend.chat.custom.model_deployments.sagemaker import SageMakerDeployment
+from backend.chat.enums import StreamEvent
 from backend.config.deployments import ModelDeploymentName
 from backend.models.user import User
 from backend.schemas.cohere_chat import CohereChatRequest
+from backend.tests.model_deployments.mock_deployments.mock_sagemaker import (
+    MockSageMakerRuntimeClient,
+)
+
+
+@pytest.fixture
+def sagemaker_deployment() -> SageMakerDeployment:
+    with patch.object(
+        SageMakerDeployment,
+        "get_runtime_client",
+        return_value=MockSageMakerRuntimeClient(),
+    ):
+        yield SageMakerDeployment()
 
 
 def test_streamed_chat(
@@ -86,3 +103,55 @@ def test_non_streamed_chat(
             prompt_truncation="AUTO_PRESERVE_ORDER",
         )
     )
+
+
+def get_streamed_text(deployment: SageMakerDeployment, message: str) -> str:
+    chat_request = CohereChatRequest(message=message, chat_history=[])
+    return "".join(
+        event["text"]
+        for event in deployment.invoke_chat_stream(chat_request)
+        if event["event_type"] == StreamEvent.TEXT_GENERATION
+    )
+
+
+def test_concurrent_requests_do_not_share_payloads(
+    sagemaker_deployment: SageMakerDeployment,
+):
+    messages = [f"message {i}" for i in range(200)]
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        streamed = list(
+            executor.map(
+                lambda message: get_streamed_text(sagemaker_deployment, message),
+                messages,
+            )
+        )
+        queries = list(
+            executor.map(
+                lambda message: sagemaker_deployment.invoke_search_queries(message),
+                messages,
+            )
+        )
+
+    assert streamed == messages
+    assert queries == [[message] for message in messages]
+    assert "Body" not in sagemaker_deployment.params
+
+
+def test_concurrent_async_streams_do_not_share_payloads(
+    sagemaker_deployment: SageMakerDeployment,
+):
+    messages = [f"message {i}" for i in range(50)]
+
+    async def get_text(message: str) -> str:
+        chat_request = CohereChatRequest(message=message, chat_history=[])
+        text = ""
+        async for event in sagemaker_deployment.invoke_chat_stream_async(chat_request):
+            if event["event_type"] == StreamEvent.TEXT_GENERATION:
+                text += event["text"]
+        return text
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*[get_text(message) for message in messages])
+
+    assert asyncio.run(run()) == messages
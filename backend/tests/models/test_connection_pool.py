@@ -0,0 +1,70 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+
+from backend.models.connection_pool import InstrumentedQueuePool, listen_pool_events
+from backend.services.metrics import metrics
+
+
+@pytest.fixture
+def pool_engine():
+    engine = create_engine(
+        os.environ["DATABASE_URL"],
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    listen_pool_events(engine.pool)
+    metrics.reset()
+
+    yield engine
+
+    engine.dispose()
+    metrics.reset()
+
+
+def test_pool_records_checkouts_and_usage(pool_engine):
+    with pool_engine.connect():
+        with pool_engine.connect():
+            gauges = metrics.snapshot()["gauges"]
+            assert gauges["db.pool.checked_out"] == 2
+            assert gauges["db.pool.overflow"] == 1
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["db.pool.checkouts"] == 2
+    assert snapshot["counters"]["db.pool.connections_opened"] == 2
+    assert snapshot["timings"]["db.pool.checkout_wait_seconds"]["count"] == 2
+    assert snapshot["gauges"]["db.pool.checked_out"] == 0
+    assert snapshot["gauges"]["db.pool.overflow"] == 0
+
+
+def test_pool_records_timeouts(pool_engine):
+    with pool_engine.connect(), pool_engine.connect():
+        with pytest.raises(TimeoutError):
+            pool_engine.connect()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["db.pool.timeouts"] == 1
+    assert snapshot["counters"]["db.pool.checkouts"] == 2
+    assert snapshot["timings"]["db.pool.checkout_wait_seconds"]["max"] >= 0.05
+
+
+def test_pool_events_on_plain_pool():
+    engine = create_engine(os.environ["DATABASE_URL"], pool_size=1, max_overflow=1)
+    listen_pool_events(engine.pool, "db.test_pool")
+    metrics.reset()
+
+    connection = engine.connect()
+    connection.detach()
+    connection.close()
+    with engine.connect():
+        assert metrics.snapshot()["gauges"]["db.test_pool.checked_out"] == 1
+
+    engine.dispose()
+    snapshot = metrics.snapshot()
+    metrics.reset()
+    assert snapshot["counters"]["db.test_pool.checkouts"] == 2
+    assert snapshot["gauges"]["db.test_pool.checked_out"] == 0
@@ -0,0 +1,33 @@
+import pytest
+
+from backend.models.connection_pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+)
+from backend.models.database import get_engine_options
+
+
+def test_default_engine_options():
+    options = get_engine_options("default")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert "connect_args" not in options
+
+
+def test_pgbouncer_engine_options_disable_asyncpg_statement_cache():
+    options = get_engine_options("pgbouncer", is_async=True)
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+    name_func = options["connect_args"]["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_pgbouncer_engine_options_sync():
+    assert "connect_args" not in get_engine_options("pgbouncer")
+
+
+def test_unknown_pool_profile():
+    with pytest.raises(ValueError):
+        get_engine_options("session")
@@ -1,16 +1,24 @@
 import json
 import uuid
+from contextlib import nullcontext
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.chat.enums import StreamEvent
 from backend.config.deployments import ModelDeploymentName
+from backend.crud.aio import conversation as async_conversation_crud
 from backend.models.conversation import Conversation
+from backend.models.file import File
 from backend.models.message import Message, MessageAgent
 from backend.models.user import User
+from backend.routers.chat import process_chat_async, store_conversation_turn_async
+from backend.schemas.cohere_chat import CohereChatRequest
+from backend.schemas.conversation import Conversation as ConversationSchema
 from backend.schemas.tool import Category
 from backend.tests.factories import get_factory
 
@@ -561,6 +569,59 @@ def test_non_streaming_existing_chat_with_attached_files_does_not_attach(
     assert file2.message_id == existing_message.id
 
 
+# ASYNC DATABASE TESTS
+def test_process_chat_async_on_async_session(run_in_async_session):
+    async def process_chat(
+        session: AsyncSession,
+    ) -> tuple[list[str] | None, ConversationSchema]:
+        session.add(User(id="1", fullname="John Doe"))
+        session.add(Conversation(id="1", user_id="1"))
+        await session.flush()
+        file = File(
+            conversation_id="1", user_id="1", file_name="a.txt", file_path="/tmp/a.txt"
+        )
+        session.add(file)
+        await session.commit()
+        request = SimpleNamespace(
+            headers={
+                "User-Id": "1",
+                "Deployment-Name": ModelDeploymentName.CoherePlatform,
+            }
+        )
+
+        processed = await process_chat_async(
+            session,
+            CohereChatRequest(message="Hello", conversation_id="1", file_ids=[file.id]),
+            request,
+        )
+        file_paths, chatbot_message, conversation_id = processed[2:5]
+        chatbot_message.text = "Hi"
+        await store_conversation_turn_async(
+            lambda: nullcontext(session), chatbot_message, conversation_id, "Hi", "1"
+        )
+        # Load the stored turn again from the database
+        session.expunge_all()
+
+        conversation = await async_conversation_crud.get_conversation(
+            session,
+            conversation_id,
+            "1",
+            options=async_conversation_crud.CONVERSATION_DETAIL_OPTIONS,
+        )
+        return file_paths, ConversationSchema.model_validate(conversation)
+
+    file_paths, conversation = run_in_async_session(process_chat)
+
+    assert file_paths == ["/tmp/a.txt"]
+    assert conversation.description == "Hi"
+    assert [message.text for message in conversation.messages] == ["Hello", "Hi"]
+    assert [message.agent for message in conversation.messages] == [
+        MessageAgent.USER,
+        MessageAgent.CHATBOT,
+    ]
+    assert [file.file_name for file in conversation.messages[0].files] == ["a.txt"]
+
+
 def validate_chat_streaming_response(
     response: Any,
     user: User,
@@ -1,6 +1,8 @@
 import os
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from backend.models import Citation, Conversation, Document, File, Message
@@ -27,6 +29,72 @@ def test_list_conversations(session_client: TestClient, session: Session) -> Non
     assert len(results) == 1
 
 
+def test_list_conversations_with_cursor(
+    session_client: TestClient, session: Session
+) -> None:
+    user = get_factory("User", session).create()
+    for _ in range(5):
+        get_factory("Conversation", session).create(user_id=user.id)
+
+    ids = []
+    params = {"limit": 2}
+    while True:
+        response = session_client.get(
+            "/conversations", params=params, headers={"User-Id": user.id}
+        )
+        assert response.status_code == 200
+        ids.extend(conversation["id"] for conversation in response.json())
+
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    conversations = session.query(Conversation).filter_by(user_id=user.id).all()
+    conversations.sort(key=lambda c: (c.updated_at, c.id), reverse=True)
+    assert ids == [conversation.id for conversation in conversations]
+
+
+def test_list_conversations_with_offset(
+    session_client: TestClient, session: Session
+) -> None:
+    user = get_factory("User", session).create()
+    for _ in range(5):
+        get_factory("Conversation", session).create(user_id=user.id)
+
+    response = session_client.get(
+        "/conversations",
+        params={"offset": 3, "limit": 5},
+        headers={"User-Id": user.id},
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_conversations_with_offset_and_cursor(
+    session_client: TestClient,
+) -> None:
+    response = session_client.get(
+        "/conversations",
+        params={"offset": 3, "cursor": "cursor"},
+        headers={"User-Id": "123"},
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Use either offset or cursor, not both."}
+
+
+def test_list_conversations_invalid_cursor(session_client: TestClient) -> None:
+    response = session_client.get(
+        "/conversations", params={"cursor": "cursor"}, headers={"User-Id": "123"}
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor: cursor."}
+
+
 def test_list_conversations_missing_user_id(
     session_client: TestClient, session: Session
 ) -> None:
@@ -78,6 +146,63 @@ def test_get_conversation_lists_message_files(
     assert response_conversation["messages"][0]["files"][0]["id"] == file.id
 
 
+def create_conversation_with_messages(
+    session: Session, user_id: str, num_messages: int
+) -> Conversation:
+    conversation = get_factory("Conversation", session).create(user_id=user_id)
+    for position in range(num_messages):
+        message = get_factory("Message", session).create(
+            conversation_id=conversation.id, user_id=user_id, position=position
+        )
+        document = get_factory("Document", session).create(
+            conversation_id=conversation.id, message_id=message.id, user_id=user_id
+        )
+        get_factory("Citation", session).create(
+            message_id=message.id, user_id=user_id, documents=[document]
+        )
+        get_factory("File", session).create(
+            conversation_id=conversation.id, message_id=message.id, user_id=user_id
+        )
+    return conversation
+
+
+def count_get_conversation_queries(
+    session_client: TestClient, session: Session, conversation: Conversation
+) -> int:
+    url = f"/conversations/{conversation.id}"
+    headers = {"User-Id": conversation.user_id}
+    # Nothing is served from the identity map, as in a fresh request session
+    session.expire_all()
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", before_cursor_execute)
+    try:
+        response = session_client.get(url, headers=headers)
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_get_conversation_query_count_does_not_grow_with_messages(
+    session_client: TestClient, session: Session
+) -> None:
+    user = get_factory("User", session).create()
+    small = create_conversation_with_messages(session, user.id, 1)
+    large = create_conversation_with_messages(session, user.id, 10)
+
+    small_count = count_get_conversation_queries(session_client, session, small)
+    large_count = count_get_conversation_queries(session_client, session, large)
+
+    # Conversation, its files, messages and the messages' documents, citations and files
+    assert small_count == 6
+    assert large_count == small_count
+
+
 def test_fail_get_nonexistent_conversation(
     session_client: TestClient, session: Session
 ) -> None:
@@ -328,6 +453,42 @@ def test_delete_conversation_missing_user_id(
     assert response.json() == {"detail": "User-Id required in request headers."}
 
 
+# # MESSAGES
+def test_list_messages(session_client: TestClient, session: Session) -> None:
+    user = get_factory("User", session).create()
+    conversation = create_conversation_with_messages(session, user.id, 5)
+
+    messages = []
+    params = {"limit": 2}
+    while True:
+        response = session_client.get(
+            f"/conversations/{conversation.id}/messages",
+            params=params,
+            headers={"User-Id": user.id},
+        )
+        assert response.status_code == 200
+        messages.extend(response.json())
+
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert [message["position"] for message in messages] == [0, 1, 2, 3, 4]
+    assert all(len(message["documents"]) == 1 for message in messages)
+    assert all(len(message["citations"]) == 1 for message in messages)
+    assert all(len(message["files"]) == 1 for message in messages)
+
+
+def test_list_messages_nonexistent_conversation(session_client: TestClient) -> None:
+    response = session_client.get(
+        "/conversations/123/messages", headers={"User-Id": "123"}
+    )
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Conversation with ID: 123 not found."}
+
+
 # # FILES
 def test_list_files(session_client: TestClient, session: Session) -> None:
     conversation = get_factory("Conversation", session).create()
@@ -350,6 +511,31 @@ def test_list_files(session_client: TestClient, session: Session) -> None:
     assert response_file["file_name"] == "test_file.txt"
 
 
+def test_list_files_with_limit(session_client: TestClient, session: Session) -> None:
+    conversation = get_factory("Conversation", session).create()
+    for _ in range(3):
+        get_factory("File", session).create(
+            conversation_id=conversation.id, user_id=conversation.user_id
+        )
+
+    response = session_client.get(
+        f"/conversations/{conversation.id}/files",
+        params={"limit": 2},
+        headers={"User-Id": conversation.user_id},
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    response = session_client.get(
+        f"/conversations/{conversation.id}/files",
+        params={"cursor": response.headers["X-Next-Cursor"]},
+        headers={"User-Id": conversation.user_id},
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" not in response.headers
+
+
 def test_list_files_no_files(session_client: TestClient, session: Session) -> None:
     conversation = get_factory("Conversation", session).create()
     response = session_client.get(
@@ -457,6 +643,29 @@ def test_upload_file_existing_conversation(
     os.remove(saved_file_path)
 
 
+def test_upload_file_builds_file_index(
+    session_client: TestClient, session: Session
+) -> None:
+    file_path = "src/backend/tests/test_data/Mariana_Trench.pdf"
+    conversation = get_factory("Conversation", session).create()
+
+    with patch("backend.routers.conversation.index_uploaded_file") as index_file:
+        response = session_client.post(
+            "/conversations/upload_file",
+            headers={"User-Id": conversation.user_id},
+            files={"file": open(file_path, "rb")},
+            data={"conversation_id": conversation.id},
+        )
+
+    file = response.json()
+
+    assert response.status_code == 200
+    index_file.assert_called_once_with(file["file_path"])
+
+    # Clean up - remove the file from the directory
+    os.remove(file["file_path"])
+
+
 def test_upload_file_nonexistent_conversation_creates_new_conversation(
     session_client: TestClient, session: Session
 ) -> None:
@@ -594,6 +803,26 @@ def test_delete_file(session_client: TestClient, session: Session) -> None:
     assert db_file is None
 
 
+def test_delete_file_deletes_file_index(
+    session_client: TestClient, session: Session
+) -> None:
+    conversation = get_factory("Conversation", session).create()
+    file = get_factory("File", session).create(
+        file_name="test_file.pdf",
+        conversation_id=conversation.id,
+        user_id=conversation.user_id,
+    )
+
+    with patch("backend.routers.conversation.delete_file_index") as delete_index:
+        response = session_client.delete(
+            f"/conversations/{conversation.id}/files/{file.id}",
+            headers={"User-Id": conversation.user_id},
+        )
+
+    assert response.status_code == 200
+    delete_index.assert_called_once_with(file.file_path)
+
+
 def test_fail_delete_nonexistent_file(
     session_client: TestClient, session: Session
 ) -> None:
@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+
+from backend.services.metrics import metrics
+
+
+def test_get_metrics(client: TestClient) -> None:
+    metrics.increment("test.requests")
+
+    response = client.get("/metrics/", headers={"User-Id": "123"})
+
+    assert response.status_code == 200
+    assert response.json()["counters"]["test.requests"] >= 1
+
+
+def test_get_metrics_requires_user_header(client: TestClient) -> None:
+    response = client.get("/metrics/")
+
+    assert response.status_code == 401
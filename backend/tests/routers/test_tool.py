@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
 
 from backend.config.tools import AVAILABLE_TOOLS
+from backend.main import create_app
+from backend.models import get_session
 
 
 def test_list_tools(client: TestClient) -> None:
@@ -22,3 +24,16 @@ def test_fail_list_tools_missing_user_id(client: TestClient) -> None:
     response = client.get("/tools")
     assert response.status_code == 401
     assert response.json() == {"detail": "User-Id required in request headers."}
+
+
+def test_list_tools_does_not_open_db_session() -> None:
+    def fail_get_session():
+        raise AssertionError("Listing tools should not open a database session")
+
+    app = create_app()
+    app.dependency_overrides[get_session] = fail_get_session
+
+    with TestClient(app) as client:
+        response = client.get("/tools", headers={"User-Id": "testuser"})
+
+    assert response.status_code == 200
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from backend.services.cache import MemoryCache, NullCache, SQLiteCache, create_cache
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCache(max_entries=2)
+    return SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+
+
+def test_get_missing_key(cache) -> None:
+    assert cache.get("missing") is None
+
+
+def test_set_and_get(cache) -> None:
+    cache.set("key", [{"text": "a"}], ttl=60)
+
+    assert cache.get("key") == [{"text": "a"}]
+
+
+def test_expired_entry_is_missing(cache) -> None:
+    cache.set("key", "value", ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("key") is None
+
+
+def test_evicts_least_recently_used(cache) -> None:
+    cache.set("a", 1, ttl=60)
+    time.sleep(0.001)
+    cache.set("b", 2, ttl=60)
+    time.sleep(0.001)
+    cache.get("a")
+    time.sleep(0.001)
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_get_many_and_set_many(cache) -> None:
+    cache.set_many({"a": 1, "b": 2}, ttl=60)
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    assert cache.get_many([]) == {}
+
+
+def test_clear(cache) -> None:
+    cache.set("key", "value", ttl=60)
+    cache.clear()
+
+    assert cache.get("key") is None
+
+
+def test_memory_cache_returns_copies() -> None:
+    cache = MemoryCache()
+    cache.set("key", [{"text": "a"}], ttl=60)
+
+    cache.get("key")[0]["text"] = "b"
+
+    assert cache.get("key") == [{"text": "a"}]
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteCache(path).set("key", "value", ttl=60)
+
+    assert SQLiteCache(path).get("key") == "value"
+
+
+def test_create_cache() -> None:
+    assert isinstance(create_cache("memory"), MemoryCache)
+    assert isinstance(create_cache("none"), NullCache)
+
+    with pytest.raises(ValueError):
+        create_cache("redis")
@@ -0,0 +1,51 @@
+import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from backend.services.pagination import decode_cursor, encode_cursor, get_page
+
+
+def test_cursor_round_trip():
+    key = (3, datetime.datetime(2024, 5, 1, 12, 30, 15, 123456), "message-id")
+
+    cursor = encode_cursor(key)
+
+    assert decode_cursor(cursor, (int, datetime.datetime, str)) == key
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(["?>?>?>", "/+/+"])
+
+    assert all(char.isalnum() or char in "-_=" for char in cursor)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        encode_cursor(["only one value"]),
+        encode_cursor(["not a date", "id"]),
+        encode_cursor([1, "id"]),
+        encode_cursor(["2024-05-01T12:30:15", 1]),
+    ],
+)
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, (datetime.datetime, str))
+
+    assert exc_info.value.status_code == 400
+
+
+def test_get_page_with_more_rows():
+    page, cursor = get_page([1, 2, 3], 2, key=lambda row: (row,))
+
+    assert page == [1, 2]
+    assert decode_cursor(cursor, (int,)) == (2,)
+
+
+def test_get_page_last_page():
+    page, cursor = get_page([1, 2], 2, key=lambda row: (row,))
+
+    assert page == [1, 2]
+    assert cursor is None
@@ -0,0 +1,147 @@
+import threading
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.models.database import get_session_factory
+from backend.services import persistence
+from backend.services.metrics import metrics
+from backend.services.persistence import PersistenceQueue
+
+
+class FakeSessionFactory:
+    """Records the writes of each committed transaction."""
+
+    def __init__(self):
+        self.transactions: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def __call__(self):
+        writes = []
+        session = MagicMock()
+        session.add.side_effect = writes.append
+
+        def commit():
+            if "bad" in writes:
+                raise RuntimeError("Commit failed")
+            with self.lock:
+                self.transactions.append(writes)
+
+        session.commit.side_effect = commit
+        yield session
+
+
+def write(value: str):
+    return lambda session: session.add(value)
+
+
+@pytest.fixture
+def session_factory():
+    return FakeSessionFactory()
+
+
+def test_submit_before_start_is_rejected(session_factory) -> None:
+    persistence_queue = PersistenceQueue(session_factory)
+
+    assert not persistence_queue.submit(write("a"))
+
+
+def test_turns_are_written_in_batches(session_factory) -> None:
+    persistence_queue = PersistenceQueue(
+        session_factory, workers=1, batch_size=10, flush_interval=0.2
+    )
+    persistence_queue.start()
+
+    for i in range(5):
+        assert persistence_queue.submit(write(str(i)))
+    assert persistence_queue.flush(timeout=5)
+    persistence_queue.stop()
+
+    assert session_factory.transactions == [["0", "1", "2", "3", "4"]]
+
+
+def test_stop_writes_queued_turns(session_factory) -> None:
+    persistence_queue = PersistenceQueue(
+        session_factory, workers=2, batch_size=3, flush_interval=0.01
+    )
+    persistence_queue.start()
+
+    for i in range(20):
+        persistence_queue.submit(write(str(i)))
+
+    assert persistence_queue.stop(timeout=5)
+    assert not persistence_queue.submit(write("late"))
+    written = [value for writes in session_factory.transactions for value in writes]
+    assert sorted(written, key=int) == [str(i) for i in range(20)]
+    assert all(len(writes) <= 3 for writes in session_factory.transactions)
+
+
+def test_failed_batch_is_retried_per_turn(session_factory) -> None:
+    persistence_queue = PersistenceQueue(
+        session_factory, workers=1, batch_size=10, flush_interval=0.2
+    )
+    metrics.reset()
+    persistence_queue.start()
+
+    for value in ["a", "bad", "b"]:
+        persistence_queue.submit(write(value))
+    persistence_queue.flush(timeout=5)
+    persistence_queue.stop()
+
+    assert session_factory.transactions == [["a"], ["b"]]
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["persistence.turns_written"] == 2
+    assert snapshot["counters"]["persistence.turns_failed"] == 1
+    assert snapshot["timings"]["persistence.flush_seconds"]["count"] == 1
+    assert snapshot["gauges"]["persistence.queue_depth"] == 0
+
+
+def test_full_queue_rejects_turns(session_factory) -> None:
+    persistence_queue = PersistenceQueue(
+        session_factory, workers=1, batch_size=1, max_queue_size=1
+    )
+    blocked = threading.Event()
+    release = threading.Event()
+
+    def block(session):
+        blocked.set()
+        release.wait(5)
+
+    persistence_queue.start()
+    persistence_queue.submit(block)
+    blocked.wait(5)
+
+    assert persistence_queue.submit(write("a"))
+    assert not persistence_queue.submit(write("b"))
+
+    release.set()
+    persistence_queue.stop()
+
+
+def test_start_uses_given_session_factory(session_factory) -> None:
+    persistence_queue = PersistenceQueue(FakeSessionFactory(), workers=1)
+    persistence_queue.start(session_factory)
+
+    assert persistence_queue.submit(write("a"))
+    assert persistence_queue.flush(timeout=5)
+    persistence_queue.stop()
+
+    assert session_factory.transactions == [["a"]]
+
+
+def test_app_starts_queue_with_overridden_session_factory(session_factory) -> None:
+    app = create_app()
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    persistence_queue = PersistenceQueue(FakeSessionFactory(), workers=1)
+
+    with (
+        patch.object(persistence, "USE_PERSISTENCE_QUEUE", True),
+        patch.object(persistence, "persistence_queue", persistence_queue),
+        patch("backend.main.stop_persistence_queue", persistence_queue.stop),
+        TestClient(app),
+    ):
+        assert persistence_queue.session_factory is session_factory
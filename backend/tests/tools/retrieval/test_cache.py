@@ -0,0 +1,63 @@
+from typing import Any, Dict, List
+
+from backend.services.cache import MemoryCache
+from backend.services.metrics import metrics
+from backend.tools.retrieval.base import BaseRetrieval
+from backend.tools.retrieval.cache import CachedRetrieval, get_retrieval_cache_key
+
+
+class CountingRetriever(BaseRetrieval):
+    timeout = 5
+
+    def __init__(self, chunk_size: int = 300):
+        self.chunk_size = chunk_size
+        self.calls = 0
+
+    def retrieve_documents(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        self.calls += 1
+        return [{"text": f"{query}:{self.chunk_size}"}] if query else []
+
+
+def test_cached_retrieval_calls_retriever_once() -> None:
+    metrics.reset()
+    retriever = CountingRetriever()
+    cached = CachedRetrieval(
+        retriever, {"chunk_size": 300}, ttl=60, cache=MemoryCache()
+    )
+
+    first = cached.retrieve_documents("Capital of France")
+    second = cached.retrieve_documents("  capital of  FRANCE ")
+
+    assert first == second == [{"text": "Capital of France:300"}]
+    assert retriever.calls == 1
+    counters = metrics.snapshot()["counters"]
+    assert counters["retrieval_cache.hits"] == 1
+    assert counters["retrieval_cache.misses"] == 1
+    assert counters["retrieval_cache.CountingRetriever.hits"] == 1
+
+
+def test_cached_retrieval_doesnt_cache_empty_results() -> None:
+    retriever = CountingRetriever()
+    cached = CachedRetrieval(retriever, {}, ttl=60, cache=MemoryCache())
+
+    cached.retrieve_documents("")
+    cached.retrieve_documents("")
+
+    assert retriever.calls == 2
+
+
+def test_cached_retrieval_keeps_retriever_timeout() -> None:
+    cached = CachedRetrieval(CountingRetriever(), {}, ttl=60, cache=MemoryCache())
+
+    assert cached.timeout == 5
+
+
+def test_cache_key_depends_on_kwargs() -> None:
+    key = get_retrieval_cache_key(CountingRetriever, {"chunk_size": 300}, "query")
+
+    assert key == get_retrieval_cache_key(
+        CountingRetriever, {"chunk_size": 300}, " Query "
+    )
+    assert key != get_retrieval_cache_key(
+        CountingRetriever, {"chunk_size": 500}, "query"
+    )
@@ -1,5 +1,33 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
 from backend.chat.custom.model_deployments.cohere_platform import CohereDeployment
-from backend.tools.retrieval import collate
+from backend.tools.retrieval import collate, parallel
+
+
+class LengthRerankDeployment:
+    """Ranks longer documents first, fails for queries starting with "fail"."""
+
+    rerank_enabled = True
+    rerank_model = "length"
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+
+    def invoke_rerank(self, query: str, documents: list[str], **kwargs: Any) -> Any:
+        time.sleep(self.delay)
+        if query.startswith("fail"):
+            raise RuntimeError("Rerank is down")
+
+        return SimpleNamespace(
+            results=[
+                SimpleNamespace(index=i, relevance_score=len(document))
+                for i, document in enumerate(documents)
+            ]
+        )
 
 
 def test_rerank() -> None:
@@ -14,6 +42,65 @@ def test_rerank() -> None:
     }
 
 
+def test_rerank_keeps_query_order() -> None:
+    input = {
+        "q1": [{"text": "a"}, {"text": "ccc"}, {"text": "bb"}],
+        "q2": [],
+        "q3": [{"text": "dd"}, {"text": "eee"}],
+    }
+
+    result = collate.rerank(input, LengthRerankDeployment())
+
+    assert list(result) == ["q1", "q3"]
+    assert result == {
+        "q1": [{"text": "ccc"}, {"text": "bb"}, {"text": "a"}],
+        "q3": [{"text": "eee"}, {"text": "dd"}],
+    }
+
+
+def test_rerank_runs_concurrently() -> None:
+    input = {f"q{i}": [{"text": "a"}, {"text": "bb"}] for i in range(4)}
+
+    start = time.monotonic()
+    result = collate.rerank(input, LengthRerankDeployment(delay=0.2))
+
+    assert time.monotonic() - start < 0.6
+    assert all(
+        documents == [{"text": "bb"}, {"text": "a"}] for documents in result.values()
+    )
+
+
+def test_rerank_times_queries_from_start() -> None:
+    # Queries not reranked by other tests, so the scores aren't cached
+    input = {f"timed{i}": [{"text": "a"}, {"text": "bb"}] for i in range(2)}
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    with (
+        patch.object(parallel, "retrieval_executor", executor),
+        patch.object(collate, "RERANK_TIMEOUT", 0.25),
+    ):
+        result = collate.rerank(input, LengthRerankDeployment(delay=0.15))
+    executor.shutdown()
+
+    # timed1 waits for timed0's worker on the shared pool, then runs within its timeout
+    assert result == {
+        "timed0": [{"text": "bb"}, {"text": "a"}],
+        "timed1": [{"text": "bb"}, {"text": "a"}],
+    }
+
+
+def test_rerank_failure_keeps_retrieval_order() -> None:
+    input = {
+        "fail": [{"text": "a"}, {"text": "bb"}],
+        "ok": [{"text": "a"}, {"text": "bb"}],
+    }
+
+    assert collate.rerank(input, LengthRerankDeployment()) == {
+        "fail": [{"text": "a"}, {"text": "bb"}],
+        "ok": [{"text": "bb"}, {"text": "a"}],
+    }
+
+
 def test_interleave() -> None:
     input = {
         "q1": [{"q1a": "a"}, {"q1b": "b"}, {"q1c": "c"}],
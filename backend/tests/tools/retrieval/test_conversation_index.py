@@ -0,0 +1,154 @@
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.tools.retrieval import conversation_index
+from backend.tools.retrieval.conversation_index import (
+    ConversationFilesRetriever,
+    ConversationIndex,
+    get_conversation_index,
+    reset_conversation_indexes,
+)
+from backend.tools.retrieval.file_index import FileIndex
+
+FILE_INDEXES = {
+    "data/a.pdf": FileIndex(
+        ["a one", "a two"], np.array([[1, 0], [0.6, 0.8]], dtype=np.float32), [0, 1]
+    ),
+    "data/b.pdf": FileIndex(
+        ["b one", "b two"], np.array([[0.8, 0.6], [0, 1]], dtype=np.float32), [3, 4]
+    ),
+}
+
+
+@pytest.fixture
+def loaded_files():
+    loaded = []
+
+    def get_or_build_file_index(file_path, embeddings):
+        loaded.append(file_path)
+        return FILE_INDEXES[file_path]
+
+    with patch.object(
+        conversation_index,
+        "get_or_build_file_index",
+        side_effect=get_or_build_file_index,
+    ):
+        yield loaded
+
+
+def test_search_across_files_with_provenance(loaded_files) -> None:
+    index = ConversationIndex()
+    index.update(["data/a.pdf", "data/b.pdf"], embeddings=None)
+
+    assert index.search([1, 0], k=3) == [
+        {"text": "a one", "title": "a.pdf", "file_path": "data/a.pdf", "page": "1"},
+        {"text": "b one", "title": "b.pdf", "file_path": "data/b.pdf", "page": "4"},
+        {"text": "a two", "title": "a.pdf", "file_path": "data/a.pdf", "page": "2"},
+    ]
+
+
+def test_update_only_loads_added_files(loaded_files) -> None:
+    index = ConversationIndex()
+    index.update(["data/a.pdf"], embeddings=None)
+    index.update(["data/a.pdf", "data/b.pdf"], embeddings=None)
+    index.update(["data/a.pdf", "data/b.pdf"], embeddings=None)
+
+    assert loaded_files == ["data/a.pdf", "data/b.pdf"]
+    assert list(index.file_indexes) == ["data/a.pdf", "data/b.pdf"]
+
+
+def test_update_removes_files(loaded_files) -> None:
+    index = ConversationIndex()
+    index.update(["data/a.pdf", "data/b.pdf"], embeddings=None)
+    index.update(["data/b.pdf"], embeddings=None)
+
+    assert index.file_paths == ["data/b.pdf"]
+    assert [document["text"] for document in index.search([1, 0], k=4)] == [
+        "b one",
+        "b two",
+    ]
+    assert list(index.file_indexes) == ["data/b.pdf"]
+
+
+def test_update_skips_files_that_fail(loaded_files) -> None:
+    index = ConversationIndex()
+    index.update(["data/a.pdf", "data/missing.pdf"], embeddings=None)
+
+    assert index.file_paths == ["data/a.pdf"]
+    assert len(index.search([1, 0], k=4)) == 2
+
+
+def test_search_during_update_does_not_wait_for_build(loaded_files) -> None:
+    index = ConversationIndex()
+    index.update(["data/a.pdf"], embeddings=None)
+    building = threading.Event()
+    built = threading.Event()
+
+    def build_file_index(file_path, embeddings):
+        building.set()
+        built.wait(5)
+        return FILE_INDEXES[file_path]
+
+    with patch.object(
+        conversation_index, "get_or_build_file_index", side_effect=build_file_index
+    ):
+        update = threading.Thread(
+            target=index.update, args=(["data/a.pdf", "data/b.pdf"], None)
+        )
+        update.start()
+        assert building.wait(5)
+
+        # b is still building, a is searched without waiting for it
+        assert [document["text"] for document in index.search([1, 0], k=4)] == [
+            "a one",
+            "a two",
+        ]
+        built.set()
+        update.join(5)
+
+    assert index.file_paths == ["data/a.pdf", "data/b.pdf"]
+    assert len(index.search([1, 0], k=4)) == 4
+
+
+def test_get_conversation_index_evicts_least_recently_used() -> None:
+    reset_conversation_indexes()
+    first = get_conversation_index("1", max_conversations=2)
+    get_conversation_index("2", max_conversations=2)
+    get_conversation_index("1", max_conversations=2)
+    get_conversation_index("3", max_conversations=2)
+
+    assert get_conversation_index("1", max_conversations=2) is first
+    assert get_conversation_index("2", max_conversations=2) is not first
+    reset_conversation_indexes()
+
+
+def test_conversation_files_retriever(loaded_files) -> None:
+    reset_conversation_indexes()
+    with patch.object(conversation_index, "get_embeddings") as get_embeddings:
+        get_embeddings.return_value.embed_query.return_value = [0, 1]
+        retriever = ConversationFilesRetriever(
+            ["data/a.pdf", "data/b.pdf"], "conversation", k=1
+        )
+
+        assert retriever.retrieve_documents("query") == [
+            {"text": "b two", "title": "b.pdf", "file_path": "data/b.pdf", "page": "5"}
+        ]
+    reset_conversation_indexes()
+
+
+def test_search_keeps_file_vectors_memory_mapped(tmp_path) -> None:
+    path = tmp_path / "a.npy"
+    np.save(path, FILE_INDEXES["data/a.pdf"].vectors)
+    file_index = FileIndex(["a one", "a two"], np.load(path, mmap_mode="r"))
+
+    with patch.object(
+        conversation_index, "get_or_build_file_index", return_value=file_index
+    ):
+        index = ConversationIndex()
+        index.update(["data/a.pdf"], embeddings=None)
+
+    assert isinstance(index.file_indexes["data/a.pdf"].vectors, np.memmap)
+    assert index.search([0, 1], k=1)[0]["text"] == "a two"
@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from backend.services.metrics import metrics
+from backend.tools.retrieval.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded += texts
+        return [[float(len(text)), 1.0, 0.0, 0.0] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.embedded.append(text)
+        return [0.0, 0.0, 1.0, float(len(text))]
+
+
+def test_set_many_and_get_many(tmp_path) -> None:
+    cache = EmbeddingCache(str(tmp_path))
+    cache.set_many("model", ["a", "bb"], [[1, 2], [3, 4]])
+
+    vectors = cache.get_many("model", ["bb", "c", "a"])
+
+    np.testing.assert_array_equal(vectors[0], [3, 4])
+    assert vectors[1] is None
+    np.testing.assert_array_equal(vectors[2], [1, 2])
+    assert cache.get_many("other model", ["a"]) == [None]
+
+
+def test_cache_is_shared_between_instances(tmp_path) -> None:
+    EmbeddingCache(str(tmp_path)).set_many("model", ["a"], [[1, 2]])
+
+    vectors = EmbeddingCache(str(tmp_path)).get_many("model", ["a"])
+
+    np.testing.assert_array_equal(vectors[0], [1, 2])
+
+
+def test_matrix_grows_past_first_allocation(tmp_path) -> None:
+    cache = EmbeddingCache(str(tmp_path))
+    texts = [str(i) for i in range(3000)]
+    vectors = [[i, i] for i in range(3000)]
+
+    for start in range(0, 3000, 1000):
+        cache.set_many(
+            "model", texts[start : start + 1000], vectors[start : start + 1000]
+        )
+
+    np.testing.assert_array_equal(np.stack(cache.get_many("model", texts)), vectors)
+
+
+def test_evicts_least_recently_used(tmp_path) -> None:
+    # Room for two vectors of two float32
+    cache = EmbeddingCache(str(tmp_path), max_bytes=16)
+    cache.set_many("model", ["a"], [[1, 1]])
+    cache.set_many("model", ["b"], [[2, 2]])
+    cache.get_many("model", ["a"])
+    cache.set_many("model", ["c"], [[3, 3]])
+
+    a, b, c = cache.get_many("model", ["a", "b", "c"])
+
+    np.testing.assert_array_equal(a, [1, 1])
+    assert b is None
+    np.testing.assert_array_equal(c, [3, 3])
+
+
+def test_ignores_vectors_of_another_dimension(tmp_path) -> None:
+    cache = EmbeddingCache(str(tmp_path))
+    cache.set_many("model", ["a"], [[1, 2]])
+    cache.set_many("model", ["b"], [[1, 2, 3]])
+
+    assert cache.get_many("model", ["b"]) == [None]
+
+
+def test_concurrent_writes(tmp_path) -> None:
+    cache = EmbeddingCache(str(tmp_path))
+
+    def write(i: int) -> None:
+        cache.set_many(
+            "model", [f"{i}-{j}" for j in range(50)], [[i, j] for j in range(50)]
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(8)))
+
+    for i in range(8):
+        vectors = cache.get_many("model", [f"{i}-{j}" for j in range(50)])
+        np.testing.assert_array_equal(np.stack(vectors), [[i, j] for j in range(50)])
+
+
+def test_cached_embeddings_embed_each_text_once(tmp_path) -> None:
+    metrics.reset()
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, "counting", EmbeddingCache(str(tmp_path)))
+
+    first = embeddings.embed_documents(["a", "bb", "a"])
+    second = embeddings.embed_documents(["bb", "ccc"])
+
+    assert first == [[1, 1, 0, 0], [2, 1, 0, 0], [1, 1, 0, 0]]
+    assert second == [[2, 1, 0, 0], [3, 1, 0, 0]]
+    assert inner.embedded == ["a", "bb", "ccc"]
+    counters = metrics.snapshot()["counters"]
+    assert counters["embedding_cache.hits"] == 1
+    assert counters["embedding_cache.misses"] == 4
+
+
+def test_cached_embeddings_cache_queries_separately(tmp_path) -> None:
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, "counting", EmbeddingCache(str(tmp_path)))
+
+    embeddings.embed_documents(["a"])
+    assert embeddings.embed_query("a") == [0, 0, 1, 1]
+    assert embeddings.embed_query("a") == [0, 0, 1, 1]
+
+    assert inner.embedded == ["a", "a"]
@@ -0,0 +1,89 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from backend.tools.retrieval import file_index
+
+
+class LetterEmbeddings(Embeddings):
+    """Embeds texts as letter counts and counts the embedded documents."""
+
+    def __init__(self):
+        self.embedded_documents = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded_documents += len(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(text.lower().count(letter)) for letter in "abcdefghij"]
+
+
+@pytest.fixture
+def uploaded_file(tmp_path):
+    file_path = tmp_path / "file.pdf"
+    file_path.write_bytes(b"content")
+    chunks = ["aaaa", "bbbb", "aabb", "jjjj"]
+    with (
+        patch.object(file_index, "FILE_INDEX_FOLDER", str(tmp_path / "indexes")),
+        patch.object(file_index, "split_file", return_value=(chunks, [0, 0, 1, 2])),
+    ):
+        yield str(file_path)
+
+
+def test_search_file_returns_most_similar_chunks(uploaded_file) -> None:
+    embeddings = LetterEmbeddings()
+
+    result = file_index.search_file(uploaded_file, "a", k=2, embeddings=embeddings)
+
+    assert result == [{"text": "aaaa"}, {"text": "aabb"}]
+
+
+def test_index_is_built_once(uploaded_file) -> None:
+    embeddings = LetterEmbeddings()
+
+    file_index.build_file_index(uploaded_file, embeddings)
+    file_index.search_file(uploaded_file, "b", embeddings=embeddings)
+    file_index.search_file(uploaded_file, "j", embeddings=embeddings)
+
+    assert embeddings.embedded_documents == 4
+
+
+def test_index_keeps_chunk_pages(uploaded_file) -> None:
+    file_index.build_file_index(uploaded_file, LetterEmbeddings())
+
+    assert file_index.load_file_index(uploaded_file).pages == [0, 0, 1, 2]
+
+
+def test_index_is_rebuilt_when_the_file_changes(uploaded_file) -> None:
+    embeddings = LetterEmbeddings()
+    file_index.build_file_index(uploaded_file, embeddings)
+
+    with open(uploaded_file, "ab") as f:
+        f.write(b"more content")
+
+    assert file_index.load_file_index(uploaded_file) is None
+    file_index.search_file(uploaded_file, "a", embeddings=embeddings)
+    assert embeddings.embedded_documents == 8
+
+
+def test_delete_file_index(uploaded_file) -> None:
+    file_index.build_file_index(uploaded_file, LetterEmbeddings())
+
+    file_index.delete_file_index(uploaded_file)
+
+    assert file_index.load_file_index(uploaded_file) is None
+    assert not any(
+        os.path.exists(path) for path in file_index.get_index_paths(uploaded_file)
+    )
+
+
+def test_index_uploaded_file_logs_failures(uploaded_file) -> None:
+    with patch.object(
+        file_index, "get_embeddings", side_effect=KeyError("COHERE_API_KEY")
+    ):
+        file_index.index_uploaded_file(uploaded_file)
+
+    assert file_index.load_file_index(uploaded_file) is None
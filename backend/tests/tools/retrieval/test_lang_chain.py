@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 from langchain_core.documents.base import Document
+from langchain_core.embeddings import FakeEmbeddings
 
 from backend.tools.retrieval.lang_chain import (
     LangChainVectorDBRetriever,
@@ -71,80 +72,46 @@ def test_wiki_retriever_no_docs() -> None:
     assert result == []
 
 
-def test_vector_db_retriever() -> None:
+def test_vector_db_retriever(tmp_path) -> None:
     file_path = "src/backend/tests/test_data/Mariana_Trench.pdf"
     retriever = LangChainVectorDBRetriever(file_path)
     query = "What is the mariana trench?"
-    mock_docs = [
-        Document(
-            page_content="Location of the Mariana TrenchMariana Trench",
-            metadata={
-                "page": 0,
-                "source": "src/backend/tests/test_data/Mariana_Trench.pdf",
-            },
-        ),
-        Document(
-            page_content="Like other oceanic trenches, the Mariana Trench has been propos ed as a site for nuclear waste",
-            metadata={
-                "page": 4,
-                "source": "src/backend/tests/test_data/Mariana_Trench.pdf",
-            },
-        ),
-        Document(
-            page_content="The Pacific plate is subducted beneath the Mariana Plate",
-            metadata={
-                "page": 1,
-                "source": "src/backend/tests/test_data/Mariana_Trench.pdf",
-            },
-        ),
-        Document(
-            page_content='37. "Vityaz-D explored Mariana Trench according to preinstalled program — developer"',
-            metadata={
-                "page": 7,
-                "source": "src/backend/tests/test_data/Mariana_Trench.pdf",
-            },
-        ),
-    ]
-    expected_docs = [
-        {"text": "Location of the Mariana TrenchMariana Trench"},
-        {
-            "text": "Like other oceanic trenches, the Mariana Trench has been propos ed as a site for nuclear waste"
-        },
-        {"text": "The Pacific plate is subducted beneath the Mariana Plate"},
-        {
-            "text": '37. "Vityaz-D explored Mariana Trench according to preinstalled program — developer"'
-        },
+    chunks = [
+        "Location of the Mariana TrenchMariana Trench",
+        "The Pacific plate is subducted beneath the Mariana Plate",
     ]
 
-    db_get_relevant_docs_mock = MagicMock()
-    db_get_relevant_docs_mock.get_relevant_docs.return_value = mock_docs
-
-    with patch(
-        "langchain_community.vectorstores.Chroma.from_documents"
-    ) as mock_from_documents:
-        mock_db = MagicMock()
-        mock_from_documents.return_value = mock_db
-        mock_db.as_retriever().get_relevant_documents.return_value = mock_docs
+    with (
+        patch("backend.tools.retrieval.file_index.FILE_INDEX_FOLDER", str(tmp_path)),
+        patch(
+            "backend.tools.retrieval.file_index.split_file",
+            return_value=(chunks, [0, 1]),
+        ),
+        patch(
+            "backend.tools.retrieval.file_index.get_embeddings",
+            return_value=FakeEmbeddings(size=8),
+        ),
+    ):
         result = retriever.retrieve_documents(query)
 
-    assert result == expected_docs
+    assert sorted(result, key=lambda doc: doc["text"]) == [
+        {"text": chunk} for chunk in chunks
+    ]
 
 
-def test_vector_db_retriever_no_docs() -> None:
+def test_vector_db_retriever_no_docs(tmp_path) -> None:
     file_path = "src/backend/tests/test_data/Mariana_Trench.pdf"
     retriever = LangChainVectorDBRetriever(file_path)
     query = "What is the mariana trench?"
-    mock_docs = []
 
-    db_get_relevant_docs_mock = MagicMock()
-    db_get_relevant_docs_mock.get_relevant_docs.return_value = mock_docs
-
-    with patch(
-        "langchain_community.vectorstores.Chroma.from_documents"
-    ) as mock_from_documents:
-        mock_db = MagicMock()
-        mock_from_documents.return_value = mock_db
-        mock_db.as_retriever().get_relevant_documents.return_value = mock_docs
+    with (
+        patch("backend.tools.retrieval.file_index.FILE_INDEX_FOLDER", str(tmp_path)),
+        patch("backend.tools.retrieval.file_index.split_file", return_value=([], [])),
+        patch(
+            "backend.tools.retrieval.file_index.get_embeddings",
+            return_value=FakeEmbeddings(size=8),
+        ),
+    ):
         result = retriever.retrieve_documents(query)
 
     assert result == []
@@ -0,0 +1,103 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from backend.tools.retrieval import parallel
+from backend.tools.retrieval.base import BaseRetrieval
+from backend.tools.retrieval.parallel import retrieve_documents_in_parallel
+
+
+class EchoRetriever(BaseRetrieval):
+    def __init__(self, name: str, delay: float = 0):
+        self.name = name
+        self.delay = delay
+        self.calls = 0
+
+    def retrieve_documents(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        self.calls += 1
+        time.sleep(self.delay)
+        return [{"text": f"{self.name}:{query}"}]
+
+
+@pytest.fixture
+def single_worker():
+    executor = ThreadPoolExecutor(max_workers=1)
+    with patch.object(parallel, "retrieval_executor", executor):
+        yield executor
+    executor.shutdown()
+
+
+class FailingRetriever(BaseRetrieval):
+    def retrieve_documents(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        raise RuntimeError("Retriever is down")
+
+
+def test_retrieve_documents_in_parallel_keeps_order() -> None:
+    retrievers = [EchoRetriever("a", delay=0.05), EchoRetriever("b")]
+
+    result = retrieve_documents_in_parallel(retrievers, ["q1", "q2"])
+
+    assert result == {
+        "q1": [{"text": "a:q1"}, {"text": "b:q1"}],
+        "q2": [{"text": "a:q2"}, {"text": "b:q2"}],
+    }
+
+
+def test_retrieve_documents_in_parallel_runs_concurrently() -> None:
+    retrievers = [EchoRetriever(str(i), delay=0.2) for i in range(4)]
+
+    start = time.monotonic()
+    result = retrieve_documents_in_parallel(retrievers, ["q1", "q2"])
+
+    assert time.monotonic() - start < 0.6
+    assert len(result["q1"]) == 4
+    assert len(result["q2"]) == 4
+
+
+def test_retrieve_documents_in_parallel_isolates_failures() -> None:
+    retrievers = [FailingRetriever(), EchoRetriever("ok")]
+
+    result = retrieve_documents_in_parallel(retrievers, ["q1"])
+
+    assert result == {"q1": [{"text": "ok:q1"}]}
+
+
+def test_retrieve_documents_in_parallel_drops_timed_out_retriever() -> None:
+    slow = EchoRetriever("slow", delay=1)
+    slow.timeout = 0.1
+
+    start = time.monotonic()
+    result = retrieve_documents_in_parallel([slow, EchoRetriever("fast")], ["q1"])
+
+    assert time.monotonic() - start < 0.5
+    assert result == {"q1": [{"text": "fast:q1"}]}
+
+
+def test_retrieve_documents_in_parallel_times_calls_from_start(single_worker) -> None:
+    retrievers = [EchoRetriever("a", delay=0.15), EchoRetriever("b", delay=0.15)]
+    for retriever in retrievers:
+        retriever.timeout = 0.25
+
+    result = retrieve_documents_in_parallel(retrievers, ["q1"])
+
+    # b waits for a's worker, then runs within its own timeout
+    assert result == {"q1": [{"text": "a:q1"}, {"text": "b:q1"}]}
+
+
+def test_retrieve_documents_in_parallel_drops_calls_without_worker(
+    single_worker,
+) -> None:
+    hung = EchoRetriever("hung", delay=0.5)
+    hung.timeout = 0.05
+    queued = EchoRetriever("queued")
+
+    start = time.monotonic()
+    with patch.object(parallel, "RETRIEVAL_QUEUE_TIMEOUT", 0.1):
+        result = retrieve_documents_in_parallel([hung, queued], ["q1"])
+
+    assert time.monotonic() - start < 0.3
+    assert result == {"q1": []}
+    assert queued.calls == 0
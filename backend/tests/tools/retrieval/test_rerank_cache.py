@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from typing import Any
+
+from backend.services.cache import MemoryCache
+from backend.services.metrics import metrics
+from backend.tools.retrieval.rerank_cache import get_relevance_scores
+
+
+class RecordingRerankDeployment:
+    """Scores documents by length and records the documents sent upstream."""
+
+    rerank_model = "length"
+
+    def __init__(self, top_n: int | None = None):
+        self.top_n = top_n
+        self.calls = []
+
+    def invoke_rerank(self, query: str, documents: list[str], **kwargs: Any) -> Any:
+        self.calls.append(documents)
+        results = [
+            SimpleNamespace(index=i, relevance_score=float(len(document)))
+            for i, document in enumerate(documents)
+        ]
+        results.sort(key=lambda result: result.relevance_score, reverse=True)
+        return SimpleNamespace(results=results[: self.top_n])
+
+
+def test_get_relevance_scores_only_sends_uncached_documents() -> None:
+    metrics.reset()
+    model = RecordingRerankDeployment()
+    cache = MemoryCache()
+
+    assert get_relevance_scores(model, "q", ["a", "bb"], cache) == [1.0, 2.0]
+    assert get_relevance_scores(model, "q", ["ccc", "a", "bb", "ccc"], cache) == [
+        3.0,
+        1.0,
+        2.0,
+        3.0,
+    ]
+
+    assert model.calls == [["a", "bb"], ["ccc"]]
+    counters = metrics.snapshot()["counters"]
+    assert counters["rerank_cache.hits"] == 2
+    assert counters["rerank_cache.misses"] == 3
+
+
+def test_get_relevance_scores_is_per_query() -> None:
+    model = RecordingRerankDeployment()
+    cache = MemoryCache()
+
+    get_relevance_scores(model, "q1", ["a"], cache)
+    get_relevance_scores(model, "q2", ["a"], cache)
+
+    assert model.calls == [["a"], ["a"]]
+
+
+def test_get_relevance_scores_doesnt_cache_missing_scores() -> None:
+    model = RecordingRerankDeployment(top_n=1)
+    cache = MemoryCache()
+
+    assert get_relevance_scores(model, "q", ["a", "bb"], cache) == [None, 2.0]
+    get_relevance_scores(model, "q", ["a", "bb"], cache)
+
+    assert model.calls == [["a", "bb"], ["a"]]
+
+
+def test_get_relevance_scores_disabled() -> None:
+    model = RecordingRerankDeployment()
+    cache = MemoryCache()
+
+    for _ in range(2):
+        get_relevance_scores(model, "q", ["a"], cache, ttl=0)
+
+    assert len(model.calls) == 2
@@ -0,0 +1,192 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.tools.retrieval import vector_search
+from backend.tools.retrieval.vector_search import (
+    BinaryCodes,
+    Int8Codes,
+    IVFIndex,
+    QuantizedCodes,
+    VectorIndex,
+    cosine_top_k,
+    delete_vector_index,
+    get_ivf_paths,
+    normalize,
+    quantized_top_k,
+    search_indexes,
+)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return normalize(rng.standard_normal((1000, 16)))
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = normalize(queries) @ vectors.T
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+def test_cosine_top_k_matches_full_sort_across_batches(vectors) -> None:
+    queries = np.random.default_rng(1).standard_normal((5, 16))
+
+    rows, scores = cosine_top_k(vectors, queries, k=7, batch_rows=64)
+
+    np.testing.assert_array_equal(rows, exact_top_k(vectors, queries, 7))
+    assert scores.shape == (5, 7)
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+
+def test_cosine_top_k_caps_k_to_rows() -> None:
+    rows, scores = cosine_top_k(normalize([[1, 0], [0, 1]]), [1, 0], k=5)
+
+    assert rows.tolist() == [[0, 1]]
+    assert scores[0, 0] == pytest.approx(1)
+
+
+def test_ivf_index_finds_nearest_rows(vectors) -> None:
+    ivf = IVFIndex.build(vectors, clusters=10)
+    queries = vectors[:20] + 0.01
+
+    rows, _ = ivf.search(vectors, queries, k=1, probes=3)
+
+    assert rows[:, 0].tolist() == list(range(20))
+    assert sorted(ivf.order.tolist()) == list(range(len(vectors)))
+    assert ivf.offsets[-1] == len(vectors)
+
+
+def test_ivf_index_assigns_clusters_in_bounded_blocks(vectors) -> None:
+    expected = IVFIndex.build(vectors, clusters=10)
+
+    with patch.object(vector_search, "IVF_ASSIGN_SCORES", 70):
+        ivf = IVFIndex.build(vectors, clusters=10)
+
+    np.testing.assert_allclose(ivf.centroids, expected.centroids, atol=1e-6)
+    np.testing.assert_array_equal(ivf.order, expected.order)
+
+
+def test_ivf_index_pads_missing_rows() -> None:
+    vectors = normalize([[1, 0], [0, 1]])
+    ivf = IVFIndex.build(vectors, clusters=2)
+
+    rows, scores = ivf.search(vectors, [1, 0], k=3, probes=1)
+
+    assert rows.tolist() == [[0, -1, -1]]
+    assert scores[0, 1] == -np.inf
+
+
+def test_vector_index_saves_memory_mapped_vectors(tmp_path, vectors) -> None:
+    path = tmp_path / "vectors.npy"
+    VectorIndex.build(vectors * 3, path)
+
+    index = VectorIndex.load(path)
+
+    assert isinstance(index.vectors, np.memmap)
+    assert not index.vectors.flags.writeable
+    np.testing.assert_allclose(index.vectors, vectors, atol=1e-6)
+    assert index.ivf is None
+    assert not any(path.exists() for path in get_ivf_paths(path))
+
+
+def test_vector_index_uses_ivf_above_threshold(tmp_path, vectors) -> None:
+    path = tmp_path / "vectors.npy"
+    with patch.object(vector_search, "VECTOR_SEARCH_IVF_THRESHOLD", 500):
+        VectorIndex.build(vectors, path)
+        index = VectorIndex.load(path)
+
+    assert index.ivf is not None
+    assert isinstance(index.ivf.order, np.memmap)
+    rows, _ = index.search(vectors[42], k=1)
+    assert rows.tolist() == [[42]]
+
+
+def test_search_indexes_merges_hits() -> None:
+    first = VectorIndex(normalize([[1, 0], [0, 1]]))
+    second = VectorIndex(normalize([[0.8, 0.6]]))
+
+    hits = search_indexes([first, VectorIndex(np.zeros((0, 2))), second], [1, 0], 2)
+
+    assert [(position, row) for position, row, _ in hits] == [(0, 0), (2, 0)]
+
+
+@pytest.mark.parametrize("codes_class", [Int8Codes, BinaryCodes])
+def test_quantized_top_k_rescores_shortlist(vectors, codes_class) -> None:
+    codes = codes_class.build(vectors, batch_rows=64)
+    queries = vectors[:20] + 0.01
+
+    rows, scores = quantized_top_k(
+        vectors, codes, queries, k=3, rescore_factor=10, batch_rows=64
+    )
+
+    assert rows[:, 0].tolist() == list(range(20))
+    np.testing.assert_allclose(
+        scores,
+        np.take_along_axis(normalize(queries) @ vectors.T, rows, axis=1),
+        rtol=1e-5,
+    )
+
+
+def test_int8_codes_approximate_dot_products(vectors) -> None:
+    codes = Int8Codes.build(vectors)
+
+    scores = codes.score(vectors[:5], 0, len(vectors))
+
+    assert codes.codes.dtype == np.int8
+    np.testing.assert_allclose(scores, vectors[:5] @ vectors.T, atol=0.05)
+
+
+def test_binary_codes_score_hamming_distance() -> None:
+    codes = BinaryCodes.build(normalize([[1, 1, 1], [1, -1, 1], [-1, -1, -1]]))
+
+    scores = codes.score(normalize([[1, 1, 1]]), 0, 3)
+
+    assert codes.codes.shape == (3, 8)
+    assert scores.tolist() == [[0, -1, -3]]
+
+
+def test_vector_index_loads_quantized_codes(tmp_path, vectors) -> None:
+    path = tmp_path / "vectors.npy"
+    VectorIndex.build(vectors, path, quantization="binary")
+
+    index = VectorIndex.load(path, quantization="binary")
+
+    assert isinstance(index.codes, BinaryCodes)
+    assert isinstance(index.codes.codes, np.memmap)
+    rows, _ = index.search(vectors[42], k=1)
+    assert rows.tolist() == [[42]]
+    assert VectorIndex.load(path, quantization="int8").codes is None
+    assert VectorIndex.load(path, quantization="none").codes is None
+
+
+def test_vector_index_rejects_unknown_quantization(tmp_path, vectors) -> None:
+    with pytest.raises(ValueError):
+        VectorIndex.build(vectors, tmp_path / "vectors.npy", quantization="int4")
+
+
+def test_delete_vector_index(tmp_path, vectors) -> None:
+    path = tmp_path / "vectors.npy"
+    with patch.object(vector_search, "VECTOR_SEARCH_IVF_THRESHOLD", 500):
+        VectorIndex.build(vectors, path, quantization="int8")
+
+    delete_vector_index(path)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_quantized_codes_require_score() -> None:
+    class IncompleteCodes(QuantizedCodes):
+        name = "incomplete"
+        arrays = ("codes",)
+
+        def __init__(self, codes: np.ndarray):
+            self.codes = codes
+
+        @classmethod
+        def build(cls, vectors, batch_rows=64):
+            return cls(np.asarray(vectors))
+
+    with pytest.raises(TypeError):
+        IncompleteCodes.build(np.zeros((2, 2)))
@@ -3,7 +3,13 @@ from typing import Any, Dict, List
 
 
 class BaseRetrieval:
-    """Base for all retrieval options."""
+    """Base for all retrieval options.
+
+    timeout: float | None: Seconds to wait for documents before dropping them from the turn,
+        None uses the RETRIEVAL_TIMEOUT default.
+    """
+
+    timeout: float | None = None
 
     @abstractmethod
     def retrieve_documents(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]: ...
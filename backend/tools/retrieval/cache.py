@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+
+from backend.services.cache import (
+    CACHE_BACKEND,
+    CACHE_MAX_ENTRIES,
+    BaseCache,
+    create_cache,
+)
+from backend.services.metrics import metrics
+from backend.tools.retrieval.base import BaseRetrieval
+
+"""
+Cache of retrieved documents.
+
+Results are keyed on the retriever class, its constructor kwargs and the
+normalized query, so the same query to the same tool within its TTL doesn't
+call the third-party API again.
+"""
+
+# Backend of the retrieval cache, defaults to CACHE_BACKEND
+RETRIEVAL_CACHE_BACKEND = os.getenv("RETRIEVAL_CACHE_BACKEND", CACHE_BACKEND)
+# Maximum number of cached retriever calls
+RETRIEVAL_CACHE_MAX_ENTRIES = int(
+    os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", str(CACHE_MAX_ENTRIES))
+)
+
+retrieval_cache = create_cache(
+    RETRIEVAL_CACHE_BACKEND, "retrieval", RETRIEVAL_CACHE_MAX_ENTRIES
+)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def get_retrieval_cache_key(
+    retriever_class: type, kwargs: Dict[str, Any], query: str
+) -> str:
+    """
+    Get the cache key of a retriever call.
+
+    Args:
+        retriever_class (type): Retriever implementation.
+        kwargs (Dict[str, Any]): Keyword arguments the retriever was created with.
+        query (str): Search query.
+
+    Returns:
+        str: Cache key.
+    """
+    key = [
+        f"{retriever_class.__module__}.{retriever_class.__qualname__}",
+        kwargs,
+        normalize_query(query),
+    ]
+    return hashlib.sha256(
+        json.dumps(key, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class CachedRetrieval(BaseRetrieval):
+    """
+    Retriever returning cached documents when the same query was retrieved within the TTL.
+
+    Empty results aren't cached, they are often a transient failure of the API.
+    """
+
+    def __init__(
+        self,
+        retriever: BaseRetrieval,
+        kwargs: Dict[str, Any],
+        ttl: float,
+        cache: BaseCache | None = None,
+    ):
+        self.retriever = retriever
+        self.kwargs = kwargs
+        self.ttl = ttl
+        self.cache = retrieval_cache if cache is None else cache
+        self.timeout = retriever.timeout
+
+    def retrieve_documents(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        retriever_name = self.retriever.__class__.__name__
+        key = get_retrieval_cache_key(self.retriever.__class__, self.kwargs, query)
+
+        documents = self.cache.get(key)
+        if documents is not None:
+            metrics.increment("retrieval_cache.hits")
+            metrics.increment(f"retrieval_cache.{retriever_name}.hits")
+            return documents
+
+        metrics.increment("retrieval_cache.misses")
+        metrics.increment(f"retrieval_cache.{retriever_name}.misses")
+        documents = self.retriever.retrieve_documents(query, **kwargs)
+        if documents:
+            self.cache.set(key, documents, self.ttl)
+        return documents
@@ -1,7 +1,17 @@
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from itertools import zip_longest
 from typing import Any, Dict, List
 
 from backend.chat.custom.model_deployments.base import BaseDeployment
+from backend.services.logger import get_logger
+from backend.tools.retrieval.parallel import TimedCall
+from backend.tools.retrieval.rerank_cache import get_relevance_scores
+
+logger = get_logger()
+
+# Seconds to wait for a rerank call once started, before keeping the retrieval order
+RERANK_TIMEOUT = float(os.getenv("RERANK_TIMEOUT", "10"))
 
 
 def combine_documents(
@@ -23,13 +33,17 @@ def combine_documents(
 
 
 def rerank(
-    documents_by_query: Dict[str, List[Dict[str, Any]]], model: BaseDeployment
+    documents_by_query: Dict[str, List[Dict[str, Any]]],
+    model: BaseDeployment,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     Takes a dictionary from queries of lists of documents and
     internally rerank the documents for each query e.g:
     [{"q1":[1, 2, 3],"q2": [4, 5, 6]] -> [{"q1":[2 , 3, 1],"q2": [4, 6, 5]]
 
+    The queries are reranked concurrently on the shared retrieval pool. If reranking
+    a query fails or times out, its documents are kept in retrieval order.
+
     Args:
         documents_by_query (Dict[str, List[Dict[str, Any]]]): Dictionary from queries of lists of documents.
         model (BaseDeployment): Model deployment.
@@ -41,26 +55,49 @@ def rerank(
     if not model.rerank_enabled:
         return documents_by_query
 
-    # rerank the documents by each query
-    all_rerank_docs = {}
-    for query, documents in documents_by_query.items():
-        # Only rerank on text of document
-        # TODO handle no text in document
-        docs_to_rerank = [doc["text"] for doc in documents]
+    # If no documents to rerank, skip the query
+    documents_by_query = {
+        query: documents for query, documents in documents_by_query.items() if documents
+    }
+    if not documents_by_query:
+        return {}
 
-        # If no documents to rerank, continue to the next query
-        if not docs_to_rerank:
-            continue
+    calls = {
+        query: TimedCall(_rerank_query, query, documents, model)
+        for query, documents in documents_by_query.items()
+    }
 
-        res = model.invoke_rerank(query=query, documents=docs_to_rerank)
-        # Sort the results by relevance score
-        res.results.sort(key=lambda x: x.relevance_score, reverse=True)
-        # Map the results back to the original documents
-        all_rerank_docs[query] = [documents[r.index] for r in res.results]
+    all_rerank_docs = {}
+    for query, call in calls.items():
+        try:
+            all_rerank_docs[query] = call.result(RERANK_TIMEOUT)
+        except FutureTimeoutError:
+            logger.warning(f"Rerank timed out for query: {query}")
+            all_rerank_docs[query] = documents_by_query[query]
+        except Exception as e:
+            logger.error(f"Rerank failed for query {query}: {e}")
+            all_rerank_docs[query] = documents_by_query[query]
 
     return all_rerank_docs
 
 
+def _rerank_query(
+    query: str, documents: List[Dict[str, Any]], model: BaseDeployment
+) -> List[Dict[str, Any]]:
+    # Only rerank on text of document
+    # TODO handle no text in document
+    docs_to_rerank = [doc["text"] for doc in documents]
+
+    scores = get_relevance_scores(model, query, docs_to_rerank)
+    # Sort the documents by relevance score, dropping the ones without a score
+    ranked = sorted(
+        (i for i, score in enumerate(scores) if score is not None),
+        key=lambda i: scores[i],
+        reverse=True,
+    )
+    return [documents[i] for i in ranked]
+
+
 def interleave(documents: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """
     Takes a dictionary from queries of lists of documents and interleaves them
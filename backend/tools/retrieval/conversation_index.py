@@ -0,0 +1,201 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from backend.services.logger import get_logger
+from backend.tools.retrieval.base import BaseRetrieval
+from backend.tools.retrieval.file_index import (
+    FileIndex,
+    get_embeddings,
+    get_or_build_file_index,
+)
+from backend.tools.retrieval.vector_search import search_indexes
+
+"""
+Combined vector index of the files of a conversation.
+
+The chunks of every file of a conversation are searched together instead of
+with one pipeline per file. The combined index keeps the memory-mapped index
+of each file, so a file added to the conversation is the only one loaded, a
+removed file is only dropped, and the vectors stay in the page cache shared by
+the workers instead of being copied into each one.
+"""
+
+logger = get_logger()
+
+# Number of chunks returned for a query, across all the files of the conversation
+CONVERSATION_INDEX_TOP_K = int(os.getenv("CONVERSATION_INDEX_TOP_K", "10"))
+# Maximum number of conversation indexes kept in memory by each process
+CONVERSATION_INDEX_MAX_CONVERSATIONS = int(
+    os.getenv("CONVERSATION_INDEX_MAX_CONVERSATIONS", "64")
+)
+
+
+class ConversationIndex:
+    """Saved indexes of several files, searched together."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.file_paths: list[str] = []
+        self.file_indexes: dict[str, FileIndex] = {}
+
+    def update(self, file_paths: List[str], embeddings: Embeddings) -> None:
+        """
+        Add the files missing from the index and remove the ones not in file_paths.
+
+        A file whose index can't be built is logged and left out, the others are still searched.
+
+        Args:
+            file_paths (List[str]): Paths of the files to search.
+            embeddings (Embeddings): Embedding model, used to build missing file indexes.
+        """
+        with self._lock:
+            missing_file_paths = [
+                file_path
+                for file_path in dict.fromkeys(file_paths)
+                if file_path not in self.file_paths
+            ]
+
+        # Outside the lock, loading or building an index doesn't hold up searches
+        loaded_indexes = {
+            file_path: self._load_file(file_path, embeddings)
+            for file_path in missing_file_paths
+        }
+
+        with self._lock:
+            # Replace the dict instead of mutating it, searches hold the previous one
+            file_indexes = {
+                file_path: index
+                for file_path, index in self.file_indexes.items()
+                if file_path in file_paths
+            }
+            self.file_paths = [
+                file_path for file_path in self.file_paths if file_path in file_paths
+            ]
+
+            # A file added by a concurrent update meanwhile is already in file_paths
+            for file_path, file_index in loaded_indexes.items():
+                if file_index is not None and file_path not in self.file_paths:
+                    self._add_file(file_path, file_index, file_indexes)
+
+            self.file_indexes = file_indexes
+
+    def search(self, query_vector: List[float], k: int) -> List[Dict[str, Any]]:
+        """
+        Get the chunks most similar to a query across all files.
+
+        Args:
+            query_vector (List[float]): Embedding of the query.
+            k (int): Number of chunks.
+
+        Returns:
+            List[Dict[str, Any]]: Documents by decreasing cosine similarity, with the file and page of each.
+        """
+        with self._lock:
+            file_indexes = list(self.file_indexes.items())
+
+        hits = search_indexes(
+            [index.index for _, index in file_indexes],
+            np.asarray(query_vector, dtype=np.float32),
+            k,
+        )
+        return [
+            self._to_document(
+                file_indexes[position][1].chunks[row],
+                file_indexes[position][1].pages[row],
+                file_indexes[position][0],
+            )
+            for position, row, _ in hits
+        ]
+
+    @staticmethod
+    def _load_file(file_path: str, embeddings: Embeddings) -> FileIndex | None:
+        try:
+            return get_or_build_file_index(file_path, embeddings)
+        except Exception as e:
+            logger.error(f"Failed to load index for file {file_path}: {e}")
+            return None
+
+    def _add_file(
+        self,
+        file_path: str,
+        file_index: FileIndex,
+        file_indexes: dict[str, FileIndex],
+    ) -> None:
+        self.file_paths.append(file_path)
+        if not file_index.chunks:
+            return
+
+        dims = {index.index.dim for index in file_indexes.values()}
+        if dims and file_index.index.dim not in dims:
+            logger.warning(
+                f"Index of file {file_path} was built with another embedding model, skipping it"
+            )
+            return
+
+        file_indexes[file_path] = file_index
+
+    @staticmethod
+    def _to_document(chunk: str, page: int | None, source: str) -> Dict[str, Any]:
+        document = {"text": chunk, "title": Path(source).name, "file_path": source}
+        if page is not None:
+            document["page"] = str(page + 1)
+        return document
+
+
+_indexes: OrderedDict[str, ConversationIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_conversation_index(
+    key: str, max_conversations: int = CONVERSATION_INDEX_MAX_CONVERSATIONS
+) -> ConversationIndex:
+    """
+    Get the index of a conversation, evicting the least recently used ones.
+
+    Args:
+        key (str): Conversation ID.
+        max_conversations (int): Maximum number of indexes kept in memory.
+
+    Returns:
+        ConversationIndex: Index of the conversation, empty if it's new.
+    """
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ConversationIndex()
+        _indexes.move_to_end(key)
+        while len(_indexes) > max_conversations:
+            _indexes.popitem(last=False)
+        return index
+
+
+def reset_conversation_indexes() -> None:
+    with _indexes_lock:
+        _indexes.clear()
+
+
+class ConversationFilesRetriever(BaseRetrieval):
+    """Retrieves documents from all the files of a conversation with one search."""
+
+    def __init__(
+        self,
+        file_paths: List[str],
+        conversation_id: str | None = None,
+        k: int = CONVERSATION_INDEX_TOP_K,
+    ):
+        self.file_paths = file_paths
+        # Without a conversation, the files are their own index
+        self.key = conversation_id or "\n".join(sorted(file_paths))
+        self.k = k
+
+    def retrieve_documents(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        embeddings = get_embeddings()
+        index = get_conversation_index(self.key)
+        index.update(self.file_paths, embeddings)
+        return index.search(embeddings.embed_query(query), self.k)
@@ -0,0 +1,321 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from backend.services.metrics import metrics
+
+"""
+Content-addressed cache of embeddings.
+
+Embeddings are keyed on the embedding model and the SHA-256 of the text, so
+the same chunk is embedded once whoever uploads it and whatever the file is
+named. Each model's vectors are rows of a float32 matrix memory-mapped from
+disk, and a SQLite index maps keys to rows. When the cache is full, the least
+recently used rows are reused. The files are shared by the processes of the
+host.
+"""
+
+# Folder holding the embedding cache
+EMBEDDING_CACHE_FOLDER = os.getenv(
+    "EMBEDDING_CACHE_FOLDER", "src/backend/data/embedding_cache"
+)
+# Maximum size in bytes of the cached vectors of each model, 0 disables the cache
+EMBEDDING_CACHE_MAX_BYTES = int(
+    os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+# Rows added to a matrix file when it's full
+GROWTH_ROWS = 1024
+
+
+class EmbeddingCache:
+    """Disk-backed embedding cache, safe to use from any thread or process."""
+
+    def __init__(
+        self,
+        folder: str = EMBEDDING_CACHE_FOLDER,
+        max_bytes: int = EMBEDDING_CACHE_MAX_BYTES,
+    ):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._matrices_lock = threading.Lock()
+        self._matrices: dict[str, np.memmap] = {}
+
+    def get_many(self, model: str, texts: List[str]) -> List[np.ndarray | None]:
+        """
+        Get the cached embeddings of texts.
+
+        Args:
+            model (str): Embedding model.
+            texts (List[str]): Texts.
+
+        Returns:
+            List[np.ndarray | None]: Embedding of each text, None if it isn't cached.
+        """
+        keys = [get_text_hash(text) for text in texts]
+        connection = self._get_connection()
+        with self._transaction(connection):
+            meta = connection.execute(
+                "SELECT dim FROM models WHERE model = ?", (model,)
+            ).fetchone()
+            if meta is None:
+                return [None] * len(texts)
+
+            rows = {}
+            for key in set(keys):
+                row = connection.execute(
+                    "SELECT row FROM entries WHERE model = ? AND key = ?", (model, key)
+                ).fetchone()
+                if row is not None:
+                    rows[key] = row[0]
+
+            if not rows:
+                return [None] * len(texts)
+
+            connection.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE model = ? AND key = ?",
+                [(time.time(), model, key) for key in rows],
+            )
+            # Read while holding the lock, so the rows can't be reused meanwhile
+            matrix = self._get_matrix(model, meta[0])
+            vectors = {key: np.array(matrix[row]) for key, row in rows.items()}
+
+        return [vectors.get(key) for key in keys]
+
+    def set_many(
+        self, model: str, texts: List[str], vectors: List[List[float]]
+    ) -> None:
+        """
+        Cache the embeddings of texts, evicting the least recently used ones if the cache is full.
+
+        Args:
+            model (str): Embedding model.
+            texts (List[str]): Texts.
+            vectors (List[List[float]]): Embedding of each text.
+        """
+        if not texts:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        capacity = self.max_bytes // (dim * np.dtype(np.float32).itemsize)
+        if capacity <= 0:
+            return
+
+        connection = self._get_connection()
+        now = time.time()
+        with self._transaction(connection):
+            meta = connection.execute(
+                "SELECT dim, rows FROM models WHERE model = ?", (model,)
+            ).fetchone()
+            if meta is None:
+                meta = (dim, 0)
+                connection.execute(
+                    "INSERT INTO models (model, dim, rows) VALUES (?, ?, 0)",
+                    (model, dim),
+                )
+            if meta[0] != dim:
+                return
+
+            allocated_rows = meta[1]
+            new_entries = {}
+            for text, vector in zip(texts, vectors):
+                key = get_text_hash(text)
+                if key in new_entries or self._has_entry(connection, model, key):
+                    continue
+
+                if allocated_rows < capacity:
+                    row = allocated_rows
+                    allocated_rows += 1
+                else:
+                    row = self._evict(connection, model, now)
+                    if row is None:
+                        # Everything cached is from this batch
+                        break
+
+                new_entries[key] = (row, vector)
+
+            if not new_entries:
+                return
+
+            matrix = self._get_matrix(model, dim, allocated_rows, capacity)
+            for row, vector in new_entries.values():
+                matrix[row] = vector
+            matrix.flush()
+
+            connection.executemany(
+                "INSERT INTO entries (model, key, row, accessed_at) VALUES (?, ?, ?, ?)",
+                [(model, key, row, now) for key, (row, _) in new_entries.items()],
+            )
+            connection.execute(
+                "UPDATE models SET rows = ? WHERE model = ?", (allocated_rows, model)
+            )
+
+    def clear(self) -> None:
+        connection = self._get_connection()
+        with self._transaction(connection):
+            connection.execute("DELETE FROM entries")
+            connection.execute("DELETE FROM models")
+            with self._matrices_lock:
+                self._matrices.clear()
+            for path in self.folder.glob("*.f32"):
+                path.unlink()
+
+    def _has_entry(self, connection: sqlite3.Connection, model: str, key: str) -> bool:
+        return (
+            connection.execute(
+                "SELECT 1 FROM entries WHERE model = ? AND key = ?", (model, key)
+            ).fetchone()
+            is not None
+        )
+
+    def _evict(
+        self, connection: sqlite3.Connection, model: str, now: float
+    ) -> int | None:
+        entry = connection.execute(
+            "SELECT key, row FROM entries WHERE model = ? AND accessed_at < ? "
+            "ORDER BY accessed_at LIMIT 1",
+            (model, now),
+        ).fetchone()
+        if entry is None:
+            return None
+
+        connection.execute(
+            "DELETE FROM entries WHERE model = ? AND key = ?", (model, entry[0])
+        )
+        metrics.increment("embedding_cache.evictions")
+        return entry[1]
+
+    def _get_matrix(
+        self, model: str, dim: int, min_rows: int = 0, max_rows: int = 0
+    ) -> np.memmap:
+        # Called inside a transaction, which serializes file growth between processes
+        path = self.folder / f"{get_text_hash(model)}.f32"
+        row_size = dim * np.dtype(np.float32).itemsize
+        with self._matrices_lock:
+            size = path.stat().st_size if path.exists() else 0
+            if size < min_rows * row_size:
+                size = max(min(min_rows + GROWTH_ROWS, max_rows), min_rows) * row_size
+                with path.open("ab") as f:
+                    f.truncate(size)
+
+            matrix = self._matrices.get(model)
+            # Map again when another process or call grew the file
+            if matrix is None or matrix.shape[0] * row_size != size:
+                matrix = np.memmap(
+                    path, dtype=np.float32, mode="r+", shape=(size // row_size, dim)
+                )
+                self._matrices[model] = matrix
+
+            return matrix
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.folder / "index.sqlite", timeout=30, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS models ("
+            "model TEXT PRIMARY KEY, dim INTEGER NOT NULL, rows INTEGER NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "model TEXT NOT NULL, key TEXT NOT NULL, row INTEGER NOT NULL, "
+            "accessed_at REAL NOT NULL, PRIMARY KEY (model, key))"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_entries_model_accessed_at "
+            "ON entries (model, accessed_at)"
+        )
+        self._local.connection = connection
+        return connection
+
+    @staticmethod
+    @contextmanager
+    def _transaction(
+        connection: sqlite3.Connection,
+    ) -> Generator[sqlite3.Connection, None, None]:
+        # Takes the write lock up front, so allocating and reading rows is atomic
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings returning cached vectors for texts embedded before.
+
+    Documents and queries are cached separately, models embed them differently.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        cache: EmbeddingCache | None = None,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.cache = embedding_cache if cache is None else cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(
+            f"{self.model}:document", texts, self.embeddings.embed_documents
+        )
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(
+            f"{self.model}:query",
+            [text],
+            lambda texts: [self.embeddings.embed_query(texts[0])],
+        )[0]
+
+    def _embed(self, model: str, texts: List[str], embed) -> List[List[float]]:
+        vectors = self.cache.get_many(model, texts)
+        hits = sum(vector is not None for vector in vectors)
+        metrics.increment("embedding_cache.hits", hits)
+        metrics.increment("embedding_cache.misses", len(texts) - hits)
+
+        # Embed each uncached text once, even if it's repeated
+        missing = list(
+            dict.fromkeys(
+                text for text, vector in zip(texts, vectors) if vector is None
+            )
+        )
+
+        if missing:
+            new_vectors = embed(missing)
+            self.cache.set_many(model, missing, new_vectors)
+            by_text = dict(zip(missing, new_vectors))
+            vectors = [
+                by_text[text] if vector is None else vector
+                for text, vector in zip(texts, vectors)
+            ]
+
+        return [np.asarray(vector, dtype=np.float32).tolist() for vector in vectors]
+
+
+def get_text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from langchain.text_splitter import CharacterTextSplitter
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.embeddings import CohereEmbeddings
+from langchain_core.embeddings import Embeddings
+
+from backend.services.logger import get_logger
+from backend.tools.retrieval.embedding_cache import (
+    EMBEDDING_CACHE_MAX_BYTES,
+    CachedEmbeddings,
+)
+from backend.tools.retrieval.vector_search import VectorIndex, delete_vector_index
+
+"""
+Vector indexes of uploaded files.
+
+A file is split and embedded once, when it's uploaded, and its index is saved
+next to the uploaded files: the normalized chunk embeddings as a .npy array
+and the chunk texts as JSON. A query only embeds the query text and searches
+the saved array, memory-mapped, see vector_search.
+"""
+
+logger = get_logger()
+
+# Folder holding the vector indexes of uploaded files
+FILE_INDEX_FOLDER = os.getenv("FILE_INDEX_FOLDER", "src/backend/data/indexes")
+# Number of chunks returned for a query
+FILE_INDEX_TOP_K = int(os.getenv("FILE_INDEX_TOP_K", "4"))
+
+CHUNK_SIZE = 300
+CHUNK_OVERLAP = 0
+
+# Only one thread builds the index of a file, the others wait for it
+_build_locks: dict[str, threading.Lock] = {}
+_build_locks_lock = threading.Lock()
+
+
+class FileIndex:
+    """Chunks of a file, the page each chunk starts on and their normalized embeddings."""
+
+    def __init__(
+        self,
+        chunks: List[str],
+        vectors: np.ndarray | VectorIndex,
+        pages: List[int | None] | None = None,
+    ):
+        self.chunks = chunks
+        self.index = (
+            vectors if isinstance(vectors, VectorIndex) else VectorIndex(vectors)
+        )
+        self.pages = [None] * len(chunks) if pages is None else pages
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self.index.vectors
+
+    def search(self, query_vector: List[float], k: int = FILE_INDEX_TOP_K) -> List[str]:
+        """
+        Get the chunks most similar to a query.
+
+        Args:
+            query_vector (List[float]): Embedding of the query.
+            k (int): Number of chunks.
+
+        Returns:
+            List[str]: Chunks by decreasing cosine similarity.
+        """
+        if not self.chunks:
+            return []
+
+        rows, _ = self.index.search(np.asarray(query_vector, dtype=np.float32), k)
+        return [self.chunks[row] for row in rows[0] if row >= 0]
+
+
+def get_embeddings() -> Embeddings:
+    embeddings = CohereEmbeddings(cohere_api_key=os.environ["COHERE_API_KEY"])
+    if EMBEDDING_CACHE_MAX_BYTES <= 0:
+        return embeddings
+
+    return CachedEmbeddings(embeddings, f"cohere:{embeddings.model}")
+
+
+def get_index_paths(file_path: str) -> tuple[Path, Path]:
+    """
+    Get the paths of the vectors and the metadata of a file's index.
+
+    Args:
+        file_path (str): Path of the uploaded file.
+
+    Returns:
+        tuple[Path, Path]: Path of the .npy vectors and of the .json metadata.
+    """
+    name = hashlib.sha256(str(Path(file_path).resolve()).encode()).hexdigest()
+    folder = Path(FILE_INDEX_FOLDER)
+    return folder / f"{name}.npy", folder / f"{name}.json"
+
+
+def split_file(file_path: str) -> tuple[List[str], List[int | None]]:
+    """
+    Split a PDF file into chunks.
+
+    Args:
+        file_path (str): Path of the file.
+
+    Returns:
+        tuple[List[str], List[int | None]]: Chunk texts, and the zero-based page of each chunk.
+    """
+    loader = PyPDFLoader(file_path)
+    text_splitter = CharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+    )
+    documents = loader.load_and_split(text_splitter)
+    return [document.page_content for document in documents], [
+        document.metadata.get("page") for document in documents
+    ]
+
+
+def build_file_index(file_path: str, embeddings: Embeddings | None = None) -> FileIndex:
+    """
+    Split and embed a file, and save its index.
+
+    Args:
+        file_path (str): Path of the uploaded file.
+        embeddings (Embeddings | None): Embedding model, Cohere if None.
+
+    Returns:
+        FileIndex: Index of the file.
+    """
+    embeddings = get_embeddings() if embeddings is None else embeddings
+    chunks, pages = split_file(file_path)
+
+    if chunks:
+        vectors = np.asarray(embeddings.embed_documents(chunks), dtype=np.float32)
+    else:
+        vectors = np.zeros((0, 0), dtype=np.float32)
+
+    vectors_path, metadata_path = get_index_paths(file_path)
+    metadata = {
+        "file": _get_file_signature(file_path),
+        "chunks": chunks,
+        "pages": pages,
+    }
+
+    # The metadata is renamed last, so readers never see it with partial vectors
+    index = VectorIndex.build(vectors, vectors_path)
+    tmp_metadata_path = metadata_path.with_suffix(".tmp.json")
+    tmp_metadata_path.write_text(json.dumps(metadata))
+    os.replace(tmp_metadata_path, metadata_path)
+
+    logger.info(f"Built index of {len(chunks)} chunks for file {file_path}")
+    return FileIndex(chunks, index, pages)
+
+
+def load_file_index(file_path: str) -> FileIndex | None:
+    """
+    Load the saved index of a file.
+
+    Args:
+        file_path (str): Path of the uploaded file.
+
+    Returns:
+        FileIndex | None: Index of the file, None if it's missing or the file changed since.
+    """
+    vectors_path, metadata_path = get_index_paths(file_path)
+    try:
+        metadata = json.loads(metadata_path.read_text())
+        if metadata["file"] != _get_file_signature(file_path):
+            return None
+        index = VectorIndex.load(vectors_path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return FileIndex(metadata["chunks"], index, metadata.get("pages"))
+
+
+def get_or_build_file_index(
+    file_path: str, embeddings: Embeddings | None = None
+) -> FileIndex:
+    """
+    Load the index of a file, building it if it's missing.
+
+    Args:
+        file_path (str): Path of the uploaded file.
+        embeddings (Embeddings | None): Embedding model, Cohere if None.
+
+    Returns:
+        FileIndex: Index of the file.
+    """
+    index = load_file_index(file_path)
+    if index is not None:
+        return index
+
+    with _get_build_lock(file_path):
+        # Another thread may have built it while this one waited
+        index = load_file_index(file_path)
+        if index is None:
+            index = build_file_index(file_path, embeddings)
+
+    return index
+
+
+def index_uploaded_file(file_path: str) -> None:
+    """
+    Build the index of an uploaded file, run as a background task of the upload.
+
+    Failures are logged, the index is then built on the first query instead.
+
+    Args:
+        file_path (str): Path of the uploaded file.
+    """
+    if Path(file_path).suffix.lower() != ".pdf":
+        return
+
+    try:
+        get_or_build_file_index(file_path)
+    except Exception as e:
+        logger.error(f"Failed to build index for file {file_path}: {e}")
+
+
+def delete_file_index(file_path: str) -> None:
+    """
+    Delete the index of a file.
+
+    Args:
+        file_path (str): Path of the uploaded file.
+    """
+    vectors_path, metadata_path = get_index_paths(file_path)
+    metadata_path.unlink(missing_ok=True)
+    delete_vector_index(vectors_path)
+
+
+def search_file(
+    file_path: str,
+    query: str,
+    k: int = FILE_INDEX_TOP_K,
+    embeddings: Embeddings | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Get the chunks of a file most similar to a query.
+
+    Args:
+        file_path (str): Path of the uploaded file.
+        query (str): Search query.
+        k (int): Number of chunks.
+        embeddings (Embeddings | None): Embedding model, Cohere if None.
+
+    Returns:
+        List[Dict[str, Any]]: Documents with the chunk text.
+    """
+    embeddings = get_embeddings() if embeddings is None else embeddings
+    index = get_or_build_file_index(file_path, embeddings)
+    if not index.chunks:
+        return []
+
+    chunks = index.search(embeddings.embed_query(query), k)
+    return [{"text": chunk} for chunk in chunks]
+
+
+def _get_file_signature(file_path: str) -> Dict[str, Any]:
+    # A file replaced at the same path gets a new signature, invalidating its index
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _get_build_lock(file_path: str) -> threading.Lock:
+    with _build_locks_lock:
+        return _build_locks.setdefault(str(Path(file_path).resolve()), threading.Lock())
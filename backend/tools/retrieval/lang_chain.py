@@ -1,13 +1,11 @@
-import os
 from typing import Any, Dict, List
 
 from langchain.text_splitter import CharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.embeddings import CohereEmbeddings
 from langchain_community.retrievers import WikipediaRetriever
-from langchain_community.vectorstores import Chroma
 
 from backend.tools.retrieval.base import BaseRetrieval
+from backend.tools.retrieval.conversation_index import ConversationFilesRetriever
+from backend.tools.retrieval.file_index import search_file
 
 """
 Plug in your lang chain retrieval implementation here. 
@@ -47,23 +45,29 @@ class LangChainWikiRetriever(BaseRetrieval):
 
 class LangChainVectorDBRetriever(BaseRetrieval):
     """
-    This class retrieves documents from a vector database using the langchain package.
-    This requires chromadb package to be installed:
-     pip install chromadb
+    This class retrieves documents from a file using its vector index.
+    The index is built when the file is uploaded, or on the first query if that failed,
+    see backend/tools/retrieval/file_index.py.
     """
 
     def __init__(self, filepath: str):
         self.filepath = filepath
 
+    @classmethod
+    def from_file_paths(
+        cls, file_paths: List[str], conversation_id: str | None = None
+    ) -> BaseRetrieval:
+        """
+        Get one retriever searching all the files of a conversation at once.
+
+        Args:
+            file_paths (List[str]): Paths of the files.
+            conversation_id (str | None): Conversation the files are attached to.
+
+        Returns:
+            BaseRetrieval: Retriever over the combined index of the files.
+        """
+        return ConversationFilesRetriever(file_paths, conversation_id)
+
     def retrieve_documents(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]:
-        cohere_embeddings = CohereEmbeddings(
-            cohere_api_key=os.environ["COHERE_API_KEY"]
-        )
-        # Load text files and split into chunks
-        loader = PyPDFLoader(self.filepath)
-        text_splitter = CharacterTextSplitter(chunk_size=300, chunk_overlap=0)
-        pages = loader.load_and_split(text_splitter)
-        # Create a vector store from the documents
-        db = Chroma.from_documents(pages, cohere_embeddings)
-        input_docs = db.as_retriever().get_relevant_documents(query)
-        return [dict({"text": doc.page_content}) for doc in input_docs]
+        return search_file(self.filepath, query)
@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List
+
+from backend.services.logger import get_logger
+from backend.tools.retrieval.base import BaseRetrieval
+
+logger = get_logger()
+
+# Retriever and rerank calls running at once across all chat turns of the process
+RETRIEVAL_MAX_WORKERS = int(os.getenv("RETRIEVAL_MAX_WORKERS", "8"))
+# Seconds to wait for a retriever before its results are dropped from the turn
+RETRIEVAL_TIMEOUT = float(os.getenv("RETRIEVAL_TIMEOUT", "10"))
+# Seconds a call can wait for a free worker before it is dropped without running
+RETRIEVAL_QUEUE_TIMEOUT = float(
+    os.getenv("RETRIEVAL_QUEUE_TIMEOUT", str(RETRIEVAL_TIMEOUT))
+)
+
+# Shared by every turn, so slow or hung calls can't pile up threads under load
+retrieval_executor = ThreadPoolExecutor(
+    max_workers=RETRIEVAL_MAX_WORKERS, thread_name_prefix="retrieval"
+)
+
+
+class TimedCall:
+    """
+    Call running on the shared retrieval pool, timed from when a worker starts it.
+
+    Calls waiting for a worker don't use up their timeout, they are dropped
+    if no worker is free within the queue timeout instead.
+    """
+
+    def __init__(self, fn: Callable[..., Any], *args: Any):
+        self.fn = fn
+        self.args = args
+        self.started_at: float | None = None
+        self._started = threading.Event()
+        self.submitted_at = time.monotonic()
+        self.future: Future = retrieval_executor.submit(self._run)
+
+    def _run(self) -> Any:
+        self.started_at = time.monotonic()
+        self._started.set()
+        return self.fn(*self.args)
+
+    def result(self, timeout: float, queue_timeout: float | None = None) -> Any:
+        """
+        Wait for the result of the call.
+
+        Args:
+            timeout (float): Seconds the call can run for.
+            queue_timeout (float | None): Seconds the call can wait for a free worker, RETRIEVAL_QUEUE_TIMEOUT if None.
+
+        Returns:
+            Any: Result of the call.
+
+        Raises:
+            TimeoutError: If the call didn't start or finish in time.
+            Exception: Any exception raised by the call.
+        """
+        if queue_timeout is None:
+            queue_timeout = RETRIEVAL_QUEUE_TIMEOUT
+
+        queue_deadline = self.submitted_at + queue_timeout
+        if not self._started.wait(max(0, queue_deadline - time.monotonic())):
+            if self.future.cancel():
+                raise FutureTimeoutError()
+            # A worker picked it up meanwhile
+            self._started.wait()
+
+        return self.future.result(
+            timeout=max(0, self.started_at + timeout - time.monotonic())
+        )
+
+
+def get_retriever_timeout(retriever: BaseRetrieval) -> float:
+    """
+    Get the timeout for a retriever, falling back to the global default.
+
+    Args:
+        retriever (BaseRetrieval): Retriever implementation.
+
+    Returns:
+        float: Timeout in seconds.
+    """
+    timeout = getattr(retriever, "timeout", None)
+    return RETRIEVAL_TIMEOUT if timeout is None else timeout
+
+
+def retrieve_documents_in_parallel(
+    retrievers: List[BaseRetrieval], queries: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Calls every retriever with every query concurrently on the shared retrieval pool.
+
+    Each retriever × query call is isolated: if it raises, doesn't get a worker
+    within RETRIEVAL_QUEUE_TIMEOUT or doesn't finish within the retriever's
+    timeout once started, it is logged and contributes no documents.
+    Documents are grouped by query in retriever order, matching the sequential
+    implementation so that `combine_documents` receives the same shape.
+
+    Args:
+        retrievers (List[BaseRetrieval]): Retriever implementations.
+        queries (List[str]): Search queries.
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Dictionary from queries of lists of documents.
+    """
+    all_documents = {}
+    if not retrievers or not queries:
+        return all_documents
+
+    calls = [
+        (retriever, query, TimedCall(retriever.retrieve_documents, query))
+        for retriever in retrievers
+        for query in queries
+    ]
+    for retriever, query, call in calls:
+        documents = _get_result(call, retriever, query)
+        all_documents.setdefault(query, []).extend(documents)
+
+    return all_documents
+
+
+def _get_result(
+    call: TimedCall, retriever: BaseRetrieval, query: str
+) -> List[Dict[str, Any]]:
+    retriever_name = retriever.__class__.__name__
+    try:
+        documents = call.result(get_retriever_timeout(retriever))
+    except FutureTimeoutError:
+        logger.warning(f"Retriever {retriever_name} timed out for query: {query}")
+        return []
+    except Exception as e:
+        logger.error(f"Retriever {retriever_name} failed for query {query}: {e}")
+        return []
+
+    return documents or []
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from typing import List
+
+from backend.chat.custom.model_deployments.base import BaseDeployment
+from backend.services.cache import CACHE_BACKEND, BaseCache, create_cache
+from backend.services.metrics import metrics
+
+"""
+Cache of rerank relevance scores.
+
+Scores are cached per rerank model, query and document text, so a rerank call
+only sends the documents that weren't scored for the query before.
+"""
+
+# Seconds rerank scores are cached for, 0 disables the cache
+RERANK_CACHE_TTL = float(os.getenv("RERANK_CACHE_TTL", "86400"))
+# Backend of the rerank cache, defaults to CACHE_BACKEND
+RERANK_CACHE_BACKEND = os.getenv("RERANK_CACHE_BACKEND", CACHE_BACKEND)
+# Maximum number of cached scores, one per query and document
+RERANK_CACHE_MAX_ENTRIES = int(os.getenv("RERANK_CACHE_MAX_ENTRIES", "20000"))
+
+rerank_cache = create_cache(RERANK_CACHE_BACKEND, "rerank", RERANK_CACHE_MAX_ENTRIES)
+
+
+def get_rerank_model_name(model: BaseDeployment) -> str:
+    return f"{model.__class__.__name__}:{model.rerank_model}"
+
+
+def get_rerank_cache_key(rerank_model: str, query: str, text: str) -> str:
+    """
+    Get the cache key of the score of a document for a query.
+
+    Args:
+        rerank_model (str): Rerank model, see get_rerank_model_name.
+        query (str): Search query.
+        text (str): Document text.
+
+    Returns:
+        str: Cache key.
+    """
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
+    key = [rerank_model, query, text_hash]
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+
+def get_relevance_scores(
+    model: BaseDeployment,
+    query: str,
+    texts: List[str],
+    cache: BaseCache | None = None,
+    ttl: float = RERANK_CACHE_TTL,
+) -> List[float | None]:
+    """
+    Score documents for a query, only reranking the documents without a cached score.
+
+    Args:
+        model (BaseDeployment): Deployment used to rerank.
+        query (str): Search query.
+        texts (List[str]): Document texts.
+        cache (BaseCache | None): Cache to use, the shared rerank cache if None.
+        ttl (float): Seconds the scores are cached for, 0 disables the cache.
+
+    Returns:
+        List[float | None]: Relevance score of each text, None if the rerank didn't return it.
+    """
+    if ttl <= 0:
+        return _invoke_rerank(model, query, texts)
+
+    cache = rerank_cache if cache is None else cache
+    rerank_model = get_rerank_model_name(model)
+    keys = [get_rerank_cache_key(rerank_model, query, text) for text in texts]
+    scores = cache.get_many(keys)
+
+    # Send each uncached text once, even if it's repeated in the documents
+    uncached = {key: text for key, text in zip(keys, texts) if key not in scores}
+    metrics.increment("rerank_cache.hits", len(set(keys)) - len(uncached))
+    metrics.increment("rerank_cache.misses", len(uncached))
+
+    if uncached:
+        new_scores = _invoke_rerank(model, query, list(uncached.values()))
+        new_scores = {
+            key: score for key, score in zip(uncached, new_scores) if score is not None
+        }
+        cache.set_many(new_scores, ttl)
+        scores.update(new_scores)
+
+    return [scores.get(key) for key in keys]
+
+
+def _invoke_rerank(
+    model: BaseDeployment, query: str, texts: List[str]
+) -> List[float | None]:
+    res = model.invoke_rerank(query=query, documents=texts)
+    scores = [None] * len(texts)
+    for result in res.results:
+        scores[result.index] = result.relevance_score
+    return scores
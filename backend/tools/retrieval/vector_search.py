@@ -0,0 +1,681 @@
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+import numpy as np
+
+"""
+Local vector search over memory-mapped NumPy arrays.
+
+Vectors are saved as normalized float32 .npy files and opened read-only with
+mmap, so every worker of the host shares them through the page cache instead
+of loading its own copy. Search is an exact cosine top-k, streamed over blocks
+of rows to bound memory. Collections above VECTOR_SEARCH_IVF_THRESHOLD rows
+also get an inverted file (IVF) index: rows are clustered with k-means and a
+query only scores the rows of its nearest clusters.
+
+With VECTOR_SEARCH_QUANTIZATION, a quantized copy of the vectors is saved
+too: int8 codes, 4 times smaller, or sign bits, 32 times smaller. Searches
+scan the codes and only read the float32 rows of a shortlist to rescore it,
+so the codes are what stays in the page cache.
+"""
+
+# Rows scored at once, bounds the memory of a search to rows x queries scores
+VECTOR_SEARCH_BATCH_ROWS = int(os.getenv("VECTOR_SEARCH_BATCH_ROWS", "65536"))
+# Number of rows above which an approximate IVF index is built
+VECTOR_SEARCH_IVF_THRESHOLD = int(os.getenv("VECTOR_SEARCH_IVF_THRESHOLD", "200000"))
+# Number of nearest IVF clusters scored for each query, more is slower but more exact
+VECTOR_SEARCH_IVF_PROBES = int(os.getenv("VECTOR_SEARCH_IVF_PROBES", "32"))
+# Quantized copy of the vectors scanned before rescoring: none, int8 or binary
+VECTOR_SEARCH_QUANTIZATION = os.getenv("VECTOR_SEARCH_QUANTIZATION", "none")
+# Rows rescored with the float32 vectors for each query, as a multiple of k
+VECTOR_SEARCH_RESCORE_FACTOR = int(os.getenv("VECTOR_SEARCH_RESCORE_FACTOR", "4"))
+
+IVF_ARRAYS = ("centroids", "order", "offsets")
+# Scores of rows against centroids held at once when clustering, 64MB of float32
+IVF_ASSIGN_SCORES = 16 * 2**20
+# Int8 codes cast to float32 at once when scoring them
+INT8_CAST_ROWS = 4096
+# Masks of the SWAR popcount of 64-bit words
+POPCOUNT_MASKS = [
+    np.uint64(mask)
+    for mask in (0x5555555555555555, 0x3333333333333333, 0x0F0F0F0F0F0F0F0F)
+]
+POPCOUNT_BYTES = np.uint64(0x0101010101010101)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale vectors to unit length, zero vectors are left as is.
+
+    Args:
+        vectors (np.ndarray): Vectors, one per row.
+
+    Returns:
+        np.ndarray: Normalized float32 vectors.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def cosine_top_k(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    batch_rows: int = VECTOR_SEARCH_BATCH_ROWS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Exact top-k rows by cosine similarity for a batch of queries.
+
+    Args:
+        vectors (np.ndarray): Normalized vectors, one per row, can be memory-mapped.
+        queries (np.ndarray): Query vectors, one per row.
+        k (int): Number of rows per query.
+        batch_rows (int): Rows scored at once.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Row indices and scores, (queries, k) each by decreasing score.
+    """
+    queries = normalize(np.atleast_2d(queries))
+    return _scan_top_k(
+        lambda start, stop: queries @ np.asarray(vectors[start:stop]).T,
+        len(vectors),
+        len(queries),
+        k,
+        batch_rows,
+    )
+
+
+def quantized_top_k(
+    vectors: np.ndarray,
+    codes: "QuantizedCodes",
+    queries: np.ndarray,
+    k: int,
+    rescore_factor: int = VECTOR_SEARCH_RESCORE_FACTOR,
+    batch_rows: int = VECTOR_SEARCH_BATCH_ROWS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k rows by cosine similarity, shortlisted on quantized codes and rescored with the vectors.
+
+    Args:
+        vectors (np.ndarray): Normalized vectors, one per row, can be memory-mapped.
+        codes (QuantizedCodes): Quantized codes of the vectors.
+        queries (np.ndarray): Query vectors, one per row.
+        k (int): Number of rows per query.
+        rescore_factor (int): Rows rescored per query, as a multiple of k.
+        batch_rows (int): Rows scored at once.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Row indices and exact scores, (queries, k) each by decreasing score.
+    """
+    queries = normalize(np.atleast_2d(queries))
+    k = min(k, len(vectors))
+    shortlists, _ = _scan_top_k(
+        lambda start, stop: codes.score(queries, start, stop),
+        len(vectors),
+        len(queries),
+        k * rescore_factor,
+        batch_rows,
+    )
+
+    all_rows = np.empty((len(queries), k), dtype=np.int64)
+    all_scores = np.empty((len(queries), k), dtype=np.float32)
+    for i, (query, shortlist) in enumerate(zip(queries, shortlists)):
+        all_rows[i], all_scores[i] = _rescore(vectors, query, shortlist, k)
+
+    return all_rows, all_scores
+
+
+class IVFIndex:
+    """
+    Inverted file index: cluster centroids, row ids grouped by cluster and the offset of each cluster.
+    """
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        clusters: int | None = None,
+        iterations: int = 10,
+        sample_size: int = 100_000,
+        batch_rows: int = VECTOR_SEARCH_BATCH_ROWS,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Cluster normalized vectors with spherical k-means trained on a sample.
+
+        Args:
+            vectors (np.ndarray): Normalized vectors, one per row.
+            clusters (int | None): Number of clusters, 4 x sqrt(rows) if None.
+            iterations (int): k-means iterations.
+            sample_size (int): Minimum rows the centroids are trained on.
+            batch_rows (int): Rows assigned to clusters at once, fewer if their
+                scores against the centroids would exceed IVF_ASSIGN_SCORES.
+            seed (int): Random seed of the sample and initial centroids.
+
+        Returns:
+            IVFIndex: Index of the vectors.
+        """
+        rng = np.random.default_rng(seed)
+        clusters = clusters or max(1, int(4 * np.sqrt(len(vectors))))
+        clusters = min(clusters, len(vectors))
+
+        # Train on enough rows per cluster for the centroids to follow the data
+        sample_size = min(max(sample_size, 32 * clusters), len(vectors))
+        sample_rows = np.sort(rng.choice(len(vectors), sample_size, replace=False))
+        sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), clusters, replace=False)]
+        for _ in range(iterations):
+            sums = np.zeros_like(centroids)
+            counts = np.zeros(clusters, dtype=np.int64)
+            for start, assignments in _assign_clusters(sample, centroids, batch_rows):
+                np.add.at(sums, assignments, sample[start : start + len(assignments)])
+                counts += np.bincount(assignments, minlength=clusters)
+            # Keep the previous centroid of a cluster that lost all its rows
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = normalize(sums)
+
+        assignments = np.concatenate(
+            [
+                assignments
+                for _, assignments in _assign_clusters(vectors, centroids, batch_rows)
+            ]
+        )
+        # Rows of a cluster stay in file order, so reading them is mostly sequential
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignments, minlength=clusters))]
+        )
+        return cls(centroids, order, offsets)
+
+    def search(
+        self,
+        vectors: np.ndarray,
+        queries: np.ndarray,
+        k: int,
+        probes: int = VECTOR_SEARCH_IVF_PROBES,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k rows by cosine similarity, scoring the rows of the nearest clusters.
+
+        Args:
+            vectors (np.ndarray): Normalized vectors the index was built on.
+            queries (np.ndarray): Query vectors, one per row.
+            k (int): Number of rows per query.
+            probes (int): Number of clusters scored per query.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Row indices and scores, (queries, k) each by decreasing score.
+                Queries with fewer candidate rows than k are padded with -1 rows and -inf scores.
+        """
+        queries = normalize(np.atleast_2d(queries))
+        probes = min(probes, len(self.centroids))
+        nearest, _ = _top_k(queries @ self.centroids.T, probes)
+
+        all_rows = np.full((len(queries), k), -1, dtype=np.int64)
+        all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for i, (query, clusters) in enumerate(zip(queries, nearest)):
+            candidates = np.concatenate(
+                [self.order[self.offsets[c] : self.offsets[c + 1]] for c in clusters]
+            )
+            rows, scores = _rescore(vectors, query, candidates, k)
+            all_rows[i, : len(rows)] = rows
+            all_scores[i, : len(rows)] = scores
+
+        return all_rows, all_scores
+
+    def save(self, vectors_path: Path) -> None:
+        for name, path in zip(IVF_ARRAYS, get_ivf_paths(vectors_path)):
+            _save_atomically(path, getattr(self, name))
+
+    @classmethod
+    def load(cls, vectors_path: Path) -> "IVFIndex | None":
+        try:
+            arrays = [
+                np.load(path, mmap_mode="r") for path in get_ivf_paths(vectors_path)
+            ]
+        except (OSError, ValueError):
+            return None
+
+        return cls(*arrays)
+
+
+class QuantizedCodes(ABC):
+    """
+    Compact copy of normalized vectors, scoring rows approximately.
+
+    Subclasses name their arrays, saved next to the vectors as {name}_{array}.npy files.
+    """
+
+    name: str
+    arrays: tuple[str, ...]
+    codes: np.ndarray
+
+    @classmethod
+    @abstractmethod
+    def build(
+        cls, vectors: np.ndarray, batch_rows: int = VECTOR_SEARCH_BATCH_ROWS
+    ) -> "QuantizedCodes":
+        """
+        Quantize normalized vectors.
+
+        Args:
+            vectors (np.ndarray): Normalized vectors, one per row, can be memory-mapped.
+            batch_rows (int): Rows quantized at once.
+
+        Returns:
+            QuantizedCodes: Codes of the vectors.
+        """
+        ...
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @abstractmethod
+    def score(self, queries: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """
+        Approximate similarity of normalized queries with a block of rows, higher is more similar.
+
+        Args:
+            queries (np.ndarray): Normalized query vectors, one per row.
+            start (int): First row.
+            stop (int): Row after the last one.
+
+        Returns:
+            np.ndarray: Scores, (queries, rows).
+        """
+        ...
+
+    def save(self, vectors_path: Path) -> None:
+        for name, path in zip(self.arrays, self.get_paths(vectors_path)):
+            _save_atomically(path, getattr(self, name))
+
+    @classmethod
+    def load(cls, vectors_path: Path) -> "QuantizedCodes | None":
+        try:
+            arrays = [
+                np.load(path, mmap_mode="r") for path in cls.get_paths(vectors_path)
+            ]
+        except (OSError, ValueError):
+            return None
+
+        return cls(*arrays)
+
+    @classmethod
+    def get_paths(cls, vectors_path: Path) -> List[Path]:
+        return [
+            vectors_path.with_suffix(f".{cls.name}_{array}.npy") for array in cls.arrays
+        ]
+
+    @classmethod
+    def delete(cls, vectors_path: Path) -> None:
+        for path in cls.get_paths(vectors_path):
+            path.unlink(missing_ok=True)
+
+
+class Int8Codes(QuantizedCodes):
+    """Vectors scaled per dimension to int8, 4 times smaller than float32."""
+
+    name = "int8"
+    arrays = ("codes", "scales")
+
+    def __init__(self, codes: np.ndarray, scales: np.ndarray):
+        self.codes = codes
+        self.scales = scales
+
+    @classmethod
+    def build(
+        cls, vectors: np.ndarray, batch_rows: int = VECTOR_SEARCH_BATCH_ROWS
+    ) -> "Int8Codes":
+        scales = np.zeros(vectors.shape[1], dtype=np.float32)
+        for start in range(0, len(vectors), batch_rows):
+            block = np.abs(np.asarray(vectors[start : start + batch_rows]))
+            scales = np.maximum(scales, block.max(axis=0))
+        scales = np.where(scales == 0, 1, scales).astype(np.float32) / 127
+
+        codes = np.empty(vectors.shape, dtype=np.int8)
+        for start in range(0, len(vectors), batch_rows):
+            block = np.asarray(vectors[start : start + batch_rows]) / scales
+            codes[start : start + batch_rows] = np.clip(np.rint(block), -127, 127)
+        return cls(codes, scales)
+
+    def score(self, queries: np.ndarray, start: int, stop: int) -> np.ndarray:
+        # Scaling the queries instead of the codes gives the same dot products.
+        # Codes are cast to float32 a few rows at a time, float32 products use
+        # BLAS where NumPy's integer ones don't, and small casts stay in cache
+        queries = queries * self.scales
+        stop = min(stop, len(self.codes))
+        blocks = (
+            np.asarray(
+                self.codes[row : min(row + INT8_CAST_ROWS, stop)], dtype=np.float32
+            )
+            for row in range(start, stop, INT8_CAST_ROWS)
+        )
+        return np.concatenate([queries @ block.T for block in blocks], axis=1)
+
+
+class BinaryCodes(QuantizedCodes):
+    """Sign bit of each dimension packed in 64-bit words, 32 times smaller than float32."""
+
+    name = "binary"
+    arrays = ("codes",)
+
+    def __init__(self, codes: np.ndarray):
+        self.codes = codes
+
+    @classmethod
+    def build(
+        cls, vectors: np.ndarray, batch_rows: int = VECTOR_SEARCH_BATCH_ROWS
+    ) -> "BinaryCodes":
+        codes = np.empty((len(vectors), _get_words(vectors.shape[1]) * 8), np.uint8)
+        for start in range(0, len(vectors), batch_rows):
+            block = np.asarray(vectors[start : start + batch_rows])
+            codes[start : start + batch_rows] = _pack_signs(block)
+        return cls(codes)
+
+    def score(self, queries: np.ndarray, start: int, stop: int) -> np.ndarray:
+        block = np.asarray(self.codes[start:stop]).view(np.uint64)
+        # Fewer differing bits is more similar, one query at a time bounds memory
+        distances = [
+            _popcount(block ^ bits).sum(axis=1, dtype=np.int32)
+            for bits in _pack_signs(queries).view(np.uint64)
+        ]
+        return -np.array(distances, dtype=np.float32).reshape(len(queries), -1)
+
+
+QUANTIZED_CODES: dict[str, type[QuantizedCodes]] = {
+    codes.name: codes for codes in (Int8Codes, BinaryCodes)
+}
+
+
+class VectorIndex:
+    """Normalized vectors, searched through their IVF index, their quantized codes or exactly."""
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        ivf: IVFIndex | None = None,
+        codes: QuantizedCodes | None = None,
+    ):
+        self.vectors = vectors
+        self.ivf = ivf
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        vectors_path: Path,
+        quantization: str = VECTOR_SEARCH_QUANTIZATION,
+    ) -> "VectorIndex":
+        """
+        Normalize and save vectors, with an IVF index if there are more than VECTOR_SEARCH_IVF_THRESHOLD.
+
+        Args:
+            vectors (np.ndarray): Vectors, one per row.
+            vectors_path (Path): Path of the .npy file.
+            quantization (str): Quantized codes saved with the vectors, none, int8 or binary.
+
+        Returns:
+            VectorIndex: Index over the saved vectors.
+
+        Raises:
+            ValueError: If the quantization is unknown.
+        """
+        codes_class = get_codes_class(quantization)
+        vectors = normalize(vectors)
+        vectors_path.parent.mkdir(parents=True, exist_ok=True)
+        _save_atomically(vectors_path, vectors)
+
+        ivf = None
+        if len(vectors) >= VECTOR_SEARCH_IVF_THRESHOLD:
+            ivf = IVFIndex.build(vectors)
+            ivf.save(vectors_path)
+        else:
+            delete_ivf(vectors_path)
+
+        codes = None
+        for other_class in QUANTIZED_CODES.values():
+            if other_class is not codes_class:
+                other_class.delete(vectors_path)
+        if codes_class is not None:
+            codes = codes_class.build(vectors)
+            codes.save(vectors_path)
+
+        return cls(vectors, ivf, codes)
+
+    @classmethod
+    def load(
+        cls, vectors_path: Path, quantization: str = VECTOR_SEARCH_QUANTIZATION
+    ) -> "VectorIndex":
+        """
+        Open saved vectors read-only and memory-mapped, with their IVF index and quantized codes if they have them.
+
+        Args:
+            vectors_path (Path): Path of the .npy file.
+            quantization (str): Quantized codes to load, none, int8 or binary.
+
+        Returns:
+            VectorIndex: Index over the saved vectors.
+
+        Raises:
+            OSError: If the file can't be read.
+            ValueError: If the file isn't a .npy array or the quantization is unknown.
+        """
+        codes_class = get_codes_class(quantization)
+        vectors = np.load(vectors_path, mmap_mode="r")
+        ivf = (
+            IVFIndex.load(vectors_path)
+            if len(vectors) >= VECTOR_SEARCH_IVF_THRESHOLD
+            else None
+        )
+        # Vectors saved before the quantization was set are searched exactly
+        codes = None if codes_class is None else codes_class.load(vectors_path)
+        if codes is not None and len(codes) != len(vectors):
+            codes = None
+        return cls(vectors, ivf, codes)
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k rows by cosine similarity for a batch of queries.
+
+        Args:
+            queries (np.ndarray): Query vectors, one per row.
+            k (int): Number of rows per query.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Row indices and scores, (queries, k) each by decreasing score.
+                Rows are -1 where fewer than k rows were found.
+        """
+        if self.ivf is not None:
+            return self.ivf.search(self.vectors, queries, k)
+        if self.codes is not None:
+            return quantized_top_k(self.vectors, self.codes, queries, k)
+
+        return cosine_top_k(self.vectors, queries, k)
+
+
+def search_indexes(
+    indexes: Sequence[VectorIndex], query: np.ndarray, k: int
+) -> List[tuple[int, int, float]]:
+    """
+    Top-k rows by cosine similarity across several indexes.
+
+    Args:
+        indexes (Sequence[VectorIndex]): Indexes of the same dimension.
+        query (np.ndarray): Query vector.
+        k (int): Number of rows.
+
+    Returns:
+        List[tuple[int, int, float]]: Index position, row and score of each hit, by decreasing score.
+    """
+    hits = []
+    for position, index in enumerate(indexes):
+        if len(index) == 0:
+            continue
+
+        rows, scores = index.search(query, k)
+        hits += [
+            (position, int(row), float(score))
+            for row, score in zip(rows[0], scores[0])
+            if row >= 0
+        ]
+
+    hits.sort(key=lambda hit: hit[2], reverse=True)
+    return hits[:k]
+
+
+def get_ivf_paths(vectors_path: Path) -> List[Path]:
+    return [vectors_path.with_suffix(f".ivf_{name}.npy") for name in IVF_ARRAYS]
+
+
+def delete_ivf(vectors_path: Path) -> None:
+    for path in get_ivf_paths(vectors_path):
+        path.unlink(missing_ok=True)
+
+
+def delete_vector_index(vectors_path: Path) -> None:
+    """
+    Delete saved vectors with their IVF index and quantized codes.
+
+    Args:
+        vectors_path (Path): Path of the .npy file.
+    """
+    vectors_path.unlink(missing_ok=True)
+    delete_ivf(vectors_path)
+    for codes_class in QUANTIZED_CODES.values():
+        codes_class.delete(vectors_path)
+
+
+def get_codes_class(quantization: str) -> type[QuantizedCodes] | None:
+    """
+    Get the quantized codes class of a quantization.
+
+    Args:
+        quantization (str): none, int8 or binary.
+
+    Returns:
+        type[QuantizedCodes] | None: Codes class, None for no quantization.
+
+    Raises:
+        ValueError: If the quantization is unknown.
+    """
+    if quantization == "none":
+        return None
+    if quantization not in QUANTIZED_CODES:
+        raise ValueError(f"Unknown vector search quantization: {quantization}")
+
+    return QUANTIZED_CODES[quantization]
+
+
+def _scan_top_k(
+    score, rows: int, queries: int, k: int, batch_rows: int
+) -> tuple[np.ndarray, np.ndarray]:
+    # score(start, stop) returns the (queries, rows) scores of a block of rows
+    k = min(k, rows)
+    best_rows = np.empty((queries, 0), dtype=np.int64)
+    best_scores = np.empty((queries, 0), dtype=np.float32)
+
+    for start in range(0, rows, batch_rows):
+        block_rows, block_scores = _top_k(score(start, start + batch_rows), k)
+        # Keep the running top-k of the rows scored so far
+        best_rows, best_scores = _merge_top_k(
+            best_rows, best_scores, block_rows + start, block_scores, k
+        )
+
+    return best_rows, best_scores
+
+
+def _assign_clusters(
+    vectors: np.ndarray, centroids: np.ndarray, batch_rows: int
+) -> Iterator[tuple[int, np.ndarray]]:
+    # Yields the first row and the nearest centroid of each row of a block,
+    # blocks are small enough to bound the rows x centroids scores
+    block_rows = max(1, min(batch_rows, IVF_ASSIGN_SCORES // len(centroids)))
+    for start in range(0, len(vectors), block_rows):
+        block = np.asarray(vectors[start : start + block_rows])
+        yield start, np.argmax(block @ centroids.T, axis=1)
+
+
+def _get_words(dim: int) -> int:
+    return (dim + 63) // 64
+
+
+def _pack_signs(vectors: np.ndarray) -> np.ndarray:
+    # Padded with zero bits to whole 64-bit words
+    bits = np.zeros((len(vectors), _get_words(vectors.shape[1]) * 64), dtype=bool)
+    bits[:, : vectors.shape[1]] = vectors > 0
+    return np.packbits(bits, axis=1)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    # Sums bits in pairs, then nibbles, then bytes, without a lookup table
+    m1, m2, m4 = POPCOUNT_MASKS
+    words = words - ((words >> np.uint64(1)) & m1)
+    words = (words & m2) + ((words >> np.uint64(2)) & m2)
+    words = (words + (words >> np.uint64(4))) & m4
+    return (words * POPCOUNT_BYTES) >> np.uint64(56)
+
+
+def _rescore(
+    vectors: np.ndarray, query: np.ndarray, candidates: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    # Reading the candidates in file order is mostly sequential
+    candidates = np.sort(candidates)
+    if len(candidates) == 0:
+        return candidates.astype(np.int64), np.empty(0, dtype=np.float32)
+
+    rows, scores = _top_k(
+        (np.asarray(vectors[candidates]) @ query)[np.newaxis],
+        min(k, len(candidates)),
+    )
+    return candidates[rows[0]], scores[0]
+
+
+def _top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    # Partial sort each row, then sort the k best
+    if k < scores.shape[1]:
+        rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    top_scores = np.take_along_axis(scores, rows, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(rows, order, axis=1),
+        np.take_along_axis(top_scores, order, axis=1),
+    )
+
+
+def _merge_top_k(
+    rows_a: np.ndarray,
+    scores_a: np.ndarray,
+    rows_b: np.ndarray,
+    scores_b: np.ndarray,
+    k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    rows = np.concatenate([rows_a, rows_b], axis=1)
+    scores = np.concatenate([scores_a, scores_b], axis=1)
+    top, top_scores = _top_k(scores, k)
+    return np.take_along_axis(rows, top, axis=1), top_scores
+
+
+def _save_atomically(path: Path, array: np.ndarray) -> None:
+    # Readers never see a partial file, they keep the previous one until the rename
+    tmp_path = path.with_suffix(".tmp.npy")
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)